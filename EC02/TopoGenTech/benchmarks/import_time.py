@@ -0,0 +1,119 @@
+"""
+Benchmark package import and CLI startup time.
+
+Each case runs in a fresh interpreter, several times, and reports the median
+wall time and whether the Earth Engine client (``ee``) was loaded. Region-only
+scripts and the CLI's planning path should not load ``ee``.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statement timed inside the child interpreter
+IMPORT_CASES = {
+    'import topogentech': 'import topogentech',
+    'RegionConfig': 'from topogentech import RegionConfig; RegionConfig.get_region_bounds("quito")',
+    'offline analysis': 'from topogentech import EmbeddingStore, RegionIndex, detect_change',
+    'cli module': 'import topogentech.cli',
+    'downloader': 'from topogentech import SatelliteEmbeddingsDownloader'
+}
+
+# Whole commands, timed from the parent
+COMMAND_CASES = {
+    'cli --help': ['-m', 'topogentech.cli', '--help'],
+    'cli --dry-run': ['-m', 'topogentech.cli', '--regions', 'quito', '--years', '2023', '2024',
+                      '--tile-size-km', '10', '--dry-run']
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'ee_loaded': 'ee' in sys.modules}}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def time_import(statement: str, repeat: int) -> Dict[str, Any]:
+    """
+    Time an import statement in fresh interpreters.
+
+    Args:
+        statement: Python code to time
+        repeat: Number of interpreters to start
+
+    Returns:
+        Dictionary with 'median_ms', 'min_ms' and 'ee_loaded'
+    """
+    runs: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD.format(statement=statement)],
+            capture_output=True, text=True, check=True, env=_env()
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    times = [run['ms'] for run in runs]
+    return {'median_ms': statistics.median(times), 'min_ms': min(times),
+            'ee_loaded': runs[-1]['ee_loaded']}
+
+
+def time_command(args: List[str], repeat: int) -> Dict[str, Any]:
+    """
+    Time a whole interpreter run, including interpreter startup.
+
+    Args:
+        args: Arguments passed to the Python interpreter
+        repeat: Number of runs
+
+    Returns:
+        Dictionary with 'median_ms' and 'min_ms'
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, capture_output=True, check=True, env=_env())
+        times.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case')
+    args = parser.parse_args()
+
+    # Interpreter startup alone, as the baseline for the command cases
+    baseline = time_command(['-c', 'pass'], args.repeat)
+    print(f"{'python startup':<20} {baseline['median_ms']:8.1f} ms")
+
+    print("\nImport time (inside the interpreter):")
+    for name, statement in IMPORT_CASES.items():
+        result = time_import(statement, args.repeat)
+        ee_note = 'loads ee' if result['ee_loaded'] else 'no ee'
+        print(f"  {name:<20} {result['median_ms']:8.1f} ms  (min {result['min_ms']:.1f})  {ee_note}")
+
+    print("\nCommand time (including interpreter startup):")
+    for name, command in COMMAND_CASES.items():
+        result = time_command(command, args.repeat)
+        print(f"  {name:<20} {result['median_ms']:8.1f} ms  (min {result['min_ms']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -61,6 +61,10 @@ setup(
             "flake8>=4.0",
             "mypy>=0.950",
         ],
+        "parquet": [
+            "pandas>=1.3.0",
+            "pyarrow>=8.0",
+        ],
         "docs": [
             "sphinx>=4.0",
             "sphinx-rtd-theme>=1.0",
@@ -0,0 +1,170 @@
+"""Tests for the asyncio task monitor against FakeBackend."""
+
+import asyncio
+
+import pytest
+
+from topogentech.async_monitor import AsyncTaskMonitor
+from topogentech.backends import FakeBackend
+from topogentech.estimator import estimate_export
+
+SPEEDUP = 1000
+
+
+def box(width):
+    return {'west': 0, 'east': width, 'south': 0, 'north': 0.01}
+
+
+@pytest.fixture
+def backend():
+    # A 0.01 degree box runs for 100 simulated seconds, a tenth of a real second
+    pixels = float(estimate_export([box(0.01)], 10)['estimated_pixels'][0])
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=0, pixels_per_second=pixels / 100,
+                          duration_noise=0, speedup=SPEEDUP)
+    backend.initialize('test-project')
+    return backend
+
+
+def start(backend, width, description=None):
+    return backend.start_export('dataset', box(width), 2024, 10, 'float32',
+                                description or f"box_{width}")
+
+
+def make_monitor(backend, **kwargs):
+    kwargs.setdefault('min_interval', 0.01)
+    kwargs.setdefault('max_interval', 0.02)
+    return AsyncTaskMonitor(task_index=backend.task_index, **kwargs)
+
+
+def test_wait_all_batches_status_lookups(backend):
+    tasks = [start(backend, 0.01 * (i % 3 + 1)) for i in range(30)]
+
+    async def run():
+        monitor = make_monitor(backend)
+        try:
+            return monitor, await monitor.wait_all(tasks, timeout=5)
+        finally:
+            monitor.close()
+
+    monitor, results = asyncio.run(run())
+
+    assert results.keys() == {task.id for task in tasks}
+    assert {status['state'] for status in results.values()} == {'COMPLETED'}
+    # One task list call per poll, whatever the number of tasks
+    assert backend.calls['get_task_list'] == monitor.poll_count
+    assert monitor.poll_count < 60
+    assert backend.calls['task_status'] == 0
+
+
+def test_wait_any_returns_first_finished_task(backend):
+    short, long = start(backend, 0.01), start(backend, 0.05)
+
+    async def run():
+        monitor = make_monitor(backend)
+        try:
+            first = await monitor.wait_any([long, short], timeout=5)
+            rest = await monitor.wait_all(timeout=5)
+            return first, rest
+        finally:
+            monitor.close()
+
+    first, rest = asyncio.run(run())
+    assert list(first) == [short.id]
+    # With no tasks given, wait_all covers the ones still watched
+    assert list(rest) == [long.id]
+
+
+def test_wait_all_timeout_returns_finished_tasks_only(backend):
+    short, long = start(backend, 0.01), start(backend, 0.5)
+
+    async def run():
+        monitor = make_monitor(backend)
+        try:
+            return await monitor.wait_all([short, long], timeout=0.3)
+        finally:
+            monitor.close()
+
+    assert list(asyncio.run(run())) == [short.id]
+
+
+def test_as_completed_yields_in_finishing_order(backend):
+    widths = [0.03, 0.01, 0.05, 0.02, 0.04]
+    tasks = {start(backend, width).id: width for width in widths}
+
+    async def run():
+        monitor = make_monitor(backend)
+        try:
+            return [status async for status in monitor.as_completed(list(tasks), timeout=5)]
+        finally:
+            monitor.close()
+
+    statuses = asyncio.run(run())
+    assert [tasks[status['id']] for status in statuses] == sorted(widths)
+
+
+def test_callbacks_fire_once_per_finished_task(backend):
+    tasks = [start(backend, 0.01), start(backend, 0.02)]
+    cancelled = start(backend, 0.5)
+    cancelled.cancel()
+    seen, per_task, late = [], [], []
+
+    async def async_callback(task_id, status):
+        await asyncio.sleep(0)
+        per_task.append((task_id, status['state']))
+
+    def broken(task_id, status):
+        raise RuntimeError('callback failed')
+
+    async def run():
+        monitor = make_monitor(backend)
+        monitor.add_callback(lambda task_id, status: seen.append(task_id))
+        monitor.add_callback(broken)
+        try:
+            monitor.watch(tasks[0], callback=async_callback)
+            monitor.watch(cancelled, callback=async_callback)
+            await monitor.wait_all(tasks + [cancelled], timeout=5)
+            # Watching a finished task resolves at once and still fires the callback
+            status = await monitor.watch(tasks[1], callback=lambda *args: late.append(args))
+            await asyncio.sleep(0)
+            return status
+        finally:
+            monitor.close()
+
+    status = asyncio.run(run())
+    assert status['state'] == 'COMPLETED'
+    assert sorted(seen) == sorted(task.id for task in tasks + [cancelled])
+    assert sorted(per_task) == sorted([(tasks[0].id, 'COMPLETED'),
+                                       (cancelled.id, 'CANCELLED')])
+    assert late == [(tasks[1].id, status)]
+
+
+def polls_while_running(backend, **kwargs):
+    # One task running for 600 simulated seconds, 0.6 real seconds
+    task = start(backend, 0.06)
+
+    async def run():
+        monitor = make_monitor(backend, **kwargs)
+        try:
+            await monitor.wait_all([task], timeout=5)
+            return monitor.poll_count
+        finally:
+            monitor.close()
+
+    return asyncio.run(run())
+
+
+def test_poll_interval_is_held_at_min_interval(backend):
+    # A zero backoff factor never grows the interval past its minimum
+    polls = polls_while_running(backend, min_interval=0.02, max_interval=1,
+                                backoff_factor=0)
+    # About one poll per 0.02 s over 0.6 s
+    assert 20 <= polls <= 35
+
+
+def test_poll_interval_backs_off_up_to_max_interval(backend):
+    # The interval would be ten times the task's age, but is capped
+    polls = polls_while_running(backend, min_interval=0.01, max_interval=0.1,
+                                backoff_factor=10)
+    # Polls at 0 and 0.01 s, then one every 0.1 s until 0.6 s
+    assert 6 <= polls <= 10
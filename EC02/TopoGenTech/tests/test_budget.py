@@ -0,0 +1,90 @@
+"""Tests for choosing export scales and tilings within a budget."""
+
+import pytest
+
+from topogentech.budget import MAX_SCALE, plan_for_budget
+from topogentech.estimator import estimate_export
+
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+GUAYAQUIL = {'west': -80.1, 'east': -79.8, 'south': -2.3, 'north': -2.0}
+REGIONS = [QUITO, GUAYAQUIL]
+ECUADOR = {'west': -81.5, 'east': -75.0, 'south': -5.0, 'north': 2.0}
+
+
+def total(scale, key):
+    return float(estimate_export(REGIONS, scale)[key].sum())
+
+
+def test_size_limit_picks_finest_scale_within_it():
+    plan = plan_for_budget(REGIONS, max_size_mb=500)
+
+    assert plan['fits']
+    assert plan['estimated_size_mb'] <= 500
+    assert total(plan['scale'] - 1, 'estimated_size_mb') > 500
+    assert plan['estimated_size_mb'] == pytest.approx(total(plan['scale'], 'estimated_size_mb'))
+    assert plan['tile_size_km'] is None and len(plan['tiles']) == 2
+
+
+def test_pixel_limit_picks_finest_scale_within_it():
+    plan = plan_for_budget(REGIONS, max_pixels=1e6)
+
+    assert plan['fits']
+    assert plan['estimated_pixels'] <= 1e6
+    assert total(plan['scale'] - 1, 'estimated_pixels') > 1e6
+
+
+def test_tighter_of_size_and_pixel_limits_wins():
+    by_size = plan_for_budget(REGIONS, max_size_mb=500)['scale']
+    by_pixels = plan_for_budget(REGIONS, max_pixels=1e6)['scale']
+    both = plan_for_budget(REGIONS, max_size_mb=500, max_pixels=1e6)['scale']
+    assert both == max(by_size, by_pixels)
+
+
+def test_candidate_scales_and_precision():
+    plan = plan_for_budget(REGIONS, max_size_mb=500, scales=[100, 10, 20, 50])
+    assert plan['scale'] == 50
+
+    # int8 values are a quarter of float32, so a finer candidate fits
+    plan = plan_for_budget(REGIONS, max_size_mb=500, scales=[10, 20, 50], bytes_per_value=1)
+    assert plan['scale'] == 20
+
+
+def test_nothing_fits_returns_coarsest_plan():
+    plan = plan_for_budget(REGIONS, max_size_mb=1, scales=[10, 30])
+    assert not plan['fits']
+    assert plan['scale'] == 30
+
+    plan = plan_for_budget(REGIONS, max_pixels=0.5)
+    assert not plan['fits']
+    assert plan['scale'] == MAX_SCALE
+
+    # Every export takes minutes even at the coarsest scale
+    plan = plan_for_budget(REGIONS, deadline_seconds=10)
+    assert not plan['fits']
+    assert plan['scale'] == MAX_SCALE
+
+
+def test_deadline_bisection_picks_finest_feasible_scale():
+    deadline = 1800
+    plan = plan_for_budget([ECUADOR], deadline_seconds=deadline, max_concurrent=4)
+
+    assert plan['fits']
+    assert 10 < plan['scale'] < MAX_SCALE
+    assert plan['estimated_seconds'] <= deadline
+    # One meter finer misses the deadline with the same tiling
+    finer = plan_for_budget([ECUADOR], deadline_seconds=deadline, max_concurrent=4,
+                            scales=[plan['scale'] - 1], tile_sizes_km=[plan['tile_size_km']])
+    assert not finer['fits']
+    assert finer['estimated_seconds'] > deadline
+    # and no other tiling meets it at a finer scale
+    for tile_size_km in (None, 200, 100, 50, 25, 10):
+        other = plan_for_budget([ECUADOR], deadline_seconds=deadline, max_concurrent=4,
+                                tile_sizes_km=[tile_size_km])
+        assert other['scale'] >= plan['scale']
+
+
+def test_more_slots_allow_a_finer_scale_under_a_deadline():
+    few = plan_for_budget([ECUADOR], deadline_seconds=1800, max_concurrent=2)
+    many = plan_for_budget([ECUADOR], deadline_seconds=1800, max_concurrent=40)
+    assert many['scale'] < few['scale']
+    assert len(many['tiles']) > len(few['tiles'])
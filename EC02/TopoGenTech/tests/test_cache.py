@@ -0,0 +1,149 @@
+"""Tests for the on-disk dataset info cache."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from topogentech import cache as cache_module
+from topogentech.backends import FakeBackend
+from topogentech.cache import DatasetInfoCache
+from topogentech.downloader import SatelliteEmbeddingsDownloader
+from topogentech.geometry import PolygonRegion
+
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+TRIANGLE = [[-78.6, -0.3], [-78.4, -0.3], [-78.6, -0.1]]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock)
+    return clock
+
+
+def polygon_bounds(ring):
+    return PolygonRegion([[np.array(ring, dtype=float)]]).to_bounds()
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = DatasetInfoCache(str(tmp_path / 'info.sqlite'), ttl=60)
+    cache.set('old', {'value': 1})
+    clock.now += 30
+    cache.set('new', {'value': 2})
+
+    clock.now += 30
+    assert cache.get('old') == {'value': 1}
+    clock.now += 1
+    assert cache.get('old') is None
+    assert cache.get('new') == {'value': 2}
+
+    # Expired rows stay on disk until evicted
+    assert len(cache) == 2
+    assert cache.evict_expired() == 1
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.get('new') is None
+
+
+def test_keys_follow_request_parameters():
+    key = DatasetInfoCache.make_key('dataset', QUITO, 2024, 10)
+
+    # Bounds are rounded, so float noise still hits the same entry
+    noisy = dict(QUITO, west=QUITO['west'] + 1e-9)
+    assert DatasetInfoCache.make_key('dataset', noisy, 2024, 10) == key
+    assert DatasetInfoCache.make_key('dataset', QUITO, 2024, 10.0, 'float32') == key
+
+    others = [
+        DatasetInfoCache.make_key('other', QUITO, 2024, 10),
+        DatasetInfoCache.make_key('dataset', dict(QUITO, west=-78.5), 2024, 10),
+        DatasetInfoCache.make_key('dataset', QUITO, 2023, 10),
+        DatasetInfoCache.make_key('dataset', QUITO, 2024, 30),
+        DatasetInfoCache.make_key('dataset', QUITO, 2024, 10, 'float16'),
+        DatasetInfoCache.make_key('dataset', QUITO, 2024, 10, 'int8'),
+    ]
+    assert len(set(others + [key])) == len(others) + 1
+
+
+def test_polygon_fingerprint_is_part_of_the_key():
+    triangle = polygon_bounds(TRIANGLE)
+    mirrored = polygon_bounds([[-78.4, -0.3], [-78.4, -0.1], [-78.6, -0.1]])
+
+    # Same bounding box, different shapes
+    assert {key: triangle[key] for key in QUITO} == {key: mirrored[key] for key in QUITO}
+    keys = {DatasetInfoCache.make_key('dataset', bounds, 2024, 10)
+            for bounds in (QUITO, triangle, mirrored)}
+    assert len(keys) == 3
+    assert DatasetInfoCache.make_key('dataset', polygon_bounds(TRIANGLE), 2024, 10) \
+        == DatasetInfoCache.make_key('dataset', triangle, 2024, 10)
+
+
+def make_downloader(cache):
+    backend = FakeBackend(status_latency=0, num_bands=4)
+    downloader = SatelliteEmbeddingsDownloader('test-project', scale=100, cache=cache,
+                                               backend=backend)
+    assert downloader.initialize()
+    return downloader, backend
+
+
+def test_downloader_reuses_cached_info(tmp_path):
+    downloader, backend = make_downloader(DatasetInfoCache(str(tmp_path / 'info.sqlite')))
+
+    first = downloader.get_dataset_info(QUITO)
+    assert downloader.get_dataset_info(QUITO) == first
+    assert backend.calls['image_info'] == 1
+
+    downloader.precision = 'int8'
+    assert downloader.get_dataset_info(QUITO)['precision'] == 'int8'
+    assert backend.calls['image_info'] == 2
+
+
+def test_corrupt_database_falls_back_to_backend(tmp_path, capsys):
+    path = tmp_path / 'info.sqlite'
+    cache = DatasetInfoCache(str(path))
+    # Overwritten after the cache was opened, e.g. by a crashed writer
+    path.write_bytes(b'not a database' * 100)
+    with pytest.raises(sqlite3.DatabaseError):
+        DatasetInfoCache(str(path))
+    downloader, backend = make_downloader(cache)
+
+    info = downloader.get_dataset_info(QUITO)
+    assert info['num_bands'] == 4
+    assert backend.calls['image_info'] == 1
+    output = capsys.readouterr().out
+    assert 'Error reading dataset info cache' in output
+    assert 'Error writing dataset info cache' in output
+
+
+def test_locked_database_times_out_and_falls_back(tmp_path, capsys):
+    path = str(tmp_path / 'info.sqlite')
+    cache = DatasetInfoCache(path, timeout=0.1)
+    cache.set(DatasetInfoCache.make_key(SatelliteEmbeddingsDownloader.DATASET_ID, QUITO,
+                                        SatelliteEmbeddingsDownloader.DEFAULT_YEAR, 100),
+              {'stale': True})
+
+    # Another process holds an exclusive lock
+    holder = sqlite3.connect(path)
+    holder.execute('BEGIN EXCLUSIVE')
+    try:
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            cache.get('anything')
+        downloader, backend = make_downloader(cache)
+        info = downloader.get_dataset_info(QUITO)
+    finally:
+        holder.rollback()
+        holder.close()
+
+    assert 'stale' not in info
+    assert backend.calls['image_info'] == 1
+    assert 'locked' in capsys.readouterr().out
+    # Once the lock is released the cache works again
+    assert cache.get('anything') is None
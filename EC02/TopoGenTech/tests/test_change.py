@@ -0,0 +1,117 @@
+"""Tests for year-over-year change detection on a local store."""
+
+import numpy as np
+import pytest
+
+from topogentech.change import HISTOGRAM_BINS, ChangeStatistics, cosine_distance, detect_change
+from topogentech.store import EmbeddingStore
+from topogentech.streaming import METERS_PER_DEGREE, SyntheticPixelEndpoint, open_download
+
+BIN_WIDTH = 2.0 / HISTOGRAM_BINS
+CHUNK = 16
+ROW, COL = 500 * CHUNK + 3, 900 * CHUNK + 7
+HEIGHT, WIDTH = 40, 50
+
+
+def synthetic_year(year, seed=0):
+    endpoint = SyntheticPixelEndpoint(num_bands=8, seed=seed)
+    pixel_deg = 1000 / METERS_PER_DEGREE
+    west, north = -180 + COL * pixel_deg, 90 - ROW * pixel_deg
+    return endpoint.fetch_block(year, west, north, pixel_deg, WIDTH, HEIGHT,
+                                endpoint.band_names(year))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddingStore.create(str(tmp_path / 'store'), scale=1000,
+                                  bands=[f"A{i:02d}" for i in range(8)], chunk_size=CHUNK)
+    before = synthetic_year(2018)
+    after = synthetic_year(2024)
+    # A block of new land cover, and missing data in each year
+    rng = np.random.default_rng(1)
+    patch = rng.normal(size=(12, 15, 8))
+    after[5:17, 20:35] = patch / np.linalg.norm(patch, axis=-1, keepdims=True)
+    before[:3] = np.nan
+    after[:, -4:] = np.nan
+    store.write_array(before, ROW, COL, 2018)
+    store.write_array(after, ROW, COL, 2024)
+    return store
+
+
+def expected_change(store):
+    bounds = store.window_metadata((ROW, ROW + HEIGHT, COL, COL + WIDTH))
+    before, _ = store.read_window(bounds, year=2018)
+    after, _ = store.read_window(bounds, year=2024)
+    return cosine_distance(before, after)
+
+
+def assert_matches_numpy(summary, values, threshold):
+    assert summary['valid_pixels'] == values.size
+    assert summary['changed_pixels'] == np.count_nonzero(values > threshold)
+    assert summary['mean'] == pytest.approx(values.mean(), rel=1e-6)
+    assert summary['std'] == pytest.approx(values.std(), rel=1e-4)
+    assert summary['max'] == pytest.approx(values.max())
+    for q in (50, 90, 99):
+        # The histogram reports the upper edge of the bin holding the value
+        # of that rank, so compare with the percentile without interpolation
+        exact = np.percentile(values, q, method='inverted_cdf')
+        assert exact - 1e-6 <= summary[f"p{q}"] <= exact + BIN_WIDTH + 1e-6
+
+
+def test_detect_change_matches_numpy(store, tmp_path):
+    path = str(tmp_path / 'change.npy')
+    summary = detect_change(store, 2018, 2024, path, threshold=0.2, workers=3, verbose=False)
+
+    change, metadata = open_download(path)
+    shared = store.chunks_window(store.chunk_keys(2018))
+    assert change.shape == (shared[1] - shared[0], shared[3] - shared[2])
+    offset = (ROW - shared[0], COL - shared[2])
+    window = change[offset[0]:offset[0] + HEIGHT, offset[1]:offset[1] + WIDTH]
+    expected = expected_change(store)
+    np.testing.assert_allclose(window, expected, atol=1e-6)
+    # Outside the written raster, and where either year is missing, there is no change value
+    assert np.isnan(change).sum() == change.size - np.count_nonzero(~np.isnan(expected))
+
+    values = expected[~np.isnan(expected)]
+    assert_matches_numpy(summary, values, 0.2)
+    assert 0 < summary['changed_pixels'] < summary['valid_pixels']
+    assert metadata['summary'] == summary
+    assert (metadata['year_a'], metadata['year_b']) == (2018, 2024)
+
+
+def test_detect_change_within_bounds(store, tmp_path):
+    rows, cols = (ROW + 4, ROW + 20), (COL + 18, COL + 40)
+    bounds = store.window_metadata((rows[0], rows[1], cols[0], cols[1]))
+    summary = detect_change(store, 2018, 2024, str(tmp_path / 'change.npy'),
+                            bounds={key: bounds[key] for key in ('west', 'east', 'south', 'north')},
+                            verbose=False)
+
+    expected = expected_change(store)[4:20, 18:40]
+    assert_matches_numpy(summary, expected[~np.isnan(expected)], summary['threshold'])
+
+
+def test_streaming_statistics_match_one_pass():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.beta(1, 20, 50000) * 2, rng.uniform(0.5, 2.0, 5000)])
+    values[::97] = np.nan
+
+    streamed = ChangeStatistics(threshold=0.3)
+    for block in np.array_split(values, 37):
+        streamed.update(block)
+    streamed.update(np.array([np.nan]))
+    whole = ChangeStatistics(threshold=0.3)
+    whole.update(values)
+
+    assert streamed.to_dict() == pytest.approx(whole.to_dict())
+    assert_matches_numpy(streamed.to_dict(), values[~np.isnan(values)], 0.3)
+    for q in (1, 25, 75, 99.9):
+        exact = np.percentile(values[~np.isnan(values)], q, method='inverted_cdf')
+        assert exact - 1e-6 <= streamed.percentile(q) <= exact + BIN_WIDTH + 1e-6
+
+
+def test_empty_statistics():
+    stats = ChangeStatistics()
+    stats.update(np.full(4, np.nan))
+    summary = stats.to_dict()
+    assert summary['valid_pixels'] == 0 and summary['changed_fraction'] == 0
+    assert np.isnan(summary['mean']) and np.isnan(summary['p50'])
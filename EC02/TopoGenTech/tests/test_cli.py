@@ -0,0 +1,117 @@
+"""Tests for the topogentech-download command line interface."""
+
+import json
+
+import pytest
+
+from topogentech import backends
+from topogentech.backends import FakeBackend
+from topogentech.cli import main, plan_exports
+from topogentech.regions import RegionConfig
+
+QUITO = RegionConfig.get_region_bounds('quito')
+
+
+def planned(capsys):
+    """Descriptions printed by a dry run, and the lines before and after them."""
+    lines = capsys.readouterr().out.splitlines()
+    start = lines.index('Export plan:') + 1
+    descriptions = [line.split()[0] for line in lines[start:] if line.startswith('  ')]
+    summary = next(line for line in lines[start:] if not line.startswith('  '))
+    return descriptions, lines[:start - 1] + [summary]
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=10, pixels_per_second=1e6, speedup=10000)
+    previous = backends.set_backend(backend)
+    yield backend
+    backends.set_backend(previous)
+
+
+def test_plan_exports_one_per_region_year_scale_and_tile():
+    exports = plan_exports({'quito': QUITO}, [2023, 2024], [10, 30], tile_size_km=10)
+    tiles = {export['tile_id'] for export in exports}
+    assert len(exports) == 4 * len(tiles)
+    assert {(e['year'], e['scale']) for e in exports} == {(2023, 10), (2023, 30),
+                                                          (2024, 10), (2024, 30)}
+    assert exports[0]['description'] == f"quito_2023_10m_{exports[0]['tile_id']}"
+    # Coarser scales shrink the estimate by the square of the scale ratio
+    fine = sum(e['estimated_size_mb'] for e in exports if e['scale'] == 10)
+    coarse = sum(e['estimated_size_mb'] for e in exports if e['scale'] == 30)
+    assert fine == pytest.approx(9 * coarse)
+
+
+def test_dry_run_plans_named_regions(capsys):
+    assert main(['--dry-run', '--regions', 'Quito', 'guayaquil',
+                 '--years', '2023', '2024', '--scales', '30']) == 0
+    descriptions, lines = planned(capsys)
+    assert descriptions == ['quito_2023_30m', 'quito_2024_30m',
+                            'guayaquil_2023_30m', 'guayaquil_2024_30m']
+    assert lines[-1].startswith('4 exports, estimated total')
+
+
+def test_dry_run_plans_geojson_regions(tmp_path, capsys):
+    path = tmp_path / 'park.geojson'
+    # Triangle covering half of a 0.4 x 0.4 degree box
+    path.write_text(json.dumps({'type': 'Polygon', 'coordinates': [
+        [[-78.6, -0.3], [-78.2, -0.3], [-78.6, 0.1], [-78.6, -0.3]]
+    ]}))
+    try:
+        assert main(['--dry-run', '--geojson', str(path), '--scales', '100',
+                     '--tile-size-km', '12']) == 0
+    finally:
+        RegionConfig.CUSTOM_REGIONS.pop('park', None)
+    descriptions, _ = planned(capsys)
+
+    # A 4 x 4 grid, of which the 6 tiles beyond the diagonal are pruned
+    assert len(descriptions) == 10
+    assert all(d.startswith('park_2024_100m_r') for d in descriptions)
+    assert 'park_2024_100m_r000_c003' not in descriptions
+
+
+def test_dry_run_picks_scale_within_budget(capsys):
+    assert main(['--dry-run', '--regions', 'quito', '--max-size-mb', '100',
+                 '--scales', '10', '20', '50', '100']) == 0
+    descriptions, lines = planned(capsys)
+    assert lines[0].startswith('Budget: 50 m per pixel')
+    assert descriptions == ['quito_2024_50m']
+
+    assert main(['--dry-run', '--regions', 'quito', '--max-pixels', '1e6']) == 0
+    _, lines = planned(capsys)
+    assert lines[0].startswith('Budget: 23 m per pixel')
+
+
+def test_budget_that_nothing_fits_fails(capsys):
+    assert main(['--dry-run', '--regions', 'ecuador', '--max-size-mb', '1',
+                 '--scales', '10', '100']) == 1
+    assert 'No scale fits the budget' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('argv', [
+    ['--dry-run'],
+    ['--dry-run', '--regions', 'atlantis'],
+    ['--dry-run', '--geojson', 'missing.geojson'],
+    ['--dry-run', '--regions', 'quito', '--workers', '0'],
+    ['--dry-run', '--regions', 'quito', '--destination', 'asset'],
+    ['--dry-run', '--regions', 'quito', '--precision', 'int4'],
+    ['--regions', 'quito'],
+])
+def test_bad_input_exits_with_usage_error(argv):
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    assert excinfo.value.code == 2
+
+
+def test_run_initializes_backend_once(fake_backend, capsys):
+    assert main(['--project', 'test-project', '--regions', 'quito',
+                 '--years', '2023', '2024', '--scales', '100', '200',
+                 '--check-interval', '5']) == 0
+    assert fake_backend.calls['initialize'] == 1
+    assert fake_backend.calls['start_export'] == 4
+    assert fake_backend.summary() == {'COMPLETED': 4}
+    # Each (year, scale) pair exports at its own scale
+    pixels = {record['description']: record['pixels'] for record in fake_backend._tasks.values()}
+    assert pixels['quito_2023_100m'] == pytest.approx(4 * pixels['quito_2023_200m'])
+    assert pixels['quito_2023_100m'] == pytest.approx(pixels['quito_2024_100m'])
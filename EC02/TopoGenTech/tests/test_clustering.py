@@ -0,0 +1,100 @@
+"""Tests for mini-batch k-means over a local store."""
+
+import numpy as np
+import pytest
+
+from topogentech.clustering import LABEL_NODATA, MiniBatchKMeans, fit_store, write_labels
+from topogentech.store import EmbeddingStore
+from topogentech.streaming import open_download
+
+CHUNK = 16
+ROW, COL = 300 * CHUNK + 5, 700 * CHUNK + 9
+HEIGHT, WIDTH = 48, 64
+DIMS = 8
+
+
+def synthetic_land_cover(seed=0):
+    """Four well-separated clusters laid out as vertical stripes, with a few gaps."""
+    rng = np.random.default_rng(seed)
+    centres = np.eye(4, DIMS) * 3
+    truth = np.repeat(np.arange(4), WIDTH // 4)[None, :].repeat(HEIGHT, axis=0)
+    raster = centres[truth] + rng.normal(scale=0.1, size=(HEIGHT, WIDTH, DIMS))
+    raster[10:14, 20:30] = np.nan
+    return centres, truth, raster.astype(np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddingStore.create(str(tmp_path / 'store'), scale=1000,
+                                  bands=[f"A{i:02d}" for i in range(DIMS)], chunk_size=CHUNK)
+    store.write_array(synthetic_land_cover()[2], ROW, COL, 2024)
+    return store
+
+
+def test_fit_store_recovers_separated_clusters(store):
+    centres, _, _ = synthetic_land_cover()
+    model = fit_store(store, 2024, n_clusters=4, batch_size=256, verbose=False)
+
+    # Each true centre has exactly one fitted centroid close to it
+    distances = np.linalg.norm(centres[:, None] - model.centroids[None], axis=-1)
+    nearest = distances.argmin(axis=1)
+    assert sorted(nearest) == [0, 1, 2, 3]
+    assert distances.min(axis=1).max() < 0.05
+    # Inertia is the noise variance summed over the dimensions
+    assert model.inertia == pytest.approx(DIMS * 0.1 ** 2, rel=0.2)
+    assert model.counts.sum() == 2 * (HEIGHT * WIDTH - 40)
+
+
+def test_write_labels_round_trip(store, tmp_path):
+    centres, truth, raster = synthetic_land_cover()
+    model = fit_store(store, 2024, n_clusters=4, batch_size=256, verbose=False)
+    path = str(tmp_path / 'labels.npy')
+
+    summary = write_labels(model, store, 2024, path, workers=3, verbose=False)
+
+    labels, metadata = open_download(path)
+    assert labels.dtype == np.uint8
+    offset = (ROW - metadata['row_offset'], COL - metadata['col_offset'])
+    window = labels[offset[0]:offset[0] + HEIGHT, offset[1]:offset[1] + WIDTH]
+    valid = ~np.isnan(raster).any(axis=-1)
+
+    # One label per true cluster, and nodata wherever there are no embeddings
+    mapping = {t: set(window[valid & (truth == t)].tolist()) for t in range(4)}
+    assert all(len(found) == 1 for found in mapping.values())
+    assert len(set.union(*mapping.values())) == 4
+    assert np.all(window[~valid] == LABEL_NODATA)
+    assert (labels == LABEL_NODATA).sum() == labels.size - valid.sum()
+    np.testing.assert_array_equal(window[valid], model.predict(raster[valid]))
+
+    assert summary['labelled_pixels'] == valid.sum()
+    assert summary['cluster_counts'] == np.bincount(window[valid], minlength=4).tolist()
+    np.testing.assert_allclose(metadata['centroids'], model.centroids)
+    assert metadata['nodata'] == LABEL_NODATA
+
+    # Labelling a window inside the store covers just that window
+    bounds = store.window_metadata((ROW, ROW + 20, COL, COL + 30))
+    part = write_labels(model, store, 2024, str(tmp_path / 'part.npy'),
+                        bounds={key: bounds[key] for key in ('west', 'east', 'south', 'north')},
+                        verbose=False)
+    part_labels, _ = open_download(str(tmp_path / 'part.npy'))
+    np.testing.assert_array_equal(part_labels, window[:20, :30])
+    assert part['labelled_pixels'] == valid[:20, :30].sum()
+
+
+def test_partial_fit_keeps_running_means():
+    rng = np.random.default_rng(0)
+    model = MiniBatchKMeans(n_clusters=1, batch_size=10)
+    batches = [rng.normal(size=(n, 3)) for n in (5, 17, 8)]
+    for batch in batches:
+        model.partial_fit(batch)
+
+    # A single cluster's centroid is the mean of every point seen
+    np.testing.assert_allclose(model.centroids[0], np.concatenate(batches).mean(axis=0))
+    assert model.counts.tolist() == [30]
+
+
+def test_model_checks():
+    with pytest.raises(ValueError):
+        MiniBatchKMeans(n_clusters=LABEL_NODATA)
+    with pytest.raises(RuntimeError):
+        MiniBatchKMeans(n_clusters=2).predict(np.zeros((1, 3)))
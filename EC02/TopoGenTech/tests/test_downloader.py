@@ -0,0 +1,62 @@
+"""Tests for zonal statistics and point sampling against FakeBackend."""
+
+import csv
+
+from topogentech.backends import FakeBackend
+from topogentech.downloader import SatelliteEmbeddingsDownloader
+
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+BERLIN = {'west': 13.0, 'east': 13.8, 'south': 52.3, 'north': 52.7}
+
+
+def make_downloader(backend):
+    downloader = SatelliteEmbeddingsDownloader('test-project', scale=1000, backend=backend)
+    assert downloader.initialize()
+    return downloader
+
+
+def test_zonal_statistics_one_row_per_region():
+    backend = FakeBackend(status_latency=0, num_bands=4)
+    downloader = make_downloader(backend)
+
+    rows = downloader.get_zonal_statistics({'quito': QUITO, 'berlin': BERLIN},
+                                           percentiles=[10, 90], batch_size=1)
+
+    assert [row['region'] for row in rows] == ['quito', 'berlin']
+    assert sorted(rows[0]) == sorted(
+        ['region'] + [f"A{i:02d}_{stat}" for i in range(4) for stat in ('mean', 'p10', 'p90')]
+    )
+    assert all(row['A00_p10'] <= row['A00_mean'] <= row['A00_p90'] for row in rows)
+    assert backend.calls['reduce_regions'] == 2
+
+
+def test_zonal_statistic_columns_name_the_statistic():
+    downloader = make_downloader(FakeBackend(status_latency=0, num_bands=2))
+
+    mean_only = downloader.get_zonal_statistics([QUITO])
+    one_percentile = downloader.get_zonal_statistics([QUITO], percentiles=[50],
+                                                     include_mean=False)
+
+    assert sorted(mean_only[0]) == ['A00', 'A01', 'region']
+    assert sorted(one_percentile[0]) == ['A00_p50', 'A01_p50', 'region']
+
+
+def test_sample_points_reports_short_strata(tmp_path):
+    backend = FakeBackend(status_latency=0, num_bands=4)
+    downloader = make_downloader(backend)
+    output_path = str(tmp_path / 'points.csv')
+
+    # Quito holds about 480 pixels at 1 km, Berlin about 2400
+    summary = downloader.sample_points({'quito': QUITO, 'berlin': BERLIN}, output_path,
+                                       points_per_stratum=1000)
+
+    with open(output_path, newline='') as fh:
+        rows = list(csv.DictReader(fh))
+    counts = {name: sum(row['region'] == name for row in rows) for name in ('quito', 'berlin')}
+    assert counts['berlin'] == 1000
+    assert summary['num_rows'] == len(rows)
+    assert summary['failed_strata'] == []
+    assert summary['short_strata'] == [
+        {'region': 'quito', 'tile_id': '', 'num_points': counts['quito']}
+    ]
+    assert counts['quito'] < 1000
@@ -0,0 +1,68 @@
+"""Tests for the offline WGS84 area and export estimates."""
+
+import numpy as np
+import pytest
+
+from topogentech.estimator import (
+    WGS84_A, WGS84_E2, estimate_export, geodesic_area_km2, geodesic_extent_km
+)
+
+
+def integrated_area_km2(south, north, width_deg=1.0, steps=20000):
+    # Midpoint rule over dA = M N cos(lat) dlat dlon
+    edges = np.radians(np.linspace(south, north, steps + 1))
+    lat = (edges[:-1] + edges[1:]) / 2
+    w = 1 - WGS84_E2 * np.sin(lat) ** 2
+    meridional = WGS84_A * (1 - WGS84_E2) / w ** 1.5
+    prime_vertical = WGS84_A / np.sqrt(w)
+    strip = meridional * prime_vertical * np.cos(lat) * np.diff(edges)
+    return float(strip.sum() * np.radians(width_deg) / 1e6)
+
+
+@pytest.mark.parametrize('south, known_km2', [(0, 12308.5), (60, 6123.1)])
+def test_one_degree_cells_match_wgs84_areas(south, known_km2):
+    area = float(geodesic_area_km2(0, 1, south, south + 1))
+
+    assert area == pytest.approx(known_km2, abs=0.1)
+    assert area == pytest.approx(integrated_area_km2(south, south + 1), rel=1e-9)
+    # Hemispheres and longitudes are symmetric
+    assert float(geodesic_area_km2(100, 101, -south - 1, -south)) == pytest.approx(area)
+
+
+def test_area_is_vectorized_and_sums_to_the_ellipsoid():
+    south = np.arange(-90, 90)
+    areas = geodesic_area_km2(-180, 180, south, south + 1)
+    assert areas.shape == (180,)
+    # Surface of the WGS84 ellipsoid
+    assert areas.sum() == pytest.approx(510065621.7, rel=1e-9)
+
+
+def test_boxes_crossing_the_antimeridian():
+    crossing = {'west': 179.5, 'east': -179.5, 'south': 50, 'north': 51}
+    same_size = {'west': -0.5, 'east': 0.5, 'south': 50, 'north': 51}
+    halves = [dict(crossing, east=180), dict(crossing, west=-180)]
+
+    area = float(geodesic_area_km2(179.5, -179.5, 50, 51))
+    assert area == pytest.approx(float(geodesic_area_km2(-0.5, 0.5, 50, 51)))
+    assert area == pytest.approx(integrated_area_km2(50, 51))
+
+    estimate = estimate_export([crossing, same_size] + halves, scale=100)
+    assert estimate['area_km2'][0] == pytest.approx(estimate['area_km2'][1])
+    assert estimate['area_km2'][0] == pytest.approx(estimate['area_km2'][2:].sum())
+
+    extent = geodesic_extent_km(179.5, -179.5, 50, 51)
+    assert extent['width_km'] == pytest.approx(geodesic_extent_km(-0.5, 0.5, 50, 51)['width_km'])
+    assert 70 < extent['width_km'] < 72
+
+
+def test_estimate_export_pixels_and_size():
+    cell = {'west': 0, 'east': 1, 'south': 0, 'north': 1}
+    estimate = estimate_export([cell, dict(cell, south=60, north=61)], scale=100,
+                               num_bands=64, bytes_per_value=1)
+
+    np.testing.assert_allclose(estimate['area_km2'],
+                               geodesic_area_km2([0, 0], [1, 1], [0, 60], [1, 61]))
+    # 100 pixels per square kilometer at 100 m
+    np.testing.assert_allclose(estimate['estimated_pixels'], estimate['area_km2'] * 100)
+    np.testing.assert_allclose(estimate['estimated_size_mb'],
+                               estimate['estimated_pixels'] * 64 / 1e6)
@@ -0,0 +1,127 @@
+"""Tests for polygon regions, clipping and tile pruning."""
+
+import json
+
+import numpy as np
+import pytest
+
+from topogentech.estimator import estimate_export, geodesic_area_km2
+from topogentech.geometry import PolygonRegion, prune_tiles, region_area_km2
+from topogentech.regions import RegionConfig
+from topogentech.tiling import split_bounds
+
+# L-shaped region: the north-east quarter of the 2x2 degree box is missing
+L_SHAPE = [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2], [0, 0]]
+HOLE = [[0.2, 0.2], [0.8, 0.2], [0.8, 0.8], [0.2, 0.8], [0.2, 0.2]]
+ISLAND = [[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]]
+
+
+def make_region(*polygons):
+    return PolygonRegion([[np.array(ring, dtype=float) for ring in polygon]
+                          for polygon in polygons], name='test')
+
+
+def test_area_matches_ellipsoidal_rectangles():
+    square = make_region([[[10, 50], [11, 50], [11, 51], [10, 51]]])
+    assert square.area_km2() == pytest.approx(float(geodesic_area_km2(10, 11, 50, 51)), rel=1e-12)
+
+    # The L shape is the 2x2 box minus its north-east quarter, less the hole
+    region = make_region([L_SHAPE, HOLE])
+    expected = (geodesic_area_km2(0, 2, 0, 2) - geodesic_area_km2(1, 2, 1, 2)
+                - geodesic_area_km2(0.2, 0.8, 0.2, 0.8))
+    assert region.area_km2() == pytest.approx(float(expected), rel=1e-12)
+
+
+def test_area_of_sloped_edges_matches_fine_strips():
+    triangle = make_region([[[10, 50], [20, 60], [10, 60]]])
+    # Integrate the same triangle as many thin latitude strips
+    edges = np.linspace(50, 60, 20001)
+    widths = (edges[:-1] + edges[1:]) / 2 - 50
+    strips = geodesic_area_km2(10, 10 + widths, edges[:-1], edges[1:]).sum()
+    assert triangle.area_km2() == pytest.approx(float(strips), rel=1e-6)
+
+
+def test_estimate_export_uses_polygon_area():
+    region = make_region([L_SHAPE])
+    estimate = estimate_export([region.to_bounds()], 1000)
+    assert estimate['area_km2'][0] == pytest.approx(region.area_km2())
+    assert region_area_km2(region.to_bounds()) == pytest.approx(region.area_km2())
+    assert region_area_km2({'west': 0, 'east': 1, 'south': 0, 'north': 1}) is None
+
+
+def test_contains_respects_holes_and_multipolygons():
+    region = make_region([L_SHAPE, HOLE], [ISLAND])
+    lon = [0.1, 0.5, 1.5, 1.5, 0.5, 5.5, 3.0]
+    lat = [0.1, 0.5, 0.5, 1.5, 1.5, 5.5, 3.0]
+    assert region.contains(lon, lat).tolist() == [True, False, True, False, True, True, False]
+
+
+def test_intersects_box_finds_edges_crossing_the_box():
+    region = make_region([L_SHAPE])
+    # No corner or centre of this thin box is inside, but the edge x=1 crosses it
+    assert region.intersects_box({'west': 0.9, 'east': 1.1, 'south': 1.5, 'north': 1.6})
+    assert not region.intersects_box({'west': 1.2, 'east': 1.8, 'south': 1.2, 'north': 1.8})
+    assert not region.intersects_box({'west': 3, 'east': 4, 'south': 3, 'north': 4})
+
+
+def test_clip_cuts_rings_at_tile_edges():
+    region = make_region([L_SHAPE])
+    clipped = region.clip({'west': 0.5, 'east': 1.5, 'south': 0.5, 'north': 1.5})
+    assert clipped.area_km2() == pytest.approx(
+        float(geodesic_area_km2(0.5, 1.5, 0.5, 1.5) - geodesic_area_km2(1, 1.5, 1, 1.5))
+    )
+    assert clipped.bounds == {'west': 0.5, 'east': 1.5, 'south': 0.5, 'north': 1.5}
+    assert region.clip({'west': 1.2, 'east': 1.8, 'south': 1.2, 'north': 1.8}) is None
+
+
+def test_prune_tiles_drops_tiles_outside_the_polygon():
+    region = make_region([L_SHAPE], [ISLAND])
+    bounds = region.to_bounds()
+    tiles = [dict(bounds, west=w, east=w + 1, south=s, north=s + 1, tile_id=f"{w}_{s}")
+             for w in range(7) for s in range(7)]
+
+    kept = prune_tiles(bounds, tiles)
+
+    # Tiles that only touch the polygon along an edge or at a corner are dropped too
+    assert sorted(tile['tile_id'] for tile in kept) == ['0_0', '0_1', '1_0', '5_5']
+    assert sum(tile['polygon'].area_km2() for tile in kept) == pytest.approx(region.area_km2())
+    # Rectangular regions keep every tile
+    plain = {'west': 0, 'east': 2, 'south': 0, 'north': 2}
+    assert prune_tiles(plain, split_bounds(plain, 50)) == split_bounds(plain, 50)
+
+
+def test_simplify_keeps_shape_within_tolerance():
+    angles = np.linspace(0, 2 * np.pi, 1001)
+    circle = np.column_stack([np.cos(angles), np.sin(angles)])
+    region = make_region([circle], [np.array(ISLAND) * 0.001 + 10])
+
+    simplified = region.simplify(0.01)
+
+    assert simplified.num_vertices < region.num_vertices / 5
+    # The tiny island collapses and is dropped
+    assert len(simplified.polygons) == 1
+    assert simplified.area_km2() == pytest.approx(region.area_km2(), rel=0.02)
+    radii = np.hypot(*simplified.polygons[0][0].T)
+    assert np.all(radii <= 1 + 1e-9) and np.all(radii >= 1 - 0.01)
+
+
+def test_load_geojson_region_registers_polygon(tmp_path):
+    path = tmp_path / 'region.geojson'
+    path.write_text(json.dumps({
+        'type': 'FeatureCollection',
+        'features': [
+            {'type': 'Feature', 'properties': {'name': 'main'},
+             'geometry': {'type': 'Polygon', 'coordinates': [L_SHAPE, HOLE]}},
+            {'type': 'Feature', 'properties': {},
+             'geometry': {'type': 'MultiPolygon', 'coordinates': [[ISLAND]]}}
+        ]
+    }))
+    try:
+        bounds = RegionConfig.load_geojson_region('Test_Polygon', str(path))
+        assert RegionConfig.get_region_bounds('test_polygon') is bounds
+    finally:
+        RegionConfig.CUSTOM_REGIONS.pop('test_polygon', None)
+
+    assert (bounds['west'], bounds['east'], bounds['south'], bounds['north']) == (0, 6, 0, 6)
+    assert len(bounds['polygon'].polygons) == 2
+    assert bounds['polygon'].contains([0.5, 5.5], [0.5, 5.5]).tolist() == [False, True]
@@ -0,0 +1,114 @@
+"""Tests for export duration prediction and schedule simulation."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from topogentech.predictor import (
+    INTERVAL_Z, PRIOR_PIXELS_PER_SECOND, PRIOR_READY_SECONDS, PRIOR_SPREAD,
+    PRIOR_STARTUP_SECONDS, DurationPredictor, makespan
+)
+
+QUEUE_SECONDS = 45.0
+STARTUP_SECONDS = 90.0
+
+
+def cost_per_pixel(scale):
+    # Coarser scales cost more per pixel, linearly in log(scale)
+    return 4e-6 * (1 + 0.25 * (np.log(scale) - np.log(30)))
+
+
+def synthetic_history(n=60, noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = rng.uniform(1e6, 1e8, n)
+    scale = rng.choice([10, 30, 100], n)
+    running = (STARTUP_SECONDS + pixels * cost_per_pixel(scale)) * rng.lognormal(0, noise, n)
+    return pixels, scale, running, running + QUEUE_SECONDS
+
+
+def test_fit_recovers_overhead_and_cost_per_pixel():
+    predictor = DurationPredictor()
+    for p, s, running, total in zip(*synthetic_history()):
+        predictor.add(p, s, 2024, total, running_seconds=running)
+    assert predictor.fit()
+
+    pixels = np.array([0.0, 5e6, 5e7, 5e7])
+    scale = np.array([30, 30, 30, 100])
+    result = predictor.predict(pixels, scale, 2024)
+
+    expected_running = STARTUP_SECONDS + pixels * cost_per_pixel(scale)
+    np.testing.assert_allclose(result['running_seconds'], expected_running, rtol=1e-6)
+    np.testing.assert_allclose(result['seconds'], expected_running + QUEUE_SECONDS, rtol=1e-6)
+    np.testing.assert_allclose(result['pixels_per_second'], pixels / expected_running, rtol=1e-6)
+    # Noise-free history leaves no spread
+    np.testing.assert_allclose(result['seconds_low'], result['seconds'], rtol=1e-6)
+
+
+def test_interval_widens_with_noisy_history():
+    predictor = DurationPredictor()
+    for p, s, running, total in zip(*synthetic_history(n=400, noise=0.2)):
+        predictor.add(p, s, 2024, total, running_seconds=running)
+
+    result = predictor.predict(5e7, 30, 2024)
+    expected = STARTUP_SECONDS + 5e7 * cost_per_pixel(30) + QUEUE_SECONDS
+    assert result['seconds'][0] == pytest.approx(expected, rel=0.1)
+    ratio = result['seconds_high'][0] / result['seconds'][0]
+    assert ratio == pytest.approx(math.exp(INTERVAL_Z * 0.2), rel=0.15)
+    assert result['seconds_low'][0] == pytest.approx(result['seconds'][0] / ratio)
+
+
+def test_prior_is_used_until_enough_tasks_completed():
+    predictor = DurationPredictor(min_samples=5)
+    for p, s, running, total in zip(*synthetic_history(n=4)):
+        predictor.add(p, s, 2024, total, running_seconds=running)
+
+    assert not predictor.fit()
+    result = predictor.predict(1e7, 30, 2024)
+    running = PRIOR_STARTUP_SECONDS + 1e7 / PRIOR_PIXELS_PER_SECOND
+    assert result['running_seconds'][0] == pytest.approx(running)
+    assert result['seconds'][0] == pytest.approx(running + PRIOR_READY_SECONDS)
+    assert result['seconds_high'][0] == pytest.approx(result['seconds'][0] * PRIOR_SPREAD)
+
+    # A fifth task switches to the regression on the next prediction
+    predictor.add(1e7, 30, 2024, 500, running_seconds=400)
+    assert predictor.predict(1e7, 30, 2024)['seconds'][0] != pytest.approx(
+        running + PRIOR_READY_SECONDS
+    )
+
+
+def test_add_event_log_skips_incomplete_and_duplicate_tasks(tmp_path):
+    rows = [
+        {'event': 'COMPLETED', 'task_id': 'A', 'pixels': 1e6, 'scale': 10, 'year': 2024,
+         'total_seconds': 100, 'running_seconds': 80},
+        {'event': 'COMPLETED', 'task_id': 'A', 'pixels': 1e6, 'scale': 10, 'year': 2024,
+         'total_seconds': 100},
+        {'event': 'FAILED', 'task_id': 'B', 'pixels': 1e6, 'scale': 10, 'year': 2024,
+         'total_seconds': 50},
+        {'event': 'COMPLETED', 'task_id': 'C', 'pixels': '', 'scale': 10, 'year': 2024,
+         'total_seconds': 100},
+        {'event': 'COMPLETED', 'task_id': 'D', 'pixels': 2e6, 'scale': 10, 'year': 2024,
+         'total_seconds': 150},
+    ]
+    path = tmp_path / 'events.jsonl'
+    path.write_text(''.join(json.dumps(row) + '\n' for row in rows))
+
+    predictor = DurationPredictor()
+    assert predictor.add_event_log(str(path)) == 2
+    assert predictor.add_event_log(str(path)) == 0
+    assert predictor.samples == 2
+    assert predictor.add_event_log(str(tmp_path / 'missing.jsonl')) == 0
+
+
+def test_makespan_replays_jobs_on_free_slots():
+    assert makespan([], 3) == 0
+    assert makespan([5], 3) == 5
+    # Longest first: slots finish at 3, 3 -> 5, 3 -> 5, 5 -> 7, 5
+    assert makespan([3, 3, 2, 2, 2], 2) == 7
+    # Jobs start in the given order, so a long job last finishes late
+    assert makespan([1, 1, 4], 2) == 5
+    assert makespan([4, 1, 1], 2) == 4
+    # The only slot is busy for another 5 seconds, so both jobs wait
+    assert makespan([1, 1], 1, busy=[5]) == 7
+    assert makespan([4, 4], 2, busy=[1]) == 5
@@ -0,0 +1,122 @@
+"""Tests for reduced-precision storage and export decoding."""
+
+import numpy as np
+import pytest
+
+from topogentech.quantization import (
+    INT8_MAX, INT8_NODATA, bytes_per_value, dequantize, dequantize_export, export_scale,
+    quantize, reconstruction_error
+)
+
+
+def unit_vectors(n=500, dims=64, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dims))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_float_precisions_round_trip():
+    original = unit_vectors()
+
+    data, params = quantize(original, 'float32')
+    assert data.dtype == np.float32
+    np.testing.assert_array_equal(dequantize(data, params), original)
+
+    data, params = quantize(original, 'float16')
+    assert data.dtype == np.float16
+    restored = dequantize(data, params)
+    assert restored.dtype == np.float32
+    np.testing.assert_allclose(restored, original, rtol=2 ** -11, atol=2 ** -24)
+
+
+def test_int8_uses_one_scale_per_band():
+    original = unit_vectors()
+    original[:, 1] *= 0.01
+
+    data, params = quantize(original, 'int8')
+    assert data.dtype == np.int8
+    np.testing.assert_allclose(params['scale'], np.abs(original).max(axis=0) / INT8_MAX,
+                               rtol=1e-6)
+    # The largest value of every band maps to +-127
+    np.testing.assert_array_equal(np.abs(data).max(axis=0), INT8_MAX)
+
+    restored = dequantize(data, params)
+    assert np.all(np.abs(restored - original) <= params['scale'] / 2 + 1e-7)
+
+
+def test_int8_nodata_and_empty_bands():
+    original = unit_vectors(10, 4)
+    original[:, 2] = 0
+    original[3] = np.nan
+
+    data, params = quantize(original, 'int8')
+    assert np.all(data[3] == INT8_NODATA)
+    assert not np.any(np.delete(data, 3, axis=0) == INT8_NODATA)
+    # A band without signal gets a neutral scale rather than a division by zero
+    assert params['scale'][2] == pytest.approx(1 / INT8_MAX)
+
+    restored = dequantize(data, params)
+    assert np.isnan(restored[3]).all()
+    assert np.all(restored[:, 2][~np.isnan(restored[:, 2])] == 0)
+    assert not np.isnan(np.delete(restored, 3, axis=0)).any()
+
+
+def test_reconstruction_error_by_precision():
+    original = unit_vectors()
+
+    exact = reconstruction_error(original, 'float32')
+    assert exact['max_abs_error'] == exact['rmse'] == 0
+    assert exact['mean_cosine_distance'] == pytest.approx(0, abs=1e-12)
+    half = reconstruction_error(original, 'float16')
+    int8 = reconstruction_error(original, 'int8')
+    data, params = quantize(original, 'int8')
+
+    assert 0 < half['max_abs_error'] <= 2 ** -11
+    assert half['max_abs_error'] < int8['max_abs_error'] <= params['scale'].max() / 2 + 1e-7
+    assert half['rmse'] < int8['rmse'] <= int8['max_abs_error']
+    assert 0 < int8['mean_cosine_distance'] < 1e-3
+
+    # Pixels with missing values are left out, and no valid pixels means no error
+    original[::2, 0] = np.nan
+    assert reconstruction_error(original, 'int8')['max_abs_error'] > 0
+    empty = np.full((3, 4), np.nan, dtype=np.float32)
+    assert reconstruction_error(empty, 'int8') == {
+        'max_abs_error': 0.0, 'rmse': 0.0, 'mean_cosine_distance': 0.0
+    }
+
+
+@pytest.mark.parametrize('precision, dtype', [('float16', np.int16), ('int8', np.int8)])
+def test_dequantize_export_inverts_fixed_point(precision, dtype):
+    original = unit_vectors(100, 8)
+    multiplier = export_scale(precision)
+    # What Earth Engine writes: multiply, round and cast
+    exported = np.round(original * multiplier).astype(dtype)
+
+    restored = dequantize_export(exported, precision)
+    assert restored.dtype == np.float32
+    assert np.all(np.abs(restored - original) <= 0.5 / multiplier + 1e-7)
+    # The export takes as many bytes per value as the precision promises
+    assert bytes_per_value(precision) == np.dtype(dtype).itemsize
+
+
+def test_dequantize_export_masks_nodata_before_scaling():
+    exported = np.array([[127, -128, 0], [-127, 64, -128]], dtype=np.int8)
+
+    restored = dequantize_export(exported, 'int8', nodata=INT8_NODATA)
+    assert np.isnan(restored[exported == INT8_NODATA]).all()
+    np.testing.assert_allclose(restored[exported != INT8_NODATA],
+                               [1.0, 0.0, -1.0, 64 / 127])
+
+    # float32 exports are passed through, apart from the nodata value
+    raw = np.array([0.5, -9999.0, -0.25], dtype=np.float32)
+    assert export_scale('float32') is None
+    np.testing.assert_array_equal(dequantize_export(raw, 'float32', nodata=-9999.0),
+                                  [0.5, np.nan, -0.25])
+    np.testing.assert_array_equal(dequantize_export(raw, 'float32'), raw)
+
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError):
+        quantize(unit_vectors(2, 2), 'float64')
+    with pytest.raises(ValueError):
+        dequantize_export(np.zeros(2), 'uint8')
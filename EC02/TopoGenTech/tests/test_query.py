@@ -0,0 +1,106 @@
+"""Tests for query plan caching, with the Earth Engine client stubbed out."""
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from topogentech import query
+from topogentech.geometry import PolygonRegion
+from topogentech.query import QueryPlanner
+
+DATASET = 'dataset'
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+GUAYAQUIL = {'west': -80.1, 'east': -79.8, 'south': -2.3, 'north': -2.0}
+TRIANGLE = [[-78.6, -0.3], [-78.4, -0.3], [-78.6, -0.1]]
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    # Building ee objects needs an initialized client; the planner only
+    # composes them, so a mock records what it builds
+    fake = mock.MagicMock()
+    monkeypatch.setattr(query, 'ee', fake)
+    monkeypatch.setattr(PolygonRegion, 'to_ee', lambda self: ('polygon', self.fingerprint))
+    return fake
+
+
+def polygon_bounds(ring):
+    return PolygonRegion([[np.array(ring, dtype=float)]]).to_bounds()
+
+
+def test_plans_are_cached_by_year_bounds_and_polygon(fake_ee):
+    planner = QueryPlanner()
+    plan = planner.plan(QUITO, 2024, DATASET)
+
+    # Float noise below the key precision still hits
+    assert planner.plan(dict(QUITO, west=QUITO['west'] + 1e-12), 2024, DATASET) is plan
+    assert (planner.hits, planner.misses) == (1, 1)
+
+    others = [
+        planner.plan(QUITO, 2023, DATASET),
+        planner.plan(QUITO, 2024, 'other'),
+        planner.plan(dict(QUITO, west=-78.5), 2024, DATASET),
+        planner.plan(polygon_bounds(TRIANGLE), 2024, DATASET),
+    ]
+    assert len({id(p) for p in others + [plan]}) == 5
+    assert (planner.hits, planner.misses) == (1, 5)
+
+    # The same polygon hits, even from a new region object
+    assert planner.plan(polygon_bounds(TRIANGLE), 2024, DATASET) is others[-1]
+    assert others[-1].geometry == ('polygon', PolygonRegion(
+        [[np.array(TRIANGLE, dtype=float)]]).fingerprint)
+    assert (planner.hits, planner.misses) == (2, 5)
+    assert len(planner) == 5
+
+
+def test_collections_are_shared_per_year(fake_ee):
+    planner = QueryPlanner()
+    planner.plan(QUITO, 2024, DATASET)
+    planner.plan(GUAYAQUIL, 2024, DATASET)
+    assert fake_ee.ImageCollection.call_count == 1
+
+    planner.plan(QUITO, 2023, DATASET)
+    assert fake_ee.ImageCollection.call_count == 2
+    assert planner.annual_image(DATASET, 2024) is planner.annual_image(DATASET, 2024)
+    assert fake_ee.ImageCollection.call_count == 2
+
+    planner.clear()
+    assert len(planner) == 0 and (planner.hits, planner.misses) == (0, 0)
+    planner.plan(QUITO, 2024, DATASET)
+    assert fake_ee.ImageCollection.call_count == 3
+
+
+def test_batch_lookup_builds_only_missing_plans(fake_ee):
+    planner = QueryPlanner()
+    quito = planner.plan(QUITO, 2024, DATASET)
+    fake_ee.Geometry.Rectangle.reset_mock()
+
+    berlin = {'west': 13.0, 'east': 13.8, 'south': 52.3, 'north': 52.7}
+    plans = planner.plans([GUAYAQUIL, QUITO, berlin], 2024, DATASET)
+
+    assert plans[1] is quito
+    assert fake_ee.Geometry.Rectangle.call_count == 2
+    assert fake_ee.ImageCollection.call_count == 1
+    assert (planner.hits, planner.misses) == (1, 3)
+    assert planner.plans([berlin, QUITO, GUAYAQUIL], 2024, DATASET) == plans[::-1]
+    assert (planner.hits, planner.misses) == (4, 3)
+
+
+def test_least_recently_used_plan_is_evicted(fake_ee):
+    planner = QueryPlanner(max_plans=3)
+    boxes = [dict(QUITO, west=QUITO['west'] - i) for i in range(4)]
+    first = [planner.plan(box, 2024, DATASET) for box in boxes[:3]]
+
+    # Touching the oldest plan makes the second one the least recently used
+    assert planner.plan(boxes[0], 2024, DATASET) is first[0]
+    planner.plan(boxes[3], 2024, DATASET)
+    assert len(planner) == 3
+
+    misses = planner.misses
+    assert planner.plan(boxes[0], 2024, DATASET) is first[0]
+    assert planner.plan(boxes[2], 2024, DATASET) is first[2]
+    assert planner.misses == misses
+    assert planner.plan(boxes[1], 2024, DATASET) is not first[1]
+    assert planner.misses == misses + 1
+    assert len(planner) == 3
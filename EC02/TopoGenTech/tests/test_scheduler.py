@@ -0,0 +1,70 @@
+"""Tests for ExportScheduler against the in-process FakeBackend."""
+
+import json
+
+from topogentech.backends import FakeBackend
+from topogentech.cli import plan_exports
+from topogentech.downloader import SatelliteEmbeddingsDownloader
+from topogentech.manifest import ExportManifest
+from topogentech.metrics import ExportMetrics
+from topogentech.regions import RegionConfig
+from topogentech.scheduler import ExportScheduler
+from topogentech.tiling import split_bounds
+
+
+def make_scheduler(backend, manifest_path):
+    downloader = SatelliteEmbeddingsDownloader('test-project', backend=backend)
+    assert downloader.initialize()
+    scheduler = ExportScheduler(downloader, max_concurrent=10, check_interval=30,
+                                manifest=ExportManifest(manifest_path))
+    bounds = RegionConfig.get_region_bounds('quito')
+    for tile in split_bounds(bounds, 5):
+        scheduler.add_job(tile, f"quito_{tile['tile_id']}")
+    return scheduler
+
+
+def test_rerun_with_manifest_submits_each_job_once(tmp_path):
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=10, pixels_per_second=1e6, duration_noise=0,
+                          speedup=100, seed=1)
+    manifest_path = str(tmp_path / 'manifest.jsonl')
+
+    # First run stops right after submitting a batch, so the cached task
+    # list (refreshed by the poll just before) has not seen those tasks
+    first = make_scheduler(backend, manifest_path)
+    num_jobs = first.pending_count
+    first.run(verbose=False, timeout=45)
+    assert not first.is_done()
+
+    # Second run, within the task index TTL, resumes and finishes the rest
+    second = make_scheduler(backend, manifest_path)
+    summary = second.run(verbose=False)
+
+    assert second.is_done()
+    assert summary.get('COMPLETED') == num_jobs
+    assert backend.calls['start_export'] == num_jobs
+
+
+def test_event_log_rows_name_their_region(tmp_path):
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=10, pixels_per_second=1e6, duration_noise=0,
+                          speedup=1000)
+    event_log = str(tmp_path / 'events.jsonl')
+    metrics = ExportMetrics(event_log=event_log, clock=backend.time)
+    downloader = SatelliteEmbeddingsDownloader('test-project', scale=1000, backend=backend,
+                                               metrics=metrics)
+    assert downloader.initialize()
+    scheduler = ExportScheduler(None, max_concurrent=4, check_interval=30, backend=backend,
+                                metrics=metrics)
+
+    # Planned exports carry the region name in their metadata, not their bounds
+    regions = {'quito': RegionConfig.get_region_bounds('quito')}
+    for export in plan_exports(regions, [2024], [1000], tile_size_km=10):
+        scheduler.add_job(export['bounds'], export['description'], downloader=downloader,
+                          metadata={k: v for k, v in export.items() if k != 'bounds'})
+    scheduler.run(verbose=False)
+
+    with open(event_log, encoding='utf-8') as fh:
+        events = [json.loads(line) for line in fh]
+    assert {event['event'] for event in events} >= {'SUBMITTED', 'COMPLETED'}
+    assert all(event['region'] == 'quito' for event in events)
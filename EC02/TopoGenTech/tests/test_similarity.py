@@ -0,0 +1,92 @@
+"""Tests for exact and IVF nearest-neighbour search."""
+
+import numpy as np
+import pytest
+
+from topogentech.similarity import ExactIndex, IVFIndex, PixelSimilarityIndex
+
+
+def clustered_vectors(n, dims=16, n_clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, dims)) * 4
+    return (centres[rng.integers(n_clusters, size=n)]
+            + rng.normal(size=(n, dims))).astype(np.float32)
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'l2'])
+def test_exact_search_matches_brute_force(metric):
+    vectors = clustered_vectors(3000)
+    queries = clustered_vectors(20, seed=1)
+    if metric == 'cosine':
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(queries @ unit.T), axis=1)[:, :10]
+    else:
+        expected = np.argsort(((queries[:, None] - vectors[None]) ** 2).sum(-1), axis=1)[:, :10]
+
+    # A small batch size exercises the running top-k across batches
+    result = ExactIndex(vectors, metric=metric, batch_size=256).search(queries, k=10)
+
+    assert result['indices'].shape == (20, 10)
+    np.testing.assert_array_equal(result['indices'], expected)
+    assert np.all(np.diff(result['distances'], axis=1) >= 0)
+
+
+def test_cosine_and_l2_rank_differently():
+    vectors = np.array([[1.0, 0.0], [10.0, 10.0]])
+    query = np.array([5.0, 5.0])
+
+    cosine = ExactIndex(vectors, metric='cosine').search(query, k=2)
+    l2 = ExactIndex(vectors, metric='l2').search(query, k=2)
+
+    # Same direction wins under cosine, the closer point under L2
+    assert cosine['indices'][0].tolist() == [1, 0]
+    assert cosine['distances'][0, 0] == pytest.approx(0, abs=1e-6)
+    assert l2['indices'][0].tolist() == [0, 1]
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'l2'])
+def test_ivf_recall_matches_exact_search(metric):
+    vectors = clustered_vectors(20000)
+    queries = clustered_vectors(200, seed=1)
+    exact = ExactIndex(vectors, metric=metric).search(queries, k=10)['indices']
+    index = IVFIndex(vectors, metric=metric, n_lists=64, n_probe=8)
+
+    approximate = index.search(queries, k=10)['indices']
+    recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(approximate, exact)])
+    assert recall >= 0.95
+
+    # Probing every list is an exact search
+    complete = index.search(queries, k=10, n_probe=64)['indices']
+    np.testing.assert_array_equal(complete, exact)
+
+
+def test_both_indexes_pad_missing_neighbours():
+    vectors = np.eye(3, 4, dtype=np.float32)
+    queries = np.ones((2, 4), dtype=np.float32)
+
+    for index in (ExactIndex(vectors), IVFIndex(vectors, n_lists=1)):
+        result = index.search(queries, k=5)
+        assert result['indices'].shape == result['distances'].shape == (2, 5)
+        assert sorted(result['indices'][0, :3].tolist()) == [0, 1, 2]
+        assert result['indices'][:, 3:].tolist() == [[-1, -1], [-1, -1]]
+        assert np.all(np.isinf(result['distances'][:, 3:]))
+
+
+def test_search_like_pixel_finds_the_pixel_itself():
+    rng = np.random.default_rng(0)
+    window = rng.normal(size=(4, 5, 8)).astype(np.float32)
+    window[0, 0] = np.nan
+    metadata = {'west': -0.5, 'north': 0.25, 'pixel_deg': 0.1}
+    index = PixelSimilarityIndex(window, metadata, metric='l2', approximate=False)
+    assert len(index) == 19
+
+    # Pixel (row 2, col 3) spans lon -0.2 to -0.1 and lat -0.05 to 0.05
+    result = index.search_like_pixel(-0.17, 0.0, k=3)
+    assert result['distances'][0, 0] == pytest.approx(0, abs=1e-4)
+    assert result['lon'][0, 0] == pytest.approx(-0.15)
+    assert result['lat'][0, 0] == pytest.approx(0.0)
+
+    # Just outside the window's west and north edges, and on the missing pixel
+    for lon, lat in ((-0.52, 0.0), (-0.3, 0.27), (-0.45, 0.2)):
+        with pytest.raises(ValueError):
+            index.search_like_pixel(lon, lat)
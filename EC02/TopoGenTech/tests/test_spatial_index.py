@@ -0,0 +1,36 @@
+"""Tests for RegionIndex point lookups."""
+
+import numpy as np
+
+from topogentech.spatial_index import NO_REGION, RegionIndex
+
+ECUADOR = {'west': -81.5, 'east': -75.0, 'south': -5.0, 'north': 2.0}
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+
+
+def test_locate_prefers_city_nested_in_country():
+    # Points inside the city, inside the country only, and outside both
+    lon = np.array([-78.5, -78.45, -80.0, -76.0, -70.0])
+    lat = np.array([-0.2, -0.15, -2.0, 1.0, 0.0])
+    expected = ['quito', 'quito', 'ecuador', 'ecuador', None]
+
+    for regions in ({'ecuador': ECUADOR, 'quito': QUITO},
+                    {'quito': QUITO, 'ecuador': ECUADOR}):
+        index = RegionIndex(regions, cell_size=0.5)
+        region_ids = index.locate(lon, lat)
+        assert list(index.region_names(region_ids)) == expected
+        assert region_ids[-1] == NO_REGION
+
+
+def test_locate_many_points_in_nested_regions():
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-79.0, -78.0, 100000)
+    lat = rng.uniform(-0.6, 0.2, 100000)
+    index = RegionIndex({'ecuador': ECUADOR, 'quito': QUITO}, cell_size=0.1)
+
+    names = index.region_names(index.locate(lon, lat, block_size=7919))
+
+    in_quito = ((lon >= QUITO['west']) & (lon <= QUITO['east'])
+                & (lat >= QUITO['south']) & (lat <= QUITO['north']))
+    assert np.all(names[in_quito] == 'quito')
+    assert np.all(names[~in_quito] == 'ecuador')
@@ -0,0 +1,141 @@
+"""Tests for the chunked embedding store."""
+
+import os
+
+import numpy as np
+import pytest
+
+from topogentech.quantization import INT8_MAX
+from topogentech.store import EmbeddingStore
+
+BANDS = ['A00', 'A01', 'A02', 'A03']
+CHUNK = 16
+# Global pixel position of the test raster; it spans 3 x 3 chunks
+ROW, COL = 1000 * CHUNK + 10, 2000 * CHUNK + 5
+HEIGHT, WIDTH = 30, 40
+
+
+def make_store(tmp_path, precision='float32'):
+    return EmbeddingStore.create(str(tmp_path / 'store'), scale=1000, bands=BANDS,
+                                 chunk_size=CHUNK, precision=precision)
+
+
+def make_raster(height=HEIGHT, width=WIDTH, seed=0):
+    rng = np.random.default_rng(seed)
+    # Bands of very different magnitude, so each needs its own int8 scale
+    raster = rng.uniform(-1, 1, (height, width, len(BANDS))) * [1.0, 0.5, 0.1, 0.01]
+    return raster.astype(np.float32)
+
+
+def bounds_of(store, row, col, height, width):
+    metadata = store.window_metadata((row, row + height, col, col + width))
+    return {key: metadata[key] for key in ('west', 'east', 'south', 'north')}
+
+
+def test_round_trip_across_chunk_boundaries(tmp_path):
+    store = make_store(tmp_path)
+    raster = make_raster()
+
+    assert store.write_array(raster, ROW, COL, 2024) == 3 * 3
+    reopened = EmbeddingStore(store.path)
+    assert reopened.list_years() == [2024]
+
+    window, metadata = reopened.read_window(bounds_of(store, ROW, COL, HEIGHT, WIDTH))
+    np.testing.assert_array_equal(window, raster)
+    assert (metadata['row_offset'], metadata['col_offset']) == (ROW, COL)
+
+    # A window straddling chunk edges, with two bands in reverse order
+    sub, _ = reopened.read_window(bounds_of(store, ROW + 3, COL + 9, 20, 25),
+                                  bands=['A02', 'A00'])
+    np.testing.assert_array_equal(sub, raster[3:23, 9:34, [2, 0]])
+
+    # Pixels around the raster have no data
+    margin, _ = reopened.read_window(bounds_of(store, ROW - 2, COL - 2, HEIGHT + 4, WIDTH + 4))
+    assert np.isnan(margin[:2]).all() and np.isnan(margin[:, -2:]).all()
+    np.testing.assert_array_equal(margin[2:-2, 2:-2], raster)
+
+
+def test_partial_chunk_writes_are_merged(tmp_path):
+    store = make_store(tmp_path)
+    left, right = make_raster(8, 6, seed=1), make_raster(8, 6, seed=2)
+    row, col = 100 * CHUNK, 100 * CHUNK
+
+    # Both halves land in the same chunk
+    assert store.write_array(left, row, col, 2024) == 1
+    assert store.write_array(right, row, col + 6, 2024) == 1
+    assert store.chunk_keys(2024) == [(100, 100)]
+
+    window, _ = store.read_window(bounds_of(store, row, col, 8, 12))
+    np.testing.assert_array_equal(window[:, :6], left)
+    np.testing.assert_array_equal(window[:, 6:], right)
+
+    # An overlapping write replaces only the pixels it covers
+    patch = np.zeros((2, 2, len(BANDS)), dtype=np.float32)
+    store.write_array(patch, row + 3, col + 5, 2024)
+    window, _ = store.read_window(bounds_of(store, row, col, 8, 12))
+    np.testing.assert_array_equal(window[3:5, 5:7], patch)
+    np.testing.assert_array_equal(window[:3, :6], left[:3])
+    np.testing.assert_array_equal(window[:, 7:], right[:, 1:])
+
+    chunk = store.read_chunk(2024, 100, 100)
+    assert np.isnan(chunk[8:]).all() and np.isnan(chunk[:, 12:]).all()
+
+
+def test_float16_round_trip(tmp_path):
+    store = make_store(tmp_path, 'float16')
+    raster = make_raster()
+    store.write_array(raster, ROW, COL, 2024)
+
+    window, _ = store.read_window(bounds_of(store, ROW, COL, HEIGHT, WIDTH))
+    assert window.dtype == np.float32
+    # float16 keeps 11 significant bits, fewer below 6e-5
+    np.testing.assert_allclose(window, raster, rtol=2 ** -11, atol=2 ** -24)
+    assert 0 < store.max_quantization_error <= 2 ** -11
+
+
+def test_int8_stores_per_band_scales(tmp_path):
+    store = make_store(tmp_path, 'int8')
+    raster = make_raster()
+    raster[0, 0] = np.nan
+    store.write_array(raster, ROW, COL, 2024)
+
+    chunk_row, chunk_col = ROW // CHUNK, COL // CHUNK
+    with np.load(os.path.join(store.path, '2024', f"{chunk_row}_{chunk_col}.npz")) as chunk:
+        scale = chunk['__scale__']
+        assert chunk['A00'].dtype == np.int8
+    # The largest value of each band in the chunk maps to 127
+    part = raster[:CHUNK - ROW % CHUNK, :CHUNK - COL % CHUNK]
+    np.testing.assert_allclose(scale, np.nanmax(np.abs(part), axis=(0, 1)) / INT8_MAX, rtol=1e-6)
+
+    window, _ = store.read_window(bounds_of(store, ROW, COL, HEIGHT, WIDTH))
+    assert np.isnan(window[0, 0]).all()
+    band_scale = np.abs(raster).reshape(-1, len(BANDS))
+    tolerance = np.nanmax(band_scale, axis=0) / INT8_MAX / 2 + 1e-7
+    assert np.all(np.abs(window - raster)[1:] <= tolerance)
+    assert np.nanmax(np.abs(window - raster)) <= store.max_quantization_error + 1e-7
+
+    # Reading a subset of bands applies the scales of those bands
+    sub, _ = store.read_window(bounds_of(store, ROW, COL, HEIGHT, WIDTH), bands=['A03', 'A01'])
+    np.testing.assert_array_equal(sub, window[:, :, [3, 1]])
+
+
+def test_int8_merge_rescales_existing_pixels(tmp_path):
+    store = make_store(tmp_path, 'int8')
+    row, col = 100 * CHUNK, 100 * CHUNK
+    small = make_raster(8, 8, seed=1) * 0.1
+    large = make_raster(8, 8, seed=2)
+
+    store.write_array(small, row, col, 2024)
+    store.write_array(large, row + 8, col, 2024)
+
+    # Pixels written first are requantized with the chunk's new, larger scale
+    window, _ = store.read_window(bounds_of(store, row, col, 16, 8))
+    scale = np.abs(np.concatenate([small, large])).reshape(-1, len(BANDS)).max(axis=0) / INT8_MAX
+    assert np.all(np.abs(window[:8] - small) <= scale + 1e-7)
+    assert np.all(np.abs(window[8:] - large) <= scale / 2 + 1e-7)
+
+
+def test_write_rejects_wrong_band_count(tmp_path):
+    store = make_store(tmp_path)
+    with pytest.raises(ValueError):
+        store.write_array(np.zeros((4, 4, 3), dtype=np.float32), 0, 0, 2024)
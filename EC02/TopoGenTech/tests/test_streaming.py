@@ -0,0 +1,146 @@
+"""Tests for pixel grids and block-wise streaming into memory maps."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from topogentech import streaming
+from topogentech.streaming import (
+    METERS_PER_DEGREE, PixelGrid, PixelStreamer, SyntheticPixelEndpoint, open_download
+)
+
+QUITO = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1}
+SCALE = 1000
+PIXEL_DEG = SCALE / METERS_PER_DEGREE
+
+
+class FlakyEndpoint(SyntheticPixelEndpoint):
+    """Synthetic endpoint whose blocks fail a given number of times each."""
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.attempts = {}
+        self._lock = threading.Lock()
+
+    def fetch_block(self, year, west, north, pixel_deg, width, height, bands):
+        with self._lock:
+            key = (round(west, 9), round(north, 9))
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            if self.attempts[key] <= self.failures:
+                raise ConnectionError('pixel request failed')
+        return super().fetch_block(year, west, north, pixel_deg, width, height, bands)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(streaming.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_grid_snaps_to_global_lattice():
+    grid = PixelGrid(QUITO, SCALE)
+
+    assert grid.west == pytest.approx(-180 + grid.col_offset * PIXEL_DEG)
+    assert grid.north == pytest.approx(90 - grid.row_offset * PIXEL_DEG)
+    # Snapped outwards, by less than a pixel
+    extent = grid.to_dict()
+    assert 0 <= QUITO['west'] - extent['west'] < PIXEL_DEG
+    assert 0 <= extent['north'] - QUITO['north'] < PIXEL_DEG
+    assert 0 <= extent['east'] - QUITO['east'] < PIXEL_DEG
+    assert 0 <= QUITO['south'] - extent['south'] < PIXEL_DEG
+
+    # Bounds already on the lattice keep their size
+    snapped = PixelGrid({key: extent[key] for key in QUITO}, SCALE)
+    assert snapped.to_dict() == extent
+
+    # A region for another year or a slightly larger area starts on the same pixel
+    grown = PixelGrid(dict(QUITO, east=QUITO['east'] + 0.05, south=QUITO['south'] - 0.05), SCALE)
+    assert (grown.row_offset, grown.col_offset) == (grid.row_offset, grid.col_offset)
+    assert (grown.west, grown.north) == (grid.west, grid.north)
+
+
+def test_grid_origin_is_the_world_corner():
+    grid = PixelGrid({'west': -180, 'east': -180 + 3 * PIXEL_DEG,
+                      'south': 90 - 2 * PIXEL_DEG, 'north': 90}, SCALE)
+    assert (grid.row_offset, grid.col_offset) == (0, 0)
+    assert (grid.west, grid.north) == (-180, 90)
+    assert grid.shape == (2, 3)
+
+
+def test_blocks_tile_the_grid_exactly():
+    grid = PixelGrid(QUITO, SCALE)
+    covered = np.zeros(grid.shape, dtype=int)
+    for row, col, height, width in grid.blocks(7):
+        assert height <= 7 and width <= 7
+        covered[row:row + height, col:col + width] += 1
+    assert np.all(covered == 1)
+
+
+def test_download_assembles_blocks_in_the_memmap(tmp_path):
+    endpoint = SyntheticPixelEndpoint(num_bands=8)
+    path = str(tmp_path / 'quito.npy')
+    grid = PixelGrid(QUITO, SCALE)
+
+    # Blocks of 7 leave partial blocks along the right and bottom edges
+    array = PixelStreamer(endpoint, block_size=7, workers=4).download(
+        QUITO, path, 2024, SCALE, bands=['A01', 'A05'], verbose=False
+    )
+
+    assert grid.shape[0] % 7 and grid.shape[1] % 7
+    assert array.shape == grid.shape + (2,)
+    assert endpoint.request_count == len(grid.blocks(7))
+    whole = endpoint.fetch_block(2024, grid.west, grid.north, grid.pixel_deg,
+                                 grid.width, grid.height, ['A01', 'A05'])
+    np.testing.assert_allclose(array, whole, atol=1e-5)
+
+    stored, metadata = open_download(path)
+    np.testing.assert_array_equal(stored, array)
+    assert metadata['bands'] == ['A01', 'A05']
+    assert metadata['year'] == 2024
+    assert (metadata['row_offset'], metadata['col_offset']) == (grid.row_offset, grid.col_offset)
+
+
+def test_overlapping_downloads_share_pixels(tmp_path):
+    endpoint = SyntheticPixelEndpoint(num_bands=4)
+    streamer = PixelStreamer(endpoint, block_size=16)
+    east = dict(QUITO, west=-78.5, east=-78.3)
+
+    first = streamer.download(QUITO, str(tmp_path / 'a.npy'), 2024, SCALE, verbose=False)
+    second = streamer.download(east, str(tmp_path / 'b.npy'), 2024, SCALE, verbose=False)
+
+    a, b = PixelGrid(QUITO, SCALE), PixelGrid(east, SCALE)
+    shift = b.col_offset - a.col_offset
+    assert a.row_offset == b.row_offset and 0 < shift < a.width
+    np.testing.assert_allclose(first[:, shift:], second[:, :a.width - shift], atol=1e-5)
+
+
+def test_failed_blocks_are_retried(tmp_path, sleeps):
+    endpoint = FlakyEndpoint(failures=2, num_bands=4)
+    streamer = PixelStreamer(endpoint, block_size=16, workers=4, max_retries=3)
+    grid = PixelGrid(QUITO, SCALE)
+
+    array = streamer.download(QUITO, str(tmp_path / 'quito.npy'), 2024, SCALE, verbose=False)
+
+    blocks = len(grid.blocks(16))
+    assert len(endpoint.attempts) == blocks
+    assert set(endpoint.attempts.values()) == {3}
+    # Exponential backoff between attempts
+    assert sorted(sleeps) == sorted([1, 2] * blocks)
+    expected = SyntheticPixelEndpoint(num_bands=4).fetch_block(
+        2024, grid.west, grid.north, grid.pixel_deg, grid.width, grid.height,
+        ['A00', 'A01', 'A02', 'A03']
+    )
+    np.testing.assert_allclose(array, expected, atol=1e-5)
+
+
+def test_download_fails_after_max_retries(tmp_path, sleeps):
+    endpoint = FlakyEndpoint(failures=3, num_bands=4)
+    streamer = PixelStreamer(endpoint, block_size=1000, max_retries=3)
+
+    with pytest.raises(ConnectionError):
+        streamer.download(QUITO, str(tmp_path / 'quito.npy'), 2024, SCALE, verbose=False)
+    assert list(endpoint.attempts.values()) == [3]
+    assert sleeps == [1, 2]
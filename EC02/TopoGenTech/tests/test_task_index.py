@@ -0,0 +1,85 @@
+"""Tests for the cached task index."""
+
+import warnings
+from unittest import mock
+
+import ee
+import pytest
+
+from topogentech.backends import EarthEngineBackend, FakeBackend
+from topogentech.utils import TaskIndex
+
+
+@pytest.fixture
+def backend():
+    # Ten simulated seconds, the default TTL, last half a real second
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=1000, speedup=20)
+    backend.initialize('test-project')
+    return backend
+
+
+def start(backend, description):
+    return backend.start_export('dataset', {'west': 0, 'east': 0.01, 'south': 0, 'north': 0.01},
+                                2024, 10, 'float32', description)
+
+
+def test_lookups_within_ttl_share_one_list_call(backend):
+    index = TaskIndex(backend=backend)
+    first = start(backend, 'first')
+
+    assert index.get_status(first.id)['description'] == 'first'
+    second = start(backend, 'second')
+    # Served from the cached list, which predates the second task
+    assert index.get_status(second.id) is None
+    assert index.get_statuses([first.id, second.id]).keys() == {first.id}
+    assert backend.calls['get_task_list'] == 1
+
+    backend.sleep(TaskIndex.DEFAULT_TTL + 1)
+    assert index.is_stale()
+    assert index.get_statuses([first.id, second.id]).keys() == {first.id, second.id}
+    assert backend.calls['get_task_list'] == 2
+
+
+def test_invalidate_and_refresh_bypass_the_cache(backend):
+    index = TaskIndex(backend=backend)
+    task = start(backend, 'task')
+    assert index.get_status(task.id)['state'] == 'RUNNING'
+
+    task.cancel()
+    assert index.get_status(task.id)['state'] == 'RUNNING'
+    assert index.get_status(task.id, refresh=True)['state'] == 'CANCELLED'
+    assert backend.calls['get_task_list'] == 2
+
+    other = start(backend, 'other')
+    index.invalidate()
+    assert index.is_stale()
+    assert index.get_task(other.id) is other
+    assert index.get_task('UNKNOWN') is None
+    assert len(index.list_statuses()) == 2
+    assert backend.calls['get_task_list'] == 3
+
+
+def test_earth_engine_task_list_uses_operations():
+    operation = {
+        'name': 'projects/test-project/operations/ABCDEF',
+        'done': True,
+        'error': {'message': 'User memory limit exceeded.'},
+        'metadata': {'state': 'FAILED', 'description': 'quito_2024', 'type': 'EXPORT_IMAGE',
+                     'createTime': '2024-01-01T00:00:00Z', 'updateTime': '2024-01-01T00:10:00Z'}
+    }
+    with mock.patch.object(ee.data, 'listOperations', return_value=[operation]):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            statuses = EarthEngineBackend().get_task_list()
+
+    assert statuses == [{
+        'id': 'ABCDEF',
+        'name': 'projects/test-project/operations/ABCDEF',
+        'state': 'FAILED',
+        'description': 'quito_2024',
+        'task_type': 'EXPORT_IMAGE',
+        'creation_timestamp_ms': 1704067200000,
+        'update_timestamp_ms': 1704067800000,
+        'error_message': 'User memory limit exceeded.'
+    }]
@@ -0,0 +1,166 @@
+"""Tests for tile grids and tiled exports against the in-process FakeBackend."""
+
+from unittest import mock
+
+import pytest
+
+from topogentech.backends import FakeBackend
+from topogentech.downloader import SatelliteEmbeddingsDownloader
+from topogentech.estimator import geodesic_area_km2, geodesic_extent_km
+from topogentech.streaming import METERS_PER_DEGREE
+from topogentech.tiling import ExportTileSet, snap_tiles, split_bounds
+
+ECUADOR = {'west': -81.5, 'east': -75.0, 'south': -5.0, 'north': 2.0, 'name': 'Ecuador'}
+
+
+def test_split_bounds_covers_the_box_without_gaps_or_overlaps():
+    tiles = split_bounds(ECUADOR, 50)
+    n_rows = max(tile['row'] for tile in tiles) + 1
+    n_cols = max(tile['col'] for tile in tiles) + 1
+    assert len(tiles) == n_rows * n_cols
+    grid = {(tile['row'], tile['col']): tile for tile in tiles}
+
+    for (row, col), tile in grid.items():
+        # Neighbours share their edges exactly, and the outer edges are the region's
+        if col + 1 < n_cols:
+            assert tile['east'] == grid[row, col + 1]['west']
+        else:
+            assert tile['east'] == ECUADOR['east']
+        if row + 1 < n_rows:
+            assert tile['south'] == grid[row + 1, col]['north']
+        else:
+            assert tile['south'] == ECUADOR['south']
+        if col == 0:
+            assert tile['west'] == ECUADOR['west']
+        if row == 0:
+            assert tile['north'] == ECUADOR['north']
+        assert tile['tile_id'] == f"r{row:03d}_c{col:03d}"
+
+    areas = [geodesic_area_km2(t['west'], t['east'], t['south'], t['north']) for t in tiles]
+    total = geodesic_area_km2(ECUADOR['west'], ECUADOR['east'], ECUADOR['south'], ECUADOR['north'])
+    assert sum(areas) == pytest.approx(float(total), rel=1e-9)
+
+    extent = geodesic_extent_km(*(tiles[0][key] for key in ('west', 'east', 'south', 'north')))
+    assert extent['width_km'] <= 50 and extent['height_km'] <= 50
+
+
+def test_split_bounds_rejects_non_positive_sizes():
+    with pytest.raises(ValueError):
+        split_bounds(ECUADOR, 0)
+
+
+def test_rerun_failed_resubmits_only_failed_tiles():
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0,
+                          startup_seconds=10, pixels_per_second=1e6, failure_rate=0.3,
+                          speedup=10000, seed=3)
+    downloader = SatelliteEmbeddingsDownloader('test-project', scale=100, backend=backend)
+    assert downloader.initialize()
+    bounds = {'west': -78.6, 'east': -78.4, 'south': -0.3, 'north': -0.1, 'name': 'Quito'}
+
+    # The first tile cannot be started at all on the first attempt
+    attempts = []
+    refused = []
+
+    def submit(tile):
+        attempts.append(tile['tile_id'])
+        if not refused:
+            refused.append(tile['tile_id'])
+            return None
+        return downloader.download_to_drive(tile, description=f"quito_{tile['tile_id']}")
+
+    tile_set = ExportTileSet(bounds, split_bounds(bounds, 5), submit,
+                             task_index=backend.task_index)
+    assert set(tile_set.get_states().values()) == {'UNSUBMITTED'}
+    assert tile_set.submit_all() == len(tile_set) - 1
+    backend.sleep(3600)
+    backend.task_index.invalidate()
+
+    states = tile_set.get_states()
+    failed = {tile['tile_id'] for tile in tile_set.failed_tiles()}
+    assert tile_set.is_done()
+    assert failed == {tile_id for tile_id, state in states.items() if state == 'FAILED'}
+    assert tile_set.tiles[0]['tile_id'] in failed
+    assert 1 < len(failed) < len(tile_set)
+    assert set(states.values()) == {'COMPLETED', 'FAILED'}
+
+    before = tile_set.task_ids()
+    attempts.clear()
+    assert tile_set.rerun_failed() == len(failed)
+    after = tile_set.task_ids()
+
+    assert sorted(attempts) == sorted(failed)
+    assert backend.calls['start_export'] == len(tile_set) - 1 + len(failed)
+    for tile_id in before:
+        if tile_id in failed:
+            assert after[tile_id] is not None and after[tile_id] != before[tile_id]
+        else:
+            assert after[tile_id] == before[tile_id]
+
+
+def on_lattice(value, origin, pixel_deg):
+    steps = abs(value - origin) / pixel_deg
+    return abs(steps - round(steps)) < 1e-6
+
+
+def test_snap_tiles_moves_edges_onto_the_lattice():
+    pixel_deg = 30 / METERS_PER_DEGREE
+    tiles = split_bounds(ECUADOR, 50)
+    snapped = snap_tiles(tiles, pixel_deg)
+    grid = {(tile['row'], tile['col']): tile for tile in snapped}
+
+    for tile, original in zip(snapped, tiles):
+        assert tile['tile_id'] == original['tile_id']
+        for key in ('west', 'east'):
+            assert on_lattice(tile[key], -180, pixel_deg)
+            assert abs(tile[key] - original[key]) <= pixel_deg / 2 + 1e-12
+        for key in ('south', 'north'):
+            assert on_lattice(tile[key], 90, pixel_deg)
+            assert abs(tile[key] - original[key]) <= pixel_deg / 2 + 1e-12
+        # Neighbours still share their edges exactly
+        right = grid.get((tile['row'], tile['col'] + 1))
+        if right is not None:
+            assert tile['east'] == right['west']
+        below = grid.get((tile['row'] + 1, tile['col']))
+        if below is not None:
+            assert tile['south'] == below['north']
+
+    # A tile smaller than a pixel keeps one pixel
+    tiny = snap_tiles([{'west': 0.1, 'east': 0.1 + pixel_deg / 10,
+                        'south': 0.1, 'north': 0.1 + pixel_deg / 10}], pixel_deg)[0]
+    assert tiny['east'] - tiny['west'] == pytest.approx(pixel_deg)
+    assert tiny['north'] - tiny['south'] == pytest.approx(pixel_deg)
+
+
+def test_tiles_of_every_year_share_pixel_aligned_bounds():
+    backend = FakeBackend(submit_latency=0, list_latency=0, status_latency=0)
+    downloader = SatelliteEmbeddingsDownloader('test-project', scale=30, backend=backend)
+    assert downloader.initialize()
+    bounds = {'west': -78.61, 'east': -78.37, 'south': -0.33, 'north': -0.09, 'name': 'Quito'}
+    pixel_deg = 30 / METERS_PER_DEGREE
+
+    with mock.patch.object(backend, 'start_export', wraps=backend.start_export) as start:
+        tile_sets = downloader.download_years_to_drive(bounds, [2024, 2018, 2021],
+                                                       tile_size_km=10)
+
+    assert sorted(tile_sets) == [2018, 2021, 2024]
+    reference = [{key: tile[key] for key in ('tile_id', 'west', 'east', 'south', 'north')}
+                 for tile in tile_sets[2018].tiles]
+    assert len(reference) == 9
+    for tile_set in tile_sets.values():
+        assert [{key: tile[key] for key in reference[0]} for tile in tile_set.tiles] == reference
+
+    # Every export was started on the lattice with those exact bounds
+    exported = {}
+    for call in start.call_args_list:
+        _, region, year, scale, _, description = call.args
+        assert call.kwargs['aligned'] and scale == 30
+        for key in ('west', 'east'):
+            assert on_lattice(region[key], -180, pixel_deg)
+        for key in ('south', 'north'):
+            assert on_lattice(region[key], 90, pixel_deg)
+        assert description.startswith(f"satellite_embeddings_{year}_")
+        exported.setdefault(year, []).append(
+            tuple(region[key] for key in ('west', 'east', 'south', 'north'))
+        )
+    assert len(start.call_args_list) == 3 * len(reference)
+    assert exported[2018] == exported[2021] == exported[2024]
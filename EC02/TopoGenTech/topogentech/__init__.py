@@ -2,17 +2,105 @@
 TopogenTech - Satellite Embeddings Downloader Library
 
 A modular library for downloading satellite embeddings from Google Earth Engine.
+
+Public names are imported on first access, so offline helpers such as
+RegionConfig or EmbeddingStore do not load the Earth Engine client; ``ee`` is
+imported only when a downloader or Earth Engine utility is first used.
 """
 
-from .downloader import SatelliteEmbeddingsDownloader
-from .regions import RegionConfig
-from .utils import EarthEngineUtils
+import importlib
+from typing import Any, List, TYPE_CHECKING
 
 __version__ = "0.1.0"
 __author__ = "TopogenTech Team"
 
-__all__ = [
-    "SatelliteEmbeddingsDownloader",
-    "RegionConfig", 
-    "EarthEngineUtils"
-]
\ No newline at end of file
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    "SatelliteEmbeddingsDownloader": "downloader",
+    "RegionConfig": "regions",
+    "PolygonRegion": "geometry",
+    "prune_tiles": "geometry",
+    "RegionIndex": "spatial_index",
+    "EarthEngineUtils": "utils",
+    "Backend": "backends",
+    "EarthEngineBackend": "backends",
+    "FakeBackend": "backends",
+    "get_backend": "backends",
+    "set_backend": "backends",
+    "ExportTileSet": "tiling",
+    "split_bounds": "tiling",
+    "snap_tiles": "tiling",
+    "ExportJob": "scheduler",
+    "ExportScheduler": "scheduler",
+    "ExportManifest": "manifest",
+    "ExportMetrics": "metrics",
+    "EventLog": "metrics",
+    "DurationPredictor": "predictor",
+    "plan_for_budget": "budget",
+    "AsyncTaskMonitor": "async_monitor",
+    "monitor_tasks": "async_monitor",
+    "DatasetInfoCache": "cache",
+    "QueryPlan": "query",
+    "QueryPlanner": "query",
+    "get_query_planner": "query",
+    "estimate_export": "estimator",
+    "geodesic_area_km2": "estimator",
+    "PixelStreamer": "streaming",
+    "SyntheticPixelEndpoint": "streaming",
+    "open_download": "streaming",
+    "EmbeddingStore": "store",
+    "ExactIndex": "similarity",
+    "IVFIndex": "similarity",
+    "PixelSimilarityIndex": "similarity",
+    "build_index": "similarity",
+    "detect_change": "change",
+    "cosine_distance": "change",
+    "ChangeStatistics": "change",
+    "MiniBatchKMeans": "clustering",
+    "fit_store": "clustering",
+    "write_labels": "clustering",
+    "quantize": "quantization",
+    "dequantize": "quantization",
+    "dequantize_export": "quantization",
+    "reconstruction_error": "quantization"
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from .downloader import SatelliteEmbeddingsDownloader
+    from .regions import RegionConfig
+    from .geometry import PolygonRegion, prune_tiles
+    from .spatial_index import RegionIndex
+    from .utils import EarthEngineUtils
+    from .backends import Backend, EarthEngineBackend, FakeBackend, get_backend, set_backend
+    from .tiling import ExportTileSet, snap_tiles, split_bounds
+    from .scheduler import ExportJob, ExportScheduler
+    from .manifest import ExportManifest
+    from .metrics import EventLog, ExportMetrics
+    from .predictor import DurationPredictor
+    from .budget import plan_for_budget
+    from .async_monitor import AsyncTaskMonitor, monitor_tasks
+    from .cache import DatasetInfoCache
+    from .query import QueryPlan, QueryPlanner, get_query_planner
+    from .estimator import estimate_export, geodesic_area_km2
+    from .streaming import PixelStreamer, SyntheticPixelEndpoint, open_download
+    from .store import EmbeddingStore
+    from .similarity import ExactIndex, IVFIndex, PixelSimilarityIndex, build_index
+    from .clustering import MiniBatchKMeans, fit_store, write_labels
+    from .change import ChangeStatistics, cosine_distance, detect_change
+    from .quantization import dequantize, dequantize_export, quantize, reconstruction_error
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,319 @@
+"""
+Asyncio-based monitor that supervises many Earth Engine tasks at once.
+"""
+
+import asyncio
+import inspect
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Any, Union
+
+from .metrics import ExportMetrics
+from .utils import TaskIndex, get_task_index
+
+
+FINAL_STATES = ('COMPLETED', 'FAILED', 'CANCELLED')
+
+TaskLike = Union[str, Any]  # task id or Earth Engine task object
+Callback = Callable[[str, Dict[str, Any]], Any]
+
+
+class _WatchedTask:
+    """Bookkeeping for one task followed by AsyncTaskMonitor."""
+
+    def __init__(self, task: TaskLike, future: asyncio.Future, started_at: float):
+        self.task = None if isinstance(task, str) else task
+        self.task_id = task if isinstance(task, str) else task.id
+        self.future = future
+        self.started_at = started_at
+        self.next_check = started_at
+        self.state: Optional[str] = None
+        self.callbacks: List[Callback] = []
+
+
+class AsyncTaskMonitor:
+    """
+    Watch hundreds of Earth Engine tasks concurrently from one event loop.
+
+    A single poller fetches the status of every due task with one task list
+    call, so the number of round-trips does not grow with the number of tasks.
+    Each task is polled adaptively: new tasks are checked every
+    ``min_interval`` seconds and the interval grows with the task's age up to
+    ``max_interval``, so long runners are not polled needlessly.
+    """
+
+    DEFAULT_MIN_INTERVAL = 5  # seconds
+    DEFAULT_MAX_INTERVAL = 300  # seconds
+    DEFAULT_BACKOFF_FACTOR = 0.1  # fraction of task age used as poll interval
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 task_index: Optional[TaskIndex] = None,
+                 metrics: Optional[ExportMetrics] = None,
+                 verbose: bool = False):
+        """
+        Initialize the monitor.
+
+        Args:
+            min_interval: Poll interval in seconds for newly watched tasks
+            max_interval: Upper bound for the poll interval in seconds
+            backoff_factor: Poll interval as a fraction of the time a task has been watched
+            task_index: Task index used for status lookups (shared index if None)
+            metrics: Collector fed with every polled status (none if None)
+            verbose: Whether to print state changes
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.task_index = task_index or get_task_index()
+        self.metrics = metrics
+        self.verbose = verbose
+
+        self._watched: Dict[str, _WatchedTask] = {}
+        self._finished: Dict[str, Dict[str, Any]] = {}
+        self._callbacks: List[Callback] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.poll_count = 0
+
+    def add_callback(self, callback: Callback) -> None:
+        """
+        Register a callback fired for every task that reaches a final state.
+
+        Args:
+            callback: Function or coroutine function called with (task_id, status)
+        """
+        self._callbacks.append(callback)
+
+    def watch(self, task: TaskLike, callback: Optional[Callback] = None) -> asyncio.Future:
+        """
+        Start watching a task. Must be called from a running event loop.
+
+        Args:
+            task: Earth Engine task object or task id
+            callback: Optional function or coroutine function called with
+                (task_id, status) when this task finishes
+
+        Returns:
+            Future resolving to the final status dictionary of the task
+        """
+        loop = asyncio.get_running_loop()
+        task_id = task if isinstance(task, str) else task.id
+
+        if task_id in self._finished:
+            future = loop.create_future()
+            future.set_result(self._finished[task_id])
+            if callback is not None:
+                asyncio.ensure_future(self._fire(callback, task_id, self._finished[task_id]))
+            return future
+
+        watched = self._watched.get(task_id)
+        if watched is None:
+            watched = _WatchedTask(task, loop.create_future(), loop.time())
+            self._watched[task_id] = watched
+        if callback is not None:
+            watched.callbacks.append(callback)
+
+        self._ensure_poller()
+        return watched.future
+
+    def watch_all(self, tasks: Iterable[TaskLike]) -> List[asyncio.Future]:
+        """
+        Start watching several tasks.
+
+        Args:
+            tasks: Earth Engine task objects or task ids
+
+        Returns:
+            List of futures, one per task
+        """
+        return [self.watch(task) for task in tasks]
+
+    def _futures(self, tasks: Optional[Iterable[TaskLike]]) -> List[asyncio.Future]:
+        if tasks is None:
+            return [watched.future for watched in self._watched.values()]
+        return self.watch_all(tasks)
+
+    async def wait_all(self, tasks: Optional[Iterable[TaskLike]] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until every task has finished.
+
+        Args:
+            tasks: Tasks to wait for (every watched task if None)
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Dictionary mapping task id to final status for the tasks that finished
+        """
+        futures = self._futures(tasks)
+        if futures:
+            await asyncio.wait(futures, timeout=timeout)
+        return self._results(futures)
+
+    async def wait_any(self, tasks: Optional[Iterable[TaskLike]] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until at least one task has finished.
+
+        Args:
+            tasks: Tasks to wait for (every watched task if None)
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Dictionary mapping task id to final status for the tasks that finished
+        """
+        futures = self._futures(tasks)
+        if futures:
+            await asyncio.wait(futures, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        return self._results(futures)
+
+    async def as_completed(self, tasks: Optional[Iterable[TaskLike]] = None,
+                           timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield final task statuses in the order the tasks finish.
+
+        Args:
+            tasks: Tasks to follow (every watched task if None)
+            timeout: Maximum seconds to wait for all of them
+
+        Yields:
+            Final status dictionaries; the task id is under the 'id' key
+        """
+        for next_done in asyncio.as_completed(self._futures(tasks), timeout=timeout):
+            yield await next_done
+
+    @staticmethod
+    def _results(futures: List[asyncio.Future]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for future in futures:
+            if future.done() and not future.cancelled():
+                status = future.result()
+                results[status['id']] = status
+        return results
+
+    def close(self) -> None:
+        """
+        Stop polling. Watched tasks keep running on Earth Engine.
+        """
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        for watched in self._watched.values():
+            if not watched.future.done():
+                watched.future.cancel()
+        self._watched.clear()
+
+    def _ensure_poller(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while self._watched:
+            now = loop.time()
+            next_due = min(watched.next_check for watched in self._watched.values())
+            if next_due > now:
+                # Sleep until the next task is due, but wake up early if a
+                # new task is added in the meantime.
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = [watched for watched in self._watched.values() if watched.next_check <= now]
+            statuses = await loop.run_in_executor(None, self._fetch_statuses, due)
+            self.poll_count += 1
+
+            for watched in due:
+                await self._update(watched, statuses.get(watched.task_id), loop.time())
+
+    def _fetch_statuses(self, due: List[_WatchedTask]) -> Dict[str, Dict[str, Any]]:
+        try:
+            statuses = self.task_index.get_statuses(
+                [watched.task_id for watched in due], refresh=True
+            )
+        except Exception as e:
+            print(f"Error listing tasks: {e}")
+            statuses = {}
+
+        # Tasks started moments ago may not be listed yet
+        for watched in due:
+            if watched.task_id not in statuses and watched.task is not None:
+                try:
+                    status = dict(watched.task.status())
+                    status.setdefault('id', watched.task_id)
+                    statuses[watched.task_id] = status
+                except Exception as e:
+                    print(f"Error getting status for task {watched.task_id}: {e}")
+        return statuses
+
+    async def _update(self, watched: _WatchedTask, status: Optional[Dict[str, Any]],
+                      now: float) -> None:
+        if status is not None:
+            if self.metrics is not None:
+                self.metrics.observe(watched.task_id, status)
+            state = status['state']
+            if self.verbose and state != watched.state:
+                print(f"Task {watched.task_id}: {state}")
+            watched.state = state
+
+            if state in FINAL_STATES:
+                del self._watched[watched.task_id]
+                self._finished[watched.task_id] = status
+                if not watched.future.done():
+                    watched.future.set_result(status)
+                for callback in self._callbacks + watched.callbacks:
+                    await self._fire(callback, watched.task_id, status)
+                return
+
+        age = now - watched.started_at
+        interval = min(self.max_interval, max(self.min_interval, age * self.backoff_factor))
+        watched.next_check = now + interval
+
+    @staticmethod
+    async def _fire(callback: Callback, task_id: str, status: Dict[str, Any]) -> None:
+        try:
+            result = callback(task_id, status)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"Error in completion callback for task {task_id}: {e}")
+
+
+def monitor_tasks(tasks: Iterable[TaskLike], callback: Optional[Callback] = None,
+                  timeout: Optional[float] = None, verbose: bool = True,
+                  **monitor_kwargs: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Block until a group of tasks has finished, polling them concurrently.
+
+    Args:
+        tasks: Earth Engine task objects or task ids
+        callback: Optional function called with (task_id, status) per finished task
+        timeout: Maximum seconds to wait (None waits forever)
+        verbose: Whether to print state changes
+        **monitor_kwargs: Extra arguments passed to AsyncTaskMonitor
+
+    Returns:
+        Dictionary mapping task id to final status for the tasks that finished
+    """
+    async def run() -> Dict[str, Dict[str, Any]]:
+        monitor = AsyncTaskMonitor(verbose=verbose, **monitor_kwargs)
+        if callback is not None:
+            monitor.add_callback(callback)
+        try:
+            return await monitor.wait_all(tasks, timeout=timeout)
+        finally:
+            monitor.close()
+
+    try:
+        return asyncio.run(run())
+    except KeyboardInterrupt:
+        if verbose:
+            print("Monitoring stopped (tasks continue running)")
+        return {}
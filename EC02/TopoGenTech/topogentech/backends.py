@@ -0,0 +1,739 @@
+"""
+Backends that carry out the Earth Engine calls of the downloader and utilities.
+
+SatelliteEmbeddingsDownloader, EarthEngineUtils, TaskIndex, TaskMonitor and
+ExportScheduler start exports, list tasks and wait through a backend instead
+of calling ``ee`` directly. EarthEngineBackend talks to the real service.
+FakeBackend simulates it in process: a project task queue with a limit on
+running tasks, request latencies, task durations proportional to the
+exported pixels, random failures and synthetic embedding pixels. It needs no
+credentials, so tiling, submission and polling can be benchmarked offline.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+from .estimator import estimate_export
+from .quantization import export_scale
+from .streaming import METERS_PER_DEGREE
+
+
+ACTIVE_STATES = ('READY', 'RUNNING')
+
+
+class Backend:
+    """
+    Interface implemented by EarthEngineBackend and FakeBackend.
+
+    Task objects returned by a backend provide ``id``, ``config``,
+    ``status()``, ``active()``, ``start()`` and ``cancel()``, like
+    ``ee.batch.Task``.
+    """
+
+    def __init__(self):
+        self._task_index = None
+
+    @property
+    def task_index(self) -> Any:
+        """TaskIndex answering status lookups for this backend's tasks."""
+        if self._task_index is None:
+            from .utils import TaskIndex
+            self._task_index = TaskIndex(backend=self)
+        return self._task_index
+
+    def initialize(self, project_id: str, authenticate: bool = False) -> None:
+        """
+        Connect to the service; raises on failure.
+
+        Args:
+            project_id: Google Cloud Project ID
+            authenticate: Whether to run authentication first
+        """
+        raise NotImplementedError
+
+    def check_initialization(self) -> bool:
+        """
+        Check whether the backend is ready for requests.
+
+        Returns:
+            True if initialized, False otherwise
+        """
+        raise NotImplementedError
+
+    def image_info(self, dataset_id: str, region_bounds: Dict[str, float],
+                   year: int) -> Dict[str, Any]:
+        """
+        Describe the embeddings image of a region.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+
+        Returns:
+            Image description with a 'bands' list of {'id': name} entries
+        """
+        raise NotImplementedError
+
+    def prepare_exports(self, dataset_id: str, bounds_list: List[Dict[str, float]],
+                        year: int) -> None:
+        """
+        Warm up whatever start_export() needs for many regions at once.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+        """
+
+    def start_export(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+                     scale: float, precision: str, description: str,
+                     destination: str = 'drive', folder: Optional[str] = None,
+                     asset_id: Optional[str] = None, aligned: bool = False) -> Any:
+        """
+        Create and start an image export task.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            scale: Resolution in meters per pixel
+            precision: 'float32', 'float16' or 'int8'
+            description: Task description
+            destination: 'drive' or 'asset'
+            folder: Google Drive folder name (drive exports)
+            asset_id: Full asset ID path (asset exports)
+            aligned: Export on the global EPSG:4326 pixel lattice
+
+        Returns:
+            Started task object
+        """
+        raise NotImplementedError
+
+    def reduce_regions(self, dataset_id: str, bounds_list: List[Dict[str, float]],
+                       year: int, scale: float, include_mean: bool = True,
+                       percentiles: Optional[Sequence[int]] = None,
+                       tile_scale: int = 1) -> List[Dict[str, Any]]:
+        """
+        Reduce the embeddings inside many regions in one request.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            scale: Resolution in meters per pixel for the reduction
+            include_mean: Whether to compute the per-band mean
+            percentiles: Percentiles to compute per band, e.g. [10, 50, 90]
+            tile_scale: Earth Engine tileScale
+
+        Returns:
+            One dictionary of statistics per region, aligned with
+            ``bounds_list`` (band name alone when only the mean is computed,
+            otherwise '<band>_mean' and '<band>_p<N>')
+        """
+        raise NotImplementedError
+
+    def sample(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+               scale: float, num_pixels: int, limit: int, seed: int = 0) -> List[Dict[str, Any]]:
+        """
+        Draw random embedding pixels from a region in one request.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            scale: Resolution in meters per pixel
+            num_pixels: Approximate number of pixels to draw
+            limit: Maximum number of points returned
+            seed: Random seed
+
+        Returns:
+            GeoJSON point features with one property per band; masked
+            pixels are dropped, so fewer than ``limit`` may come back
+        """
+        raise NotImplementedError
+
+    def get_task_list(self) -> List[Dict[str, Any]]:
+        """
+        List the status of every task of the project in one request.
+
+        Returns:
+            List of task status dictionaries
+        """
+        raise NotImplementedError
+
+    def get_task(self, task_id: str, status: Dict[str, Any]) -> Any:
+        """
+        Build a task object from a status returned by get_task_list().
+
+        Args:
+            task_id: Task ID string
+            status: Task status dictionary
+
+        Returns:
+            Task object
+        """
+        raise NotImplementedError
+
+    def pixel_endpoint(self, dataset_id: str) -> Any:
+        """
+        Get the pixel endpoint used for direct downloads.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+
+        Returns:
+            Object with band_names() and fetch_block() (see streaming module)
+        """
+        raise NotImplementedError
+
+    def time(self) -> float:
+        """Current time in seconds, on the backend's clock."""
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        """Wait on the backend's clock."""
+        time.sleep(seconds)
+
+
+class EarthEngineBackend(Backend):
+    """
+    Backend that calls the Earth Engine API.
+
+    ``ee`` is imported on first use.
+    """
+
+    def initialize(self, project_id: str, authenticate: bool = False) -> None:
+        import ee
+        if authenticate:
+            ee.Authenticate()
+        ee.Initialize(project=project_id)
+
+    def check_initialization(self) -> bool:
+        import ee
+        try:
+            # Try a simple operation to test initialization
+            ee.Number(1).getInfo()
+            return True
+        except Exception:
+            return False
+
+    def image_info(self, dataset_id: str, region_bounds: Dict[str, float],
+                   year: int) -> Dict[str, Any]:
+        from .query import get_query_planner
+        return get_query_planner().plan(region_bounds, year, dataset_id).mosaic.getInfo()
+
+    def prepare_exports(self, dataset_id: str, bounds_list: List[Dict[str, float]],
+                        year: int) -> None:
+        from .query import get_query_planner
+        get_query_planner().plans(bounds_list, year, dataset_id)
+
+    @staticmethod
+    def _apply_precision(image: Any, precision: str) -> Any:
+        """Convert an embeddings image to the export precision."""
+        multiplier = export_scale(precision)
+        if multiplier is None:
+            return image
+        scaled = image.multiply(multiplier).round()
+        return scaled.toInt8() if precision == 'int8' else scaled.toInt16()
+
+    @staticmethod
+    def _export_grid(geometry: Any, scale: float, aligned: bool) -> Dict[str, Any]:
+        """Region and pixel grid arguments shared by the export calls."""
+        if not aligned:
+            return {'region': geometry, 'scale': scale}
+        # Global lattice anchored at (-180, 90), the same one PixelGrid uses
+        pixel_deg = scale / METERS_PER_DEGREE
+        return {
+            'region': geometry,
+            'crs': 'EPSG:4326',
+            'crsTransform': [pixel_deg, 0, -180, 0, -pixel_deg, 90]
+        }
+
+    def start_export(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+                     scale: float, precision: str, description: str,
+                     destination: str = 'drive', folder: Optional[str] = None,
+                     asset_id: Optional[str] = None, aligned: bool = False) -> Any:
+        import ee
+        from .query import get_query_planner
+
+        plan = get_query_planner().plan(region_bounds, year, dataset_id)
+        image = self._apply_precision(plan.image, precision)
+        grid = self._export_grid(plan.geometry, scale, aligned)
+        if destination == 'drive':
+            task = ee.batch.Export.image.toDrive(
+                image=image,
+                description=description,
+                folder=folder,
+                fileNamePrefix=description,
+                maxPixels=1e13,
+                fileFormat='GeoTIFF',
+                **grid
+            )
+        else:
+            task = ee.batch.Export.image.toAsset(
+                image=image,
+                description=description,
+                assetId=asset_id,
+                maxPixels=1e13,
+                **grid
+            )
+        task.start()
+        return task
+
+    def reduce_regions(self, dataset_id: str, bounds_list: List[Dict[str, float]],
+                       year: int, scale: float, include_mean: bool = True,
+                       percentiles: Optional[Sequence[int]] = None,
+                       tile_scale: int = 1) -> List[Dict[str, Any]]:
+        import ee
+        from .query import get_query_planner
+
+        reducers = []
+        if include_mean:
+            reducers.append(ee.Reducer.mean())
+        if percentiles:
+            reducers.append(ee.Reducer.percentile(list(percentiles)))
+        reducer = reducers[0]
+        for other in reducers[1:]:
+            reducer = reducer.combine(other, sharedInputs=True)
+
+        planner = get_query_planner()
+        image = planner.annual_image(dataset_id, year)
+        if not include_mean and len(percentiles) == 1:
+            # Outputs of a single-output reducer are named after the bands
+            # alone; rename the bands so the columns are '<band>_p<N>' as usual
+            suffix = f"_p{percentiles[0]}"
+            image = image.rename(image.bandNames().map(lambda band: ee.String(band).cat(suffix)))
+        plans = planner.plans(bounds_list, year, dataset_id)
+        features = ee.FeatureCollection([
+            ee.Feature(plan.geometry, {'position': position})
+            for position, plan in enumerate(plans)
+        ])
+        reduced = image.reduceRegions(
+            collection=features,
+            reducer=reducer,
+            scale=scale,
+            tileScale=tile_scale
+        ).getInfo()
+        rows = [None] * len(bounds_list)
+        for feature in reduced['features']:
+            properties = dict(feature['properties'])
+            rows[int(properties.pop('position'))] = properties
+        return rows
+
+    def sample(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+               scale: float, num_pixels: int, limit: int, seed: int = 0) -> List[Dict[str, Any]]:
+        from .query import get_query_planner
+
+        planner = get_query_planner()
+        points = planner.annual_image(dataset_id, year).sample(
+            region=planner.plan(region_bounds, year, dataset_id).geometry,
+            scale=scale,
+            numPixels=num_pixels,
+            seed=seed,
+            geometries=True,
+            dropNulls=True
+        ).limit(limit).getInfo()
+        return points['features']
+
+    def get_task_list(self) -> List[Dict[str, Any]]:
+        import ee
+        from ee import _cloud_api_utils
+
+        # getTaskList() is deprecated and warns on every call; it does the
+        # same conversion of the project's operations to task statuses
+        return [_cloud_api_utils.convert_operation_to_task(operation)
+                for operation in ee.data.listOperations()]
+
+    def get_task(self, task_id: str, status: Dict[str, Any]) -> Any:
+        import ee
+        return ee.batch.Task(
+            task_id,
+            status.get('task_type'),
+            status['state'],
+            {'description': status.get('description')},
+            status.get('name')
+        )
+
+    def pixel_endpoint(self, dataset_id: str) -> Any:
+        from .streaming import EarthEnginePixelEndpoint
+        return EarthEnginePixelEndpoint(dataset_id)
+
+
+class FakeTask:
+    """
+    Task handle returned by FakeBackend, with the ee.batch.Task methods used here.
+    """
+
+    def __init__(self, backend: 'FakeBackend', task_id: str, description: str):
+        self.id = task_id
+        self.task_type = 'EXPORT_IMAGE'
+        self.config = {'description': description}
+        self._backend = backend
+
+    def start(self) -> None:
+        """Tasks are queued when created; kept for ee.batch.Task compatibility."""
+
+    def status(self) -> Dict[str, Any]:
+        return self._backend.task_status(self.id)
+
+    def active(self) -> bool:
+        return self.status()['state'] in ACTIVE_STATES
+
+    def cancel(self) -> None:
+        self._backend.cancel_task(self.id)
+
+    def __repr__(self) -> str:
+        return f"FakeTask({self.id!r}, {self.config['description']!r})"
+
+
+class FakeBackend(Backend):
+    """
+    In-process simulation of Earth Engine for tests and benchmarks.
+
+    Tasks wait in READY until one of ``max_running`` slots is free, then run
+    for ``startup_seconds`` plus their pixel count divided by
+    ``pixels_per_second`` (with log-normal noise), and end COMPLETED or, with
+    probability ``failure_rate``, FAILED part way through. Every request
+    sleeps for its latency and is counted in ``calls``. Zonal statistics and
+    point samples are computed from the synthetic pixels over each region's
+    bounding box.
+
+    The clock runs ``speedup`` times faster than real time: latencies,
+    durations and sleep() are all divided by it, so a campaign of hours
+    finishes in seconds while threads still overlap as they would. CPU time
+    spent by the caller is sped up too, so keep ``speedup`` small when
+    measuring request-bound rates.
+    """
+
+    FAILURE_MESSAGES = (
+        'Computation timed out.',
+        'User memory limit exceeded.',
+        'Internal error.'
+    )
+    REDUCE_GRID = 256  # pixels per side that reduce_regions() averages over
+
+    def __init__(self, max_running: int = 20,
+                 submit_latency: float = 0.3,
+                 list_latency: float = 0.5,
+                 status_latency: float = 0.2,
+                 startup_seconds: float = 30.0,
+                 pixels_per_second: float = 2e5,
+                 duration_noise: float = 0.3,
+                 failure_rate: float = 0.0,
+                 speedup: float = 1.0,
+                 num_bands: int = 64,
+                 pixel_latency: float = 0.0,
+                 seed: int = 0):
+        """
+        Initialize the simulation.
+
+        Args:
+            max_running: Tasks of the project that run at the same time
+            submit_latency: Seconds per start_export() request
+            list_latency: Seconds per get_task_list() request
+            status_latency: Seconds per single task status request
+            startup_seconds: Fixed part of every task's run time
+            pixels_per_second: Export throughput of one running task
+            duration_noise: Sigma of the log-normal noise on run times
+            failure_rate: Probability that a task fails
+            speedup: How much faster than real time the clock runs
+            num_bands: Bands of the synthetic embeddings
+            pixel_latency: Seconds per pixel block request
+            seed: Random seed for durations and failures
+        """
+        super().__init__()
+        if max_running < 1:
+            raise ValueError("max_running must be at least 1")
+        if speedup <= 0:
+            raise ValueError("speedup must be positive")
+        self.max_running = max_running
+        self.submit_latency = submit_latency
+        self.list_latency = list_latency
+        self.status_latency = status_latency
+        self.startup_seconds = startup_seconds
+        self.pixels_per_second = pixels_per_second
+        self.duration_noise = duration_noise
+        self.failure_rate = failure_rate
+        self.speedup = speedup
+        self.num_bands = num_bands
+        self.pixel_latency = pixel_latency
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+
+        self.calls: Dict[str, int] = {
+            'initialize': 0, 'image_info': 0, 'start_export': 0,
+            'get_task_list': 0, 'task_status': 0, 'cancel_task': 0,
+            'reduce_regions': 0, 'sample': 0
+        }
+        self._initialized = False
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._handles: Dict[str, FakeTask] = {}
+        self._ready: deque = deque()
+        self._running: List[Any] = []  # heap of (end time, task id)
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._epoch = time.time()
+        self._started = time.monotonic()
+
+    # Clock
+
+    def time(self) -> float:
+        return self._epoch + (time.monotonic() - self._started) * self.speedup
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds / self.speedup)
+
+    def _request(self, name: str, latency: float) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        self.sleep(latency)
+
+    # Simulation
+
+    def _advance(self, now: float) -> None:
+        """Finish tasks whose end time has passed and start queued ones. Caller holds the lock."""
+        while self._running and self._running[0][0] <= now:
+            end_time, task_id = heapq.heappop(self._running)
+            record = self._tasks[task_id]
+            if record['state'] == 'RUNNING':
+                record['state'] = 'FAILED' if record['fails'] else 'COMPLETED'
+                record['update_timestamp_ms'] = int(end_time * 1000)
+                if record['fails']:
+                    record['error_message'] = record['fails']
+            self._start_ready(end_time)
+        self._start_ready(now)
+
+    def _start_ready(self, now: float) -> None:
+        while self._ready and len(self._running) < self.max_running:
+            record = self._tasks[self._ready.popleft()]
+            if record['state'] != 'READY':
+                continue
+            duration = record['duration']
+            if record['fails']:
+                duration *= self.rng.uniform(0.05, 1.0)
+            record['state'] = 'RUNNING'
+            record['start_timestamp_ms'] = int(now * 1000)
+            record['update_timestamp_ms'] = int(now * 1000)
+            heapq.heappush(self._running, (now + duration, record['id']))
+
+    def _status(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        status = {key: value for key, value in record.items()
+                  if key not in ('duration', 'fails', 'pixels')}
+        if record['state'] == 'RUNNING':
+            elapsed = self.time() - record['start_timestamp_ms'] / 1000
+            status['progress'] = round(min(elapsed / record['duration'], 0.99) * 100, 1)
+        return status
+
+    # Backend interface
+
+    def initialize(self, project_id: str, authenticate: bool = False) -> None:
+        self._request('initialize', self.status_latency)
+        self.project_id = project_id
+        self._initialized = True
+
+    def check_initialization(self) -> bool:
+        return self._initialized
+
+    def image_info(self, dataset_id: str, region_bounds: Dict[str, float],
+                   year: int) -> Dict[str, Any]:
+        self._request('image_info', self.status_latency)
+        return {
+            'type': 'Image',
+            'bands': [{'id': f"A{i:02d}"} for i in range(self.num_bands)],
+            'properties': {'dataset_id': dataset_id, 'year': year}
+        }
+
+    def start_export(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+                     scale: float, precision: str, description: str,
+                     destination: str = 'drive', folder: Optional[str] = None,
+                     asset_id: Optional[str] = None, aligned: bool = False) -> FakeTask:
+        if destination not in ('drive', 'asset'):
+            raise ValueError(f"Unknown destination: {destination}")
+        pixels = float(estimate_export([region_bounds], scale)['estimated_pixels'][0])
+        self._request('start_export', self.submit_latency)
+
+        with self._lock:
+            now = self.time()
+            task_id = f"FAKE{next(self._ids):08d}"
+            duration = (self.startup_seconds + pixels / self.pixels_per_second) \
+                * float(self.rng.lognormal(0.0, self.duration_noise))
+            fails = None
+            if self.rng.random() < self.failure_rate:
+                fails = str(self.rng.choice(self.FAILURE_MESSAGES))
+            self._tasks[task_id] = {
+                'id': task_id,
+                'name': f"projects/fake/operations/{task_id}",
+                'task_type': 'EXPORT_IMAGE',
+                'description': description,
+                'state': 'READY',
+                'creation_timestamp_ms': int(now * 1000),
+                'update_timestamp_ms': int(now * 1000),
+                'destination': destination,
+                'pixels': pixels,
+                'duration': duration,
+                'fails': fails
+            }
+            self._handles[task_id] = FakeTask(self, task_id, description)
+            self._ready.append(task_id)
+            self._advance(now)
+            return self._handles[task_id]
+
+    def get_task_list(self) -> List[Dict[str, Any]]:
+        self._request('get_task_list', self.list_latency)
+        with self._lock:
+            self._advance(self.time())
+            # Newest first, like the Earth Engine task list
+            return [self._status(record) for record in reversed(list(self._tasks.values()))]
+
+    def get_task(self, task_id: str, status: Dict[str, Any]) -> FakeTask:
+        return self._handles[task_id]
+
+    def task_status(self, task_id: str) -> Dict[str, Any]:
+        """
+        Get the status of one task (one request).
+
+        Args:
+            task_id: Task ID string
+
+        Returns:
+            Task status dictionary
+        """
+        self._request('task_status', self.status_latency)
+        with self._lock:
+            self._advance(self.time())
+            return self._status(self._tasks[task_id])
+
+    def cancel_task(self, task_id: str) -> None:
+        """
+        Cancel a queued or running task (one request).
+
+        Args:
+            task_id: Task ID string
+        """
+        self._request('cancel_task', self.status_latency)
+        with self._lock:
+            now = self.time()
+            self._advance(now)
+            record = self._tasks[task_id]
+            if record['state'] in ACTIVE_STATES:
+                record['state'] = 'CANCELLED'
+                record['update_timestamp_ms'] = int(now * 1000)
+                # A cancelled running task frees its slot at once
+                self._running = [entry for entry in self._running if entry[1] != task_id]
+                heapq.heapify(self._running)
+                self._start_ready(now)
+
+    def _synthetic_pixels(self) -> Any:
+        from .streaming import SyntheticPixelEndpoint
+        return SyntheticPixelEndpoint(num_bands=self.num_bands, seed=self.seed)
+
+    def reduce_regions(self, dataset_id: str, bounds_list: List[Dict[str, float]],
+                       year: int, scale: float, include_mean: bool = True,
+                       percentiles: Optional[Sequence[int]] = None,
+                       tile_scale: int = 1) -> List[Dict[str, Any]]:
+        self._request('reduce_regions', self.status_latency)
+        endpoint = self._synthetic_pixels()
+        bands = endpoint.band_names(year)
+        rows = []
+        for bounds in bounds_list:
+            width = bounds['east'] - bounds['west']
+            height = bounds['north'] - bounds['south']
+            # Reduce on a grid of at most REDUCE_GRID pixels per side
+            pixel_deg = max(scale / METERS_PER_DEGREE, width / self.REDUCE_GRID,
+                            height / self.REDUCE_GRID)
+            values = endpoint.fetch_block(
+                year, bounds['west'], bounds['north'], pixel_deg,
+                max(int(width / pixel_deg), 1), max(int(height / pixel_deg), 1), bands
+            ).reshape(-1, len(bands))
+            row = {}
+            if include_mean:
+                means = values.mean(axis=0)
+                suffix = '_mean' if percentiles else ''
+                row.update({f"{band}{suffix}": float(v) for band, v in zip(bands, means)})
+            for p in percentiles or ():
+                levels = np.percentile(values, p, axis=0)
+                row.update({f"{band}_p{p}": float(v) for band, v in zip(bands, levels)})
+            rows.append(row)
+        return rows
+
+    def sample(self, dataset_id: str, region_bounds: Dict[str, float], year: int,
+               scale: float, num_pixels: int, limit: int, seed: int = 0) -> List[Dict[str, Any]]:
+        self._request('sample', self.status_latency)
+        endpoint = self._synthetic_pixels()
+        bands = endpoint.band_names(year)
+        pixel_deg = scale / METERS_PER_DEGREE
+        columns = max(int((region_bounds['east'] - region_bounds['west']) / pixel_deg), 1)
+        lines = max(int((region_bounds['north'] - region_bounds['south']) / pixel_deg), 1)
+        # Regions with fewer pixels than requested come back short, as on Earth Engine
+        count = min(num_pixels, limit, columns * lines)
+        rng = np.random.default_rng(seed)
+        cells = rng.choice(columns * lines, size=count, replace=False)
+        features = []
+        for cell in cells:
+            row, column = divmod(int(cell), columns)
+            west = region_bounds['west'] + column * pixel_deg
+            north = region_bounds['north'] - row * pixel_deg
+            values = endpoint.fetch_block(year, west, north, pixel_deg, 1, 1, bands)[0, 0]
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point',
+                             'coordinates': [west + pixel_deg / 2, north - pixel_deg / 2]},
+                'properties': {band: float(v) for band, v in zip(bands, values)}
+            })
+        return features
+
+    def pixel_endpoint(self, dataset_id: str) -> Any:
+        from .streaming import SyntheticPixelEndpoint
+        return SyntheticPixelEndpoint(num_bands=self.num_bands,
+                                      latency=self.pixel_latency / self.speedup,
+                                      seed=self.seed)
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count simulated tasks per state.
+
+        Returns:
+            Dictionary mapping state to number of tasks
+        """
+        with self._lock:
+            self._advance(self.time())
+            counts: Dict[str, int] = {}
+            for record in self._tasks.values():
+                counts[record['state']] = counts.get(record['state'], 0) + 1
+            return counts
+
+
+_backend: Backend = EarthEngineBackend()
+
+
+def get_backend() -> Backend:
+    """
+    Get the backend used when none is passed explicitly.
+
+    Returns:
+        Default backend (EarthEngineBackend unless set_backend() was called)
+    """
+    return _backend
+
+
+def set_backend(backend: Backend) -> Backend:
+    """
+    Replace the default backend, e.g. with a FakeBackend for benchmarks.
+
+    Args:
+        backend: Backend to use from now on
+
+    Returns:
+        The previous default backend
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
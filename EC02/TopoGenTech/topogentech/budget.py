@@ -0,0 +1,160 @@
+"""
+Export planning under a size, pixel or time budget.
+
+plan_for_budget() picks the finest scale whose estimated size and pixel count
+stay within the given limits, and, when a deadline is given, the tiling and
+scale whose predicted run time fits. It only uses the offline size estimator
+and a DurationPredictor, so the plan can be inspected before anything is
+submitted.
+"""
+
+import math
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+import numpy as np
+
+from .estimator import DEFAULT_BYTES_PER_VALUE, DEFAULT_NUM_BANDS, estimate_export
+from .geometry import prune_tiles
+from .predictor import DurationPredictor, makespan
+from .scheduler import ExportScheduler
+from .tiling import split_bounds
+
+
+DEFAULT_YEAR = 2024  # year used for runtime predictions
+MIN_SCALE = 10  # native resolution of the embeddings, meters per pixel
+MAX_SCALE = 10000  # coarsest scale considered, meters per pixel
+TILE_SIZES_KM = (None, 200, 100, 50, 25, 10)  # tilings tried for deadlines; None = whole regions
+
+
+def _tiles(bounds_list: List[Dict[str, Any]],
+           tile_size_km: Optional[float]) -> List[Dict[str, Any]]:
+    if not tile_size_km:
+        return [dict(bounds, tile_id=None) for bounds in bounds_list]
+    tiles = []
+    for bounds in bounds_list:
+        tiles.extend(prune_tiles(bounds, split_bounds(bounds, tile_size_km)))
+    return tiles
+
+
+def _size_floor(area_km2: float, pixel_limit: float, min_scale: int) -> int:
+    """Finest integer scale at which ``area_km2`` holds at most ``pixel_limit`` pixels."""
+    if math.isinf(pixel_limit):
+        return min_scale
+    scale = max(min_scale, math.ceil(math.sqrt(area_km2 * 1e6 / pixel_limit)))
+    # Guard against rounding in the square root
+    while area_km2 * 1e6 / scale ** 2 > pixel_limit:
+        scale += 1
+    return scale
+
+
+def plan_for_budget(bounds_list: List[Dict[str, Any]],
+                    max_size_mb: Optional[float] = None,
+                    max_pixels: Optional[float] = None,
+                    deadline_seconds: Optional[float] = None,
+                    year: int = DEFAULT_YEAR,
+                    scales: Optional[Sequence[int]] = None,
+                    tile_sizes_km: Optional[Sequence[Optional[float]]] = None,
+                    num_bands: int = DEFAULT_NUM_BANDS,
+                    bytes_per_value: float = DEFAULT_BYTES_PER_VALUE,
+                    predictor: Optional[DurationPredictor] = None,
+                    max_concurrent: int = ExportScheduler.DEFAULT_MAX_CONCURRENT,
+                    check_interval: int = 30,
+                    min_scale: int = MIN_SCALE) -> Dict[str, Any]:
+    """
+    Choose the finest scale, and tiling, that fits a size, pixel or time budget.
+
+    Size and pixel limits apply to the total over all regions and are met
+    exactly, since the pixel count falls with the square of the scale. A
+    deadline is checked by predicting each tile's runtime and replaying the
+    tiles, longest first, on ``max_concurrent`` parallel slots; the finest
+    scale meeting it is found for every tiling, and the finest overall wins
+    (the one with fewer tiles on ties).
+
+    Args:
+        bounds_list: Regions to export, as bounds dictionaries (polygon regions
+            are tiled and estimated by their polygon)
+        max_size_mb: Maximum estimated total size in megabytes
+        max_pixels: Maximum estimated total number of pixels
+        deadline_seconds: Maximum predicted time until every export finished
+        year: Year of the embeddings, used by the runtime prediction
+        scales: Candidate scales in meters per pixel (any whole number of
+            meters from ``min_scale`` up if None)
+        tile_sizes_km: Tilings to consider; None in the list means whole
+            regions (TILE_SIZES_KM with a deadline, whole regions without)
+        num_bands: Number of bands per pixel
+        bytes_per_value: Bytes per band value of the export precision
+        predictor: Runtime model (a new predictor, using its prior, if None)
+        max_concurrent: Number of exports running at the same time
+        check_interval: Seconds between status checks of the scheduler
+        min_scale: Finest scale allowed when ``scales`` is None
+
+    Returns:
+        Plan dictionary with 'scale', 'tile_size_km', 'tiles' (bounds
+        dictionaries with a 'tile_id', None for whole regions),
+        'estimated_pixels', 'estimated_size_mb', 'estimated_seconds' and
+        'fits' (False if no candidate meets every limit, in which case the
+        coarsest plan is returned)
+    """
+    predictor = predictor or DurationPredictor()
+    if tile_sizes_km is None:
+        tile_sizes_km = TILE_SIZES_KM if deadline_seconds is not None else (None,)
+    candidates = sorted(scales) if scales else None
+    coarsest = candidates[-1] if candidates else MAX_SCALE
+
+    pixel_limit = math.inf
+    if max_pixels is not None:
+        pixel_limit = max_pixels
+    if max_size_mb is not None:
+        pixel_limit = min(pixel_limit, max_size_mb * 1e6 / (num_bands * bytes_per_value))
+
+    def predicted_seconds(area_km2: np.ndarray, scale: int) -> float:
+        pixels = area_km2 * 1e6 / scale ** 2
+        durations = predictor.predict(pixels, scale, year, num_bands=num_bands)['seconds']
+        # A finished task frees its slot at the next status check
+        return makespan(np.sort(durations)[::-1] + check_interval / 2, max_concurrent)
+
+    best: Optional[Tuple[Tuple[bool, int, float], Dict[str, Any]]] = None
+    for tile_size_km in tile_sizes_km:
+        tiles = _tiles(bounds_list, tile_size_km)
+        area_km2 = estimate_export(tiles, 1)['area_km2']
+        floor = _size_floor(float(area_km2.sum()), pixel_limit, min_scale)
+
+        if candidates is not None:
+            fitting = [scale for scale in candidates if scale >= floor]
+            fits = bool(fitting)
+            scale = fitting[0] if fitting else coarsest
+            if deadline_seconds is not None:
+                on_time = [s for s in fitting if predicted_seconds(area_km2, s) <= deadline_seconds]
+                fits = bool(on_time)
+                scale = on_time[0] if on_time else coarsest
+        else:
+            fits = floor <= MAX_SCALE
+            scale = min(floor, MAX_SCALE)
+            if deadline_seconds is not None and fits:
+                if predicted_seconds(area_km2, MAX_SCALE) > deadline_seconds:
+                    fits, scale = False, MAX_SCALE
+                else:
+                    # Predicted time falls as the scale grows: bisect for the finest on time
+                    low, high = floor, MAX_SCALE
+                    while low < high:
+                        middle = (low + high) // 2
+                        if predicted_seconds(area_km2, middle) <= deadline_seconds:
+                            high = middle
+                        else:
+                            low = middle + 1
+                    scale = low
+
+        seconds = predicted_seconds(area_km2, scale)
+        # Prefer plans that fit, then finer scales, then fewer tiles (or, for
+        # plans that do not fit, the fastest one)
+        key = (not fits, scale, len(tiles) if fits else seconds)
+        if best is None or key < best[0]:
+            best = (key, {'scale': scale, 'tile_size_km': tile_size_km, 'tiles': tiles,
+                          'estimated_seconds': seconds, 'fits': fits})
+
+    plan = best[1]
+    estimate = estimate_export(plan['tiles'], plan['scale'], num_bands=num_bands,
+                               bytes_per_value=bytes_per_value)
+    plan['estimated_pixels'] = float(estimate['estimated_pixels'].sum())
+    plan['estimated_size_mb'] = float(estimate['estimated_size_mb'].sum())
+    return plan
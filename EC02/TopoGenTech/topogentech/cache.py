@@ -0,0 +1,143 @@
+"""
+On-disk cache for dataset information returned by the downloader.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Any
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'topogentech')
+
+
+class DatasetInfoCache:
+    """
+    SQLite-backed cache for get_dataset_info() results.
+
+    Entries are keyed by dataset id, region bounds, year, scale and precision
+    and expire after ``ttl`` seconds. The database is opened per operation, so
+    one cache file can be shared by several processes.
+    """
+
+    DEFAULT_TTL = 7 * 24 * 60 * 60  # one week, in seconds
+    DEFAULT_FILENAME = 'dataset_info.sqlite'
+    DEFAULT_TIMEOUT = 30  # seconds to wait for another process's lock
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the SQLite file (defaults to ~/.cache/topogentech/dataset_info.sqlite)
+            ttl: Seconds an entry stays valid
+            timeout: Seconds an operation waits for a locked database before
+                raising sqlite3.OperationalError
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, self.DEFAULT_FILENAME)
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dataset_info ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(dataset_id: str, region_bounds: Dict[str, float],
+                 year: int, scale: float, precision: str = 'float32') -> str:
+        """
+        Build the cache key for a dataset info request.
+
+        Args:
+            dataset_id: Earth Engine dataset id
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            scale: Resolution in meters per pixel
+            precision: Storage precision the size estimate refers to
+
+        Returns:
+            Cache key string
+        """
+        bounds = [round(float(region_bounds[key]), 6) for key in ('west', 'south', 'east', 'north')]
+        key = [dataset_id, bounds, int(year), float(scale), precision]
+        if region_bounds.get('polygon') is not None:
+            key.append(region_bounds['polygon'].fingerprint)
+        return json.dumps(key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key as returned by make_key()
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM dataset_info WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        value, stored_at = row
+        if time.time() - stored_at > self.ttl:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an entry, replacing any previous value for the key.
+
+        Args:
+            key: Cache key as returned by make_key()
+            value: JSON-serializable dictionary
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dataset_info (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+
+    def evict_expired(self) -> int:
+        """
+        Delete every expired entry.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM dataset_info WHERE stored_at < ?", (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """
+        Delete every entry.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM dataset_info")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM dataset_info").fetchone()[0]
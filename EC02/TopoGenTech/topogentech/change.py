@@ -0,0 +1,190 @@
+"""
+Year-over-year change detection on locally stored embeddings.
+
+Two years of the same EmbeddingStore are compared chunk by chunk: each pair
+of matching chunks is read, the per-pixel cosine distance between the two
+embedding vectors is computed, and the result is written into a
+memory-mapped change raster. Chunk pairs are decompressed by a small thread
+pool one batch at a time, so at most ``workers`` pairs are in memory and
+memory use depends on the chunk size, not on the size of the region.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+
+DEFAULT_WORKERS = 2  # chunk pairs in memory at once
+HISTOGRAM_BINS = 2000  # bins over the cosine distance range [0, 2]
+DEFAULT_THRESHOLD = 0.1  # cosine distance above which a pixel counts as changed
+
+
+def cosine_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Compute the per-pixel cosine distance between two embedding arrays.
+
+    Args:
+        a: Array whose last axis is the band axis
+        b: Array of the same shape as ``a``
+
+    Returns:
+        float32 array with the band axis removed; values in [0, 2], NaN where
+        either input has missing data
+    """
+    a = a.astype(np.float32, copy=False)
+    b = b.astype(np.float32, copy=False)
+    dot = np.einsum('...i,...i->...', a, b)
+    norms = np.sqrt(np.einsum('...i,...i->...', a, a) * np.einsum('...i,...i->...', b, b))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        distance = 1.0 - dot / np.maximum(norms, 1e-12)
+    return np.clip(distance, 0.0, 2.0).astype(np.float32)
+
+
+class ChangeStatistics:
+    """
+    Streaming summary of change values, updated one block at a time.
+
+    Keeps running sums and a fixed-width histogram, so mean, standard
+    deviation and percentiles are available without keeping the values.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Initialize empty statistics.
+
+        Args:
+            threshold: Cosine distance above which a pixel counts as changed
+        """
+        self.threshold = threshold
+        self.count = 0
+        self.changed = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.maximum = 0.0
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a block of change values; NaN values are ignored.
+
+        Args:
+            values: Array of cosine distances
+        """
+        values = values[~np.isnan(values)].astype(np.float64)
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.changed += int(np.count_nonzero(values > self.threshold))
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.histogram += np.histogram(values, bins=HISTOGRAM_BINS, range=(0.0, 2.0))[0]
+
+    def percentile(self, q: float) -> float:
+        """
+        Approximate a percentile from the histogram.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Upper edge of the histogram bin holding the percentile
+        """
+        if self.count == 0:
+            return float('nan')
+        position = np.searchsorted(np.cumsum(self.histogram), q / 100 * self.count)
+        return float(min(position + 1, HISTOGRAM_BINS) * 2.0 / HISTOGRAM_BINS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            mean = std = float('nan')
+        else:
+            mean = self.total / self.count
+            std = float(np.sqrt(max(self.total_sq / self.count - mean ** 2, 0.0)))
+        return {
+            'valid_pixels': self.count,
+            'changed_pixels': self.changed,
+            'changed_fraction': self.changed / self.count if self.count else 0.0,
+            'threshold': self.threshold,
+            'mean': mean,
+            'std': std,
+            'max': self.maximum,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99)
+        }
+
+
+def detect_change(store: Any, year_a: int, year_b: int, output_path: str,
+                  bounds: Optional[Dict[str, float]] = None,
+                  bands: Optional[List[str]] = None,
+                  threshold: float = DEFAULT_THRESHOLD,
+                  workers: int = DEFAULT_WORKERS,
+                  verbose: bool = True) -> Dict[str, Any]:
+    """
+    Write a change-magnitude raster comparing two years of a store.
+
+    The raster is a float32 ``.npy`` file of cosine distances with NaN where
+    either year has no data, plus a ``<output_path>.json`` sidecar in the
+    format used by PixelStreamer, so it can be opened with open_download().
+
+    Args:
+        store: EmbeddingStore holding both years
+        year_a: Earlier year
+        year_b: Later year
+        output_path: Path of the ``.npy`` change raster to create
+        bounds: Only compare pixels inside these bounds (all shared chunks if None)
+        bands: Band names to compare (all bands if None)
+        threshold: Cosine distance above which a pixel counts as changed
+        workers: Number of chunk pairs read and compared concurrently
+        verbose: Whether to print progress updates
+
+    Returns:
+        Summary dictionary with pixel counts, mean, std, max, approximate
+        percentiles and the output path
+    """
+    shared = sorted(set(store.chunk_keys(year_a, bounds)) & set(store.chunk_keys(year_b, bounds)))
+    if not shared:
+        raise ValueError(f"No chunks are stored for both {year_a} and {year_b}")
+
+    window = store.chunks_window(shared, bounds)
+    first_row, last_row, first_col, last_col = window
+    change = np.lib.format.open_memmap(
+        output_path, mode='w+', dtype=np.float32,
+        shape=(last_row - first_row, last_col - first_col)
+    )
+    change[:] = np.nan
+    metadata = dict(store.window_metadata(window), year=year_b, year_a=year_a,
+                    year_b=year_b, bands=['change'])
+
+    def compare(key: Any) -> Any:
+        chunk_slices, window_slices = store.chunk_overlap(key[0], key[1], window)
+        block = cosine_distance(
+            store.read_chunk(year_a, key[0], key[1], bands)[chunk_slices],
+            store.read_chunk(year_b, key[0], key[1], bands)[chunk_slices]
+        )
+        return window_slices, block
+
+    stats = ChangeStatistics(threshold)
+    start_time = time.time()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for offset in range(0, len(shared), workers):
+            for window_slices, block in executor.map(compare, shared[offset:offset + workers]):
+                change[window_slices] = block
+                stats.update(block)
+
+            done = min(offset + workers, len(shared))
+            if verbose:
+                elapsed = time.time() - start_time
+                print(f"Compared {done}/{len(shared)} chunks (elapsed: {elapsed:.0f}s)")
+
+    change.flush()
+    summary = dict(stats.to_dict(), path=output_path, year_a=year_a, year_b=year_b)
+    metadata['summary'] = summary
+    with open(f"{output_path}.json", 'w', encoding='utf-8') as fh:
+        json.dump(metadata, fh, indent=2)
+    return summary
@@ -0,0 +1,329 @@
+"""
+Command line interface for batch exports of satellite embeddings.
+
+Plans one export per region, year and scale (optionally split into tiles),
+submits them in parallel through an ExportScheduler, monitors them until they
+finish and prints a summary. Example::
+
+    topogentech-download --project my-project --regions quito guayaquil \\
+        --years 2022 2023 2024 --scales 10 30 --workers 8
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional, Any, Sequence
+
+from .budget import plan_for_budget
+from .estimator import estimate_export
+from .geometry import DEFAULT_TOLERANCE, prune_tiles
+from .manifest import ExportManifest
+from .metrics import ExportMetrics
+from .predictor import DurationPredictor
+from .quantization import PRECISIONS, bytes_per_value
+from .regions import RegionConfig
+from .scheduler import ExportScheduler
+from .tiling import split_bounds
+
+# Same defaults as SatelliteEmbeddingsDownloader; repeated here so that
+# planning, --dry-run and --help do not import the Earth Engine client.
+DEFAULT_YEAR = 2024
+DEFAULT_SCALE = 10  # meters per pixel
+
+
+def resolve_regions(names: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Look up the bounds of predefined regions.
+
+    Args:
+        names: Country or city names known to RegionConfig
+
+    Returns:
+        Dictionary mapping region name to bounds, in the given order
+    """
+    regions = {}
+    unknown = []
+    for name in names:
+        bounds = RegionConfig.get_region_bounds(name)
+        if bounds is None:
+            unknown.append(name)
+        else:
+            regions[name.lower()] = bounds
+    if unknown:
+        raise ValueError(f"Unknown regions: {', '.join(unknown)}")
+    return regions
+
+
+def plan_exports(regions: Dict[str, Dict[str, float]], years: Sequence[int],
+                 scales: Sequence[int], tile_size_km: Optional[float] = None,
+                 precision: str = 'float32',
+                 predictor: Optional[DurationPredictor] = None) -> List[Dict[str, Any]]:
+    """
+    Build the list of exports for every region, year and scale.
+
+    Args:
+        regions: Dictionary mapping region name to bounds
+        years: Years to export
+        scales: Resolutions in meters per pixel
+        tile_size_km: Split regions into tiles of this size (whole regions if None)
+        precision: Export precision, used for the size estimate
+        predictor: Runtime model; adds an 'estimated_seconds' key if given
+
+    Returns:
+        List of export dictionaries with 'region', 'year', 'scale', 'tile_id',
+        'bounds', 'description' and 'estimated_size_mb' keys. Tiles outside
+        polygon regions are left out.
+    """
+    exports = []
+    for name, region_bounds in regions.items():
+        if tile_size_km:
+            parts = prune_tiles(region_bounds, split_bounds(region_bounds, tile_size_km))
+        else:
+            parts = [dict(region_bounds, tile_id=None)]
+
+        for year in years:
+            for scale in scales:
+                sizes = estimate_export(parts, scale,
+                                        bytes_per_value=bytes_per_value(precision))
+                seconds = [None] * len(parts)
+                if predictor is not None:
+                    seconds = predictor.predict(sizes['estimated_pixels'], scale, year)['seconds']
+                for part, size_mb, part_seconds in zip(parts, sizes['estimated_size_mb'], seconds):
+                    description = f"{name}_{year}_{scale}m"
+                    if part['tile_id']:
+                        description = f"{description}_{part['tile_id']}"
+                    bounds = {key: part[key] for key in ('west', 'east', 'south', 'north')}
+                    if part.get('polygon') is not None:
+                        bounds['polygon'] = part['polygon']
+                    exports.append({
+                        'region': name,
+                        'year': year,
+                        'scale': scale,
+                        'tile_id': part['tile_id'],
+                        'bounds': bounds,
+                        'description': description,
+                        'estimated_size_mb': float(size_mb)
+                    })
+                    if part_seconds is not None:
+                        exports[-1]['estimated_seconds'] = float(part_seconds)
+    return exports
+
+
+def print_plan(exports: List[Dict[str, Any]]) -> None:
+    """
+    Print one line per planned export and the estimated total size.
+
+    Args:
+        exports: Export dictionaries returned by plan_exports()
+    """
+    for export in exports:
+        print(f"  {export['description']:<40} {export['estimated_size_mb']:>12,.1f} MB")
+    total_mb = sum(export['estimated_size_mb'] for export in exports)
+    print(f"{len(exports)} exports, estimated total {total_mb:,.1f} MB")
+    if exports and all('estimated_seconds' in export for export in exports):
+        task_seconds = sum(export['estimated_seconds'] for export in exports)
+        duration = (f"{task_seconds / 3600:,.1f} h" if task_seconds >= 3600
+                    else f"{task_seconds / 60:.0f} min")
+        print(f"Estimated task time {duration} (sum over exports, before parallelism)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='topogentech-download',
+        description='Export satellite embeddings for many regions, years and scales.'
+    )
+    parser.add_argument('--project', help='Google Cloud project ID')
+    parser.add_argument('--regions', nargs='+', metavar='NAME',
+                        help='Country or city names (see --list-regions)')
+    parser.add_argument('--geojson', nargs='+', metavar='FILE', default=[],
+                        help='Polygon regions from GeoJSON files, named after the file '
+                             '(use the names in --regions, or omit --regions to export them all)')
+    parser.add_argument('--simplify-tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Douglas-Peucker tolerance in degrees for --geojson polygons')
+    parser.add_argument('--years', nargs='+', type=int,
+                        default=[DEFAULT_YEAR])
+    parser.add_argument('--scales', nargs='+', type=int,
+                        help=f'Resolutions in meters per pixel (default {DEFAULT_SCALE}); with '
+                             '--max-size-mb or --max-pixels, the candidates to choose from')
+    parser.add_argument('--max-size-mb', type=float,
+                        help='Use the finest scale whose estimated total size stays within this')
+    parser.add_argument('--max-pixels', type=float,
+                        help='Use the finest scale whose estimated total pixel count stays '
+                             'within this')
+    parser.add_argument('--destination', choices=('drive', 'asset'), default='drive')
+    parser.add_argument('--folder', default='EarthEngine_Exports',
+                        help='Google Drive folder (drive exports)')
+    parser.add_argument('--asset-folder',
+                        help='Asset folder, e.g. projects/my-project/assets/embeddings (asset exports)')
+    parser.add_argument('--tile-size-km', type=float,
+                        help='Split each region into tiles of this size')
+    parser.add_argument('--precision', choices=PRECISIONS, default='float32')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of export tasks submitted in parallel')
+    parser.add_argument('--max-running', type=int,
+                        default=ExportScheduler.DEFAULT_MAX_CONCURRENT,
+                        help='Maximum number of tasks running at the same time')
+    parser.add_argument('--max-retries', type=int, default=0,
+                        help='How many times a failed export is resubmitted')
+    parser.add_argument('--check-interval', type=int, default=30,
+                        help='Seconds between status checks')
+    parser.add_argument('--timeout', type=float,
+                        help='Stop monitoring after this many seconds')
+    parser.add_argument('--no-wait', action='store_true',
+                        help='Submit the first batch of tasks and exit without monitoring')
+    parser.add_argument('--manifest', metavar='PATH',
+                        help='JSON Lines journal of submitted exports; rerunning with the '
+                             'same file skips completed exports and reattaches running ones')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='Write export metrics in Prometheus text format to this file')
+    parser.add_argument('--event-log', metavar='PATH',
+                        help='Append one line per task state change to this .csv or .jsonl '
+                             'file; completed tasks already in it train the runtime predictor')
+    parser.add_argument('--longest-first', action='store_true',
+                        help='Submit exports with the longest predicted runtime first')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the export plan and size estimate without submitting')
+    parser.add_argument('--authenticate', action='store_true',
+                        help='Run Earth Engine authentication first')
+    parser.add_argument('--list-regions', action='store_true',
+                        help='List the predefined regions and exit')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Command line arguments (sys.argv[1:] if None)
+
+    Returns:
+        Process exit code: 0 on success, 1 if any export failed, 2 on usage errors
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_regions:
+        for kind, names in RegionConfig.list_all_regions().items():
+            print(f"{kind}: {', '.join(names)}")
+        return 0
+
+    geojson_names = []
+    for path in args.geojson:
+        name = os.path.splitext(os.path.basename(path))[0].lower()
+        try:
+            RegionConfig.load_geojson_region(name, path, tolerance=args.simplify_tolerance)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Could not load {path}: {e}")
+        geojson_names.append(name)
+
+    if not args.regions:
+        args.regions = geojson_names
+    if not args.regions:
+        parser.error("--regions or --geojson is required")
+    if args.destination == 'asset' and not args.asset_folder:
+        parser.error("--asset-folder is required for asset exports")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        regions = resolve_regions(args.regions)
+    except ValueError as e:
+        parser.error(str(e))
+
+    predictor = DurationPredictor()
+    if args.event_log and os.path.exists(args.event_log):
+        predictor.add_event_log(args.event_log)
+
+    if args.max_size_mb is not None or args.max_pixels is not None:
+        # The budget covers every region and year, all exported at one scale
+        budget = plan_for_budget(
+            [bounds for bounds in regions.values() for _ in args.years],
+            max_size_mb=args.max_size_mb, max_pixels=args.max_pixels,
+            scales=args.scales, bytes_per_value=bytes_per_value(args.precision),
+            predictor=predictor
+        )
+        if not budget['fits']:
+            print(f"No scale fits the budget; the coarsest, {budget['scale']} m, "
+                  f"needs {budget['estimated_size_mb']:,.1f} MB")
+            return 1
+        print(f"Budget: {budget['scale']} m per pixel, "
+              f"estimated {budget['estimated_size_mb']:,.1f} MB")
+        args.scales = [budget['scale']]
+    elif not args.scales:
+        args.scales = [DEFAULT_SCALE]
+
+    exports = plan_exports(regions, args.years, args.scales,
+                           tile_size_km=args.tile_size_km, precision=args.precision,
+                           predictor=predictor)
+    print("Export plan:")
+    print_plan(exports)
+    if args.dry_run:
+        return 0
+
+    if not args.project:
+        parser.error("--project is required unless --dry-run is given")
+
+    from .downloader import SatelliteEmbeddingsDownloader
+
+    metrics = ExportMetrics(event_log=args.event_log)
+
+    # Initialize once; one downloader per (year, scale) pair shares the session
+    downloader = SatelliteEmbeddingsDownloader(
+        args.project, precision=args.precision, metrics=metrics, predictor=predictor
+    )
+    if not downloader.initialize(authenticate=args.authenticate):
+        return 1
+    downloaders: Dict[Any, SatelliteEmbeddingsDownloader] = {
+        (year, scale): downloader.with_settings(year=year, scale=scale)
+        for year in args.years for scale in args.scales
+    }
+
+    scheduler = ExportScheduler(None, max_concurrent=args.max_running,
+                                check_interval=args.check_interval,
+                                max_retries=args.max_retries,
+                                submit_workers=args.workers,
+                                metrics=metrics,
+                                longest_first=args.longest_first,
+                                manifest=ExportManifest(args.manifest) if args.manifest else None)
+    for export in exports:
+        asset_id = None
+        if args.destination == 'asset':
+            asset_id = f"{args.asset_folder.rstrip('/')}/{export['description']}"
+        scheduler.add_job(
+            export['bounds'], export['description'],
+            destination=args.destination, folder=args.folder, asset_id=asset_id,
+            downloader=downloaders[(export['year'], export['scale'])],
+            metadata={key: value for key, value in export.items() if key != 'bounds'}
+        )
+
+    resumed = [job for job in scheduler.finished + scheduler.running if job.resumed]
+    if resumed:
+        print(f"Resumed from manifest: {len(resumed)} exports already completed or running")
+
+    if args.no_wait:
+        submitted = scheduler.step()
+        print(f"Submitted {submitted} tasks, {scheduler.pending_count} not submitted")
+        if args.metrics:
+            metrics.write_prometheus(args.metrics)
+        return 0
+
+    summary = scheduler.run(verbose=True, timeout=args.timeout)
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+
+    print("\nSummary:")
+    for state, count in sorted(summary.items()):
+        print(f"  {state}: {count}")
+    failed = scheduler.failed_jobs()
+    for job in failed:
+        print(f"  {job.description}: {job.state} {job.error_message or ''}".rstrip())
+
+    if not scheduler.is_done():
+        print(f"{len(scheduler.running)} tasks still running, "
+              f"{scheduler.pending_count} not submitted")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Unsupervised land-cover clustering of embeddings streamed from a local store.
+
+MiniBatchKMeans is fitted on mini-batches of pixels drawn chunk by chunk from
+an EmbeddingStore, so the region never has to fit in memory. Labels are then
+written chunk by chunk into a compact uint8 raster. Chunks are decompressed
+and labelled by a thread pool; NumPy releases the GIL in both the
+decompression and the distance products, so this uses several cores.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any
+
+import numpy as np
+
+from .similarity import ExactIndex, kmeans
+
+
+DEFAULT_CLUSTERS = 16
+DEFAULT_BATCH_SIZE = 8192  # pixels per mini-batch update
+DEFAULT_WORKERS = 2  # chunks in memory at once
+INIT_SAMPLE_SIZE = 20000  # pixels used to seed the centroids
+LABEL_NODATA = 255  # label of pixels without data
+
+
+class MiniBatchKMeans:
+    """
+    Mini-batch k-means (Sculley, 2010) over embedding vectors.
+
+    Each mini-batch moves every centroid towards the mean of the points
+    assigned to it, with a step size that shrinks as the centroid accumulates
+    points, so the fit converges without revisiting old batches.
+    """
+
+    def __init__(self, n_clusters: int = DEFAULT_CLUSTERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, seed: int = 0):
+        """
+        Initialize an unfitted model.
+
+        Args:
+            n_clusters: Number of clusters (at most 255 so labels fit in uint8)
+            batch_size: Pixels per mini-batch update
+            seed: Random seed
+        """
+        if not 1 <= n_clusters < LABEL_NODATA:
+            raise ValueError(f"n_clusters must be between 1 and {LABEL_NODATA - 1}")
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.centroids: Optional[np.ndarray] = None
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.inertia = 0.0  # mean squared distance over the last epoch
+        self._index: Optional[ExactIndex] = None
+
+    def init_centroids(self, sample: np.ndarray) -> None:
+        """
+        Seed the centroids with a few Lloyd iterations on a sample.
+
+        Args:
+            sample: Array of shape (n, dims) with at least n_clusters rows
+        """
+        if len(sample) < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} pixels to initialize")
+        self.centroids = kmeans(sample, self.n_clusters, n_iter=5,
+                                seed=int(self.rng.integers(2 ** 31)))
+        self._index = None
+
+    def _assign(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        if self._index is None:
+            self._index = ExactIndex(self.centroids, metric='l2')
+        result = self._index.search(vectors, k=1)
+        return {'labels': result['indices'][:, 0], 'distances': result['distances'][:, 0]}
+
+    def partial_fit(self, vectors: np.ndarray) -> float:
+        """
+        Update the centroids with one mini-batch.
+
+        Args:
+            vectors: Array of shape (n, dims) without NaN rows
+
+        Returns:
+            Sum of squared distances of the batch to its centroids before the update
+        """
+        if self.centroids is None:
+            self.init_centroids(vectors)
+        assigned = self._assign(vectors)
+        labels = assigned['labels']
+
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.zeros_like(self.centroids)
+        filled = batch_counts > 0
+        order = np.argsort(labels, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(batch_counts)[:-1]])[filled]
+        sums[filled] = np.add.reduceat(vectors[order], starts, axis=0)
+
+        # c <- (c * n_old + sum) / (n_old + n_batch), i.e. a per-centroid running mean
+        totals = self.counts + batch_counts
+        self.centroids[filled] = (
+            self.centroids[filled] * self.counts[filled, None] + sums[filled]
+        ) / totals[filled, None]
+        self.counts = totals
+        self._index = None
+        return float(np.sum(assigned['distances']))
+
+    def predict(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Assign vectors to their nearest centroid.
+
+        Args:
+            vectors: Array of shape (n, dims)
+
+        Returns:
+            uint8 label array of shape (n,)
+        """
+        if self.centroids is None:
+            raise RuntimeError("Model is not fitted. Call fit_store() or partial_fit() first.")
+        return self._assign(vectors)['labels'].astype(np.uint8)
+
+
+def _valid_pixels(chunk: np.ndarray) -> np.ndarray:
+    vectors = chunk.reshape(-1, chunk.shape[-1])
+    return vectors[~np.isnan(vectors).any(axis=1)]
+
+
+def _stream_chunks(store: Any, year: int, keys: List[Any], bands: Optional[List[str]],
+                   workers: int) -> Iterator[np.ndarray]:
+    """Yield valid pixels chunk by chunk, reading ``workers`` chunks at a time."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for offset in range(0, len(keys), workers):
+            batch = keys[offset:offset + workers]
+            yield from executor.map(
+                lambda key: _valid_pixels(store.read_chunk(year, key[0], key[1], bands)), batch
+            )
+
+
+def fit_store(store: Any, year: int, n_clusters: int = DEFAULT_CLUSTERS,
+              bounds: Optional[Dict[str, float]] = None,
+              bands: Optional[List[str]] = None,
+              n_epochs: int = 2,
+              batch_size: int = DEFAULT_BATCH_SIZE,
+              workers: int = DEFAULT_WORKERS,
+              seed: int = 0,
+              verbose: bool = True) -> MiniBatchKMeans:
+    """
+    Fit mini-batch k-means on the embeddings of a store, one chunk at a time.
+
+    Centroids are seeded from a sample drawn across randomly chosen chunks,
+    then refined over ``n_epochs`` passes; chunk order and pixel order are
+    shuffled every pass.
+
+    Args:
+        store: EmbeddingStore with the embeddings
+        year: Year of the embeddings
+        n_clusters: Number of clusters (at most 254)
+        bounds: Only use chunks overlapping these bounds (all chunks if None)
+        bands: Band names used as features (all bands if None)
+        n_epochs: Passes over the chunks
+        batch_size: Pixels per mini-batch update
+        workers: Number of chunks read concurrently
+        seed: Random seed
+        verbose: Whether to print progress updates
+
+    Returns:
+        Fitted MiniBatchKMeans model
+    """
+    keys = store.chunk_keys(year, bounds)
+    if not keys:
+        raise ValueError(f"No chunks are stored for {year}")
+
+    model = MiniBatchKMeans(n_clusters, batch_size=batch_size, seed=seed)
+    rng = model.rng
+
+    # Seed from a few pixels of many chunks rather than all pixels of one
+    init_keys = [keys[i] for i in rng.permutation(len(keys))[:max(workers, 8)]]
+    per_chunk = max(n_clusters, INIT_SAMPLE_SIZE // len(init_keys))
+    samples = []
+    for vectors in _stream_chunks(store, year, init_keys, bands, workers):
+        if len(vectors):
+            samples.append(vectors[rng.choice(len(vectors), min(per_chunk, len(vectors)),
+                                              replace=False)])
+    model.init_centroids(np.concatenate(samples) if samples else np.empty((0, 0)))
+
+    start_time = time.time()
+    for epoch in range(n_epochs):
+        order = [keys[i] for i in rng.permutation(len(keys))]
+        total_distance = 0.0
+        total_pixels = 0
+        for vectors in _stream_chunks(store, year, order, bands, workers):
+            vectors = vectors[rng.permutation(len(vectors))]
+            for offset in range(0, len(vectors), batch_size):
+                batch = vectors[offset:offset + batch_size]
+                total_distance += model.partial_fit(batch)
+                total_pixels += len(batch)
+
+        model.inertia = total_distance / max(total_pixels, 1)
+        if verbose:
+            elapsed = time.time() - start_time
+            print(f"Epoch {epoch + 1}/{n_epochs}: inertia {model.inertia:.4f} "
+                  f"(elapsed: {elapsed:.0f}s)")
+    return model
+
+
+def write_labels(model: MiniBatchKMeans, store: Any, year: int, output_path: str,
+                 bounds: Optional[Dict[str, float]] = None,
+                 bands: Optional[List[str]] = None,
+                 workers: int = DEFAULT_WORKERS,
+                 verbose: bool = True) -> Dict[str, Any]:
+    """
+    Label every stored pixel and write the labels as a uint8 raster.
+
+    The raster is a memory-mapped ``.npy`` file with 255 where there is no
+    data, plus a ``<output_path>.json`` sidecar in the format used by
+    PixelStreamer (with the centroids), so it can be opened with
+    open_download().
+
+    Args:
+        model: Fitted MiniBatchKMeans model
+        store: EmbeddingStore with the embeddings
+        year: Year of the embeddings
+        output_path: Path of the ``.npy`` label raster to create
+        bounds: Only label pixels inside these bounds (all chunks if None)
+        bands: Band names used as features (the ones the model was fitted on)
+        workers: Number of chunks labelled concurrently
+        verbose: Whether to print progress updates
+
+    Returns:
+        Summary dictionary with 'path', 'labelled_pixels' and 'cluster_counts'
+    """
+    keys = store.chunk_keys(year, bounds)
+    if not keys:
+        raise ValueError(f"No chunks are stored for {year}")
+
+    window = store.chunks_window(keys, bounds)
+    first_row, last_row, first_col, last_col = window
+    labels = np.lib.format.open_memmap(
+        output_path, mode='w+', dtype=np.uint8,
+        shape=(last_row - first_row, last_col - first_col)
+    )
+    labels[:] = LABEL_NODATA
+
+    def label(key: Any) -> Any:
+        chunk_slices, window_slices = store.chunk_overlap(key[0], key[1], window)
+        chunk = store.read_chunk(year, key[0], key[1], bands)[chunk_slices]
+        vectors = chunk.reshape(-1, chunk.shape[-1])
+        valid = ~np.isnan(vectors).any(axis=1)
+        block = np.full(len(vectors), LABEL_NODATA, dtype=np.uint8)
+        if valid.any():
+            block[valid] = model.predict(vectors[valid])
+        return window_slices, block.reshape(chunk.shape[:2])
+
+    counts = np.zeros(model.n_clusters, dtype=np.int64)
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for offset in range(0, len(keys), workers):
+            for window_slices, block in executor.map(label, keys[offset:offset + workers]):
+                labels[window_slices] = block
+                counts += np.bincount(block[block != LABEL_NODATA], minlength=model.n_clusters)
+
+            if verbose:
+                done = min(offset + workers, len(keys))
+                elapsed = time.time() - start_time
+                print(f"Labelled {done}/{len(keys)} chunks (elapsed: {elapsed:.0f}s)")
+
+    labels.flush()
+    metadata = dict(store.window_metadata(window), year=year, bands=['cluster'],
+                    nodata=LABEL_NODATA, centroids=model.centroids.tolist())
+    with open(f"{output_path}.json", 'w', encoding='utf-8') as fh:
+        json.dump(metadata, fh)
+
+    return {
+        'path': output_path,
+        'labelled_pixels': int(counts.sum()),
+        'cluster_counts': counts.tolist()
+    }
@@ -2,12 +2,32 @@
 Core downloader module for satellite embeddings from Google Earth Engine.
 """
 
+import copy
 import ee
 import os
 import time
-from typing import Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+
+from .async_monitor import monitor_tasks as _monitor_tasks
+from .backends import Backend, get_backend
+from .budget import plan_for_budget as _plan_for_budget
+from .cache import DatasetInfoCache
+from .estimator import DEFAULT_NUM_BANDS, estimate_export
+from .geometry import prune_tiles
+from .metrics import ExportMetrics
+from .predictor import DurationPredictor
+from .quantization import bytes_per_value, check_precision
+from .query import QueryPlan, QueryPlanner, get_query_planner
+from .sampling import MAX_POINTS_PER_REQUEST, features_to_rows, write_table
+from .streaming import (
+    DEFAULT_BLOCK_SIZE, DEFAULT_WORKERS, METERS_PER_DEGREE, PixelStreamer
+)
+from .tiling import ExportTileSet, snap_tiles, split_bounds
+
 
 class SatelliteEmbeddingsDownloader:
     """
@@ -17,8 +37,15 @@ class SatelliteEmbeddingsDownloader:
     DATASET_ID = 'GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL'
     DEFAULT_SCALE = 10  # meters per pixel
     DEFAULT_YEAR = 2024
+    DEFAULT_TILE_SIZE_KM = 50  # tile edge length for tiled exports
+    ZONAL_BATCH_SIZE = 100  # regions per zonal statistics request
+    SAMPLE_OVERSAMPLING = 2  # pixels requested per point wanted from sample()
     
-    def __init__(self, project_id: str, year: int = DEFAULT_YEAR, scale: int = DEFAULT_SCALE):
+    def __init__(self, project_id: str, year: int = DEFAULT_YEAR, scale: int = DEFAULT_SCALE,
+                 cache: Optional[DatasetInfoCache] = None, precision: str = 'float32',
+                 backend: Optional[Backend] = None,
+                 metrics: Optional[ExportMetrics] = None,
+                 predictor: Optional[DurationPredictor] = None):
         """
         Initialize the downloader.
         
@@ -26,10 +53,24 @@ class SatelliteEmbeddingsDownloader:
             project_id: Google Cloud Project ID
             year: Year for the embeddings data (2017 onwards)
             scale: Resolution in meters per pixel
+            cache: Cache for get_dataset_info() results (default on-disk cache if None)
+            precision: Export precision: 'float32', 'float16' or 'int8'. Reduced
+                precisions are exported as fixed point (see quantization module)
+            backend: Backend that starts exports and answers dataset and task
+                requests (default backend, normally Earth Engine, if None)
+            metrics: Collector that records every export started (none if None)
+            predictor: Runtime model used for ETAs; it learns from the tasks
+                completed in ``metrics`` (a new predictor if None)
         """
         self.project_id = project_id
         self.year = year
         self.scale = scale
+        self._cache = cache
+        self.precision = check_precision(precision)
+        self.planner: QueryPlanner = get_query_planner()
+        self.backend = backend or get_backend()
+        self.metrics = metrics
+        self.predictor = predictor or DurationPredictor()
         self._initialized = False
         
     def initialize(self, authenticate: bool = False) -> bool:
@@ -43,10 +84,7 @@ class SatelliteEmbeddingsDownloader:
             True if initialization successful, False otherwise
         """
         try:
-            if authenticate:
-                ee.Authenticate()
-            
-            ee.Initialize(project=self.project_id)
+            self.backend.initialize(self.project_id, authenticate=authenticate)
             self._initialized = True
             return True
             
@@ -54,45 +92,82 @@ class SatelliteEmbeddingsDownloader:
             print(f"Error initializing Earth Engine: {e}")
             return False
     
-    def get_dataset_info(self, region_bounds: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    def with_settings(self, year: Optional[int] = None,
+                      scale: Optional[int] = None) -> 'SatelliteEmbeddingsDownloader':
+        """
+        Get a downloader for another year or scale that shares this one's session.
+        
+        The copy uses the same backend, cache, metrics and predictor, and is
+        initialized if this downloader is, so no further initialize() call
+        is needed.
+        
+        Args:
+            year: Year for the embeddings data (this downloader's year if None)
+            scale: Resolution in meters per pixel (this downloader's scale if None)
+            
+        Returns:
+            New SatelliteEmbeddingsDownloader
+        """
+        downloader = copy.copy(self)
+        downloader.year = year or self.year
+        downloader.scale = scale or self.scale
+        return downloader
+    
+    @property
+    def cache(self) -> DatasetInfoCache:
+        """Cache used by get_dataset_info(), created on first use."""
+        if self._cache is None:
+            self._cache = DatasetInfoCache()
+        return self._cache
+    
+    def get_dataset_info(self, region_bounds: Dict[str, float],
+                         use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Get information about the satellite embeddings dataset for a region.
         
+        Results are stored in an on-disk cache keyed by bounds, year, scale and
+        dataset id, so repeated calls for the same region skip Earth Engine.
+        The predicted export time ('estimated_seconds', with a 10th-90th
+        percentile range) and pixel throughput are computed on every call, so
+        they follow the predictor's latest history.
+        
         Args:
             region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            use_cache: Whether to read and update the cache
             
         Returns:
             Dataset information dictionary or None if error
         """
+        cache_key = None
+        if use_cache:
+            cache_key = DatasetInfoCache.make_key(
+                self.DATASET_ID, region_bounds, self.year, self.scale, self.precision
+            )
+            try:
+                cached = self.cache.get(cache_key)
+            except Exception as e:
+                print(f"Error reading dataset info cache: {e}")
+                cached = None
+            if cached is not None:
+                return self._with_prediction(cached, region_bounds)
+        
         if not self._initialized:
             raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
             
         try:
-            geometry = ee.Geometry.Rectangle([
-                region_bounds['west'], region_bounds['south'],
-                region_bounds['east'], region_bounds['north']
-            ])
-            
-            embeddings = ee.ImageCollection(self.DATASET_ID)
-            start_date = ee.Date.fromYMD(self.year, 1, 1)
-            end_date = start_date.advance(1, 'year')
-            
-            filtered_embeddings = embeddings.filter(
-                ee.Filter.date(start_date, end_date)
-            ).filter(ee.Filter.bounds(geometry))
-            
-            embeddings_image = filtered_embeddings.mosaic()
-            info = embeddings_image.getInfo()
+            info = self.backend.image_info(self.DATASET_ID, region_bounds, self.year)
             
-            # Calculate area and estimated size
-            area_km2 = geometry.area().getInfo() / 1e6
-            num_pixels = area_km2 * 1e6 / (self.scale * self.scale)
-            size_mb = (num_pixels * 64 * 4) / 1e6  # 64 bands, 4 bytes per float32
+            # Calculate area and estimated size locally for the chosen precision
+            estimate = self.estimate_size([region_bounds])
+            area_km2 = float(estimate['area_km2'][0])
+            num_pixels = float(estimate['estimated_pixels'][0])
+            size_mb = float(estimate['estimated_size_mb'][0])
             
-            return {
+            dataset_info = {
                 'dataset_id': self.DATASET_ID,
                 'year': self.year,
                 'scale': self.scale,
+                'precision': self.precision,
                 'num_bands': len(info['bands']),
                 'band_names': [band['id'] for band in info['bands']],
                 'area_km2': area_km2,
@@ -100,13 +175,117 @@ class SatelliteEmbeddingsDownloader:
                 'estimated_size_mb': int(size_mb)
             }
             
+            if cache_key is not None:
+                try:
+                    self.cache.set(cache_key, dataset_info)
+                except Exception as e:
+                    print(f"Error writing dataset info cache: {e}")
+            
+            return self._with_prediction(dataset_info, region_bounds)
+            
         except Exception as e:
             print(f"Error getting dataset info: {e}")
             return None
     
+    def _with_prediction(self, dataset_info: Dict[str, Any],
+                         region_bounds: Dict[str, float]) -> Dict[str, Any]:
+        prediction = self.predict_duration([region_bounds],
+                                           num_bands=dataset_info['num_bands'])
+        return dict(
+            dataset_info,
+            estimated_seconds=float(prediction['seconds'][0]),
+            estimated_seconds_range=(float(prediction['seconds_low'][0]),
+                                     float(prediction['seconds_high'][0])),
+            estimated_pixels_per_second=float(prediction['pixels_per_second'][0]),
+            prediction_samples=self.predictor.samples
+        )
+    
+    def predict_duration(self, bounds_list: List[Dict[str, float]],
+                         year: Optional[int] = None,
+                         num_bands: int = DEFAULT_NUM_BANDS) -> Dict[str, Any]:
+        """
+        Predict how long exports of many regions will take, offline.
+        
+        Tasks completed since the last call are taken from the downloader's
+        metrics collector, if any, before predicting.
+        
+        Args:
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings (the downloader's year if None)
+            num_bands: Number of bands exported
+            
+        Returns:
+            Dictionary with 'seconds', 'seconds_low', 'seconds_high',
+            'running_seconds' and 'pixels_per_second' NumPy arrays aligned
+            with ``bounds_list`` (see DurationPredictor.predict)
+        """
+        if self.metrics is not None:
+            self.predictor.add_records(self.metrics.records('COMPLETED'))
+        estimate = self.estimate_size(bounds_list)
+        return self.predictor.predict(estimate['estimated_pixels'], self.scale,
+                                      year or self.year, num_bands=num_bands)
+    
+    def estimate_size(self, bounds_list: List[Dict[str, float]]) -> Dict[str, Any]:
+        """
+        Estimate area, pixel count and export size for many regions offline.
+        
+        Args:
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            
+        Returns:
+            Dictionary with 'area_km2', 'estimated_pixels' and 'estimated_size_mb'
+            NumPy arrays aligned with ``bounds_list``
+        """
+        return estimate_export(bounds_list, self.scale,
+                               bytes_per_value=bytes_per_value(self.precision))
+    
+    def plan(self, region_bounds: Dict[str, float], year: Optional[int] = None) -> QueryPlan:
+        """
+        Get the cached Earth Engine query objects for a region.
+        
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings (the downloader's year if None)
+            
+        Returns:
+            QueryPlan with the region geometry, filtered collection and mosaic
+        """
+        return self.planner.plan(region_bounds, year or self.year, self.DATASET_ID)
+    
+    def plans(self, bounds_list: List[Dict[str, float]],
+              year: Optional[int] = None) -> List[QueryPlan]:
+        """
+        Get query plans for many regions or tiles in one pass.
+        
+        Args:
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings (the downloader's year if None)
+            
+        Returns:
+            List of QueryPlan objects aligned with ``bounds_list``
+        """
+        return self.planner.plans(bounds_list, year or self.year, self.DATASET_ID)
+    
+    def _track(self, task: Any, description: str, region_bounds: Dict[str, float],
+               year: int, scale: int) -> None:
+        """Record a started export in the metrics collector, if any."""
+        if self.metrics is None:
+            return
+        estimate = estimate_export([region_bounds], scale,
+                                   bytes_per_value=bytes_per_value(self.precision))
+        self.metrics.track(
+            task.id, description,
+            pixels=float(estimate['estimated_pixels'][0]),
+            estimated_bytes=float(estimate['estimated_size_mb'][0]) * 1e6,
+            region=region_bounds.get('name'), year=year, scale=scale
+        )
+    
     def download_to_drive(self, region_bounds: Dict[str, float], 
                          description: str = None,
-                         folder: str = 'EarthEngine_Exports') -> Optional[ee.batch.Task]:
+                         folder: str = 'EarthEngine_Exports',
+                         year: Optional[int] = None,
+                         aligned: bool = False,
+                         scale: Optional[int] = None) -> Optional[ee.batch.Task]:
         """
         Download satellite embeddings to Google Drive.
         
@@ -114,44 +293,28 @@ class SatelliteEmbeddingsDownloader:
             region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
             description: Task description (auto-generated if None)
             folder: Google Drive folder name
+            year: Year of the embeddings (the downloader's year if None)
+            aligned: Export on the global EPSG:4326 pixel lattice, so exports of
+                other years or neighbouring tiles share pixel boundaries
+            scale: Resolution in meters per pixel (the downloader's scale if None)
             
         Returns:
             Earth Engine task object or None if error
         """
         if not self._initialized:
             raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
-            
+        
+        year = year or self.year
+        scale = scale or self.scale
         if description is None:
-            description = f'satellite_embeddings_{self.year}'
+            description = f'satellite_embeddings_{year}'
             
         try:
-            geometry = ee.Geometry.Rectangle([
-                region_bounds['west'], region_bounds['south'],
-                region_bounds['east'], region_bounds['north']
-            ])
-            
-            embeddings = ee.ImageCollection(self.DATASET_ID)
-            start_date = ee.Date.fromYMD(self.year, 1, 1)
-            end_date = start_date.advance(1, 'year')
-            
-            filtered_embeddings = embeddings.filter(
-                ee.Filter.date(start_date, end_date)
-            ).filter(ee.Filter.bounds(geometry))
-            
-            embeddings_image = filtered_embeddings.mosaic().clip(geometry)
-            
-            task = ee.batch.Export.image.toDrive(
-                image=embeddings_image,
-                description=description,
-                folder=folder,
-                fileNamePrefix=description,
-                scale=self.scale,
-                region=geometry,
-                maxPixels=1e13,
-                fileFormat='GeoTIFF'
+            task = self.backend.start_export(
+                self.DATASET_ID, region_bounds, year, scale, self.precision,
+                description, destination='drive', folder=folder, aligned=aligned
             )
-            
-            task.start()
+            self._track(task, description, region_bounds, year, scale)
             return task
             
         except Exception as e:
@@ -160,7 +323,10 @@ class SatelliteEmbeddingsDownloader:
     
     def download_to_asset(self, region_bounds: Dict[str, float],
                          asset_id: str,
-                         description: str = None) -> Optional[ee.batch.Task]:
+                         description: str = None,
+                         year: Optional[int] = None,
+                         aligned: bool = False,
+                         scale: Optional[int] = None) -> Optional[ee.batch.Task]:
         """
         Download satellite embeddings to Earth Engine Asset.
         
@@ -168,47 +334,499 @@ class SatelliteEmbeddingsDownloader:
             region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
             asset_id: Full asset ID path
             description: Task description (auto-generated if None)
+            year: Year of the embeddings (the downloader's year if None)
+            aligned: Export on the global EPSG:4326 pixel lattice, so exports of
+                other years or neighbouring tiles share pixel boundaries
+            scale: Resolution in meters per pixel (the downloader's scale if None)
             
         Returns:
             Earth Engine task object or None if error
         """
         if not self._initialized:
             raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+        
+        year = year or self.year
+        scale = scale or self.scale
+        if description is None:
+            description = f'satellite_embeddings_asset_{year}'
+            
+        try:
+            task = self.backend.start_export(
+                self.DATASET_ID, region_bounds, year, scale, self.precision,
+                description, destination='asset', asset_id=asset_id, aligned=aligned
+            )
+            self._track(task, description, region_bounds, year, scale)
+            return task
             
+        except Exception as e:
+            print(f"Error starting asset export: {e}")
+            return None
+
+    def download_tiles_to_drive(self, region_bounds: Dict[str, float],
+                                tile_size_km: float = DEFAULT_TILE_SIZE_KM,
+                                description: str = None,
+                                folder: str = 'EarthEngine_Exports') -> ExportTileSet:
+        """
+        Download satellite embeddings to Google Drive as a grid of tile exports.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            tile_size_km: Target tile edge length in kilometers
+            description: Prefix for task descriptions (auto-generated if None)
+            folder: Google Drive folder name
+
+        Returns:
+            ExportTileSet with one task per tile
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+
+        if description is None:
+            description = f'satellite_embeddings_{self.year}'
+
+        def submit(tile: Dict[str, Any]) -> Optional[ee.batch.Task]:
+            return self.download_to_drive(
+                tile,
+                description=f"{description}_{tile['tile_id']}",
+                folder=folder
+            )
+
+        tiles = prune_tiles(region_bounds, split_bounds(region_bounds, tile_size_km))
+        self.backend.prepare_exports(self.DATASET_ID, tiles, self.year)
+        tile_set = ExportTileSet(region_bounds, tiles, submit, task_index=self.backend.task_index)
+        tile_set.submit_all()
+        return tile_set
+
+    def download_tiles_to_asset(self, region_bounds: Dict[str, float],
+                                asset_folder: str,
+                                tile_size_km: float = DEFAULT_TILE_SIZE_KM,
+                                description: str = None) -> ExportTileSet:
+        """
+        Download satellite embeddings to Earth Engine Assets as a grid of tile exports.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            asset_folder: Asset folder path; each tile is written as <asset_folder>/<tile_id>
+            tile_size_km: Target tile edge length in kilometers
+            description: Prefix for task descriptions (auto-generated if None)
+
+        Returns:
+            ExportTileSet with one task per tile
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+
         if description is None:
             description = f'satellite_embeddings_asset_{self.year}'
+
+        def submit(tile: Dict[str, Any]) -> Optional[ee.batch.Task]:
+            return self.download_to_asset(
+                tile,
+                asset_id=f"{asset_folder.rstrip('/')}/{tile['tile_id']}",
+                description=f"{description}_{tile['tile_id']}"
+            )
+
+        tiles = prune_tiles(region_bounds, split_bounds(region_bounds, tile_size_km))
+        self.backend.prepare_exports(self.DATASET_ID, tiles, self.year)
+        tile_set = ExportTileSet(region_bounds, tiles, submit, task_index=self.backend.task_index)
+        tile_set.submit_all()
+        return tile_set
+
+    def plan_for_budget(self, region_bounds: Dict[str, float],
+                        max_size_mb: Optional[float] = None,
+                        max_pixels: Optional[float] = None,
+                        deadline_seconds: Optional[float] = None,
+                        **options: Any) -> Dict[str, Any]:
+        """
+        Choose the finest scale, and tiling, that fits a size, pixel or time budget.
+
+        Nothing is submitted; pass the plan to download_plan_to_drive() or
+        download_plan_to_asset() to start it. Runtime predictions use the
+        downloader's predictor, updated from its metrics collector.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            max_size_mb: Maximum estimated size in megabytes
+            max_pixels: Maximum estimated number of pixels
+            deadline_seconds: Maximum predicted time until every export finished
+            **options: Further arguments of budget.plan_for_budget(), e.g.
+                scales, tile_sizes_km or max_concurrent
+
+        Returns:
+            Plan dictionary as returned by budget.plan_for_budget()
+        """
+        if self.metrics is not None:
+            self.predictor.add_records(self.metrics.records('COMPLETED'))
+        options.setdefault('predictor', self.predictor)
+        return _plan_for_budget(
+            [region_bounds], max_size_mb=max_size_mb, max_pixels=max_pixels,
+            deadline_seconds=deadline_seconds, year=self.year,
+            bytes_per_value=bytes_per_value(self.precision), **options
+        )
+
+    def download_plan_to_drive(self, plan: Dict[str, Any], description: str = None,
+                               folder: str = 'EarthEngine_Exports') -> ExportTileSet:
+        """
+        Start the exports of a plan from plan_for_budget() on Google Drive.
+
+        Args:
+            plan: Plan dictionary with 'scale' and 'tiles' keys
+            description: Prefix for task descriptions (auto-generated if None)
+            folder: Google Drive folder name
+
+        Returns:
+            ExportTileSet with one task per tile
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+
+        if description is None:
+            description = f"satellite_embeddings_{self.year}_{plan['scale']}m"
+
+        def submit(tile: Dict[str, Any]) -> Optional[ee.batch.Task]:
+            suffix = f"_{tile['tile_id']}" if tile['tile_id'] else ''
+            return self.download_to_drive(tile, description=f"{description}{suffix}",
+                                          folder=folder, scale=plan['scale'])
+
+        return self._submit_plan(plan, submit)
+
+    def download_plan_to_asset(self, plan: Dict[str, Any], asset_folder: str,
+                               description: str = None) -> ExportTileSet:
+        """
+        Start the exports of a plan from plan_for_budget() as Earth Engine Assets.
+
+        Args:
+            plan: Plan dictionary with 'scale' and 'tiles' keys
+            asset_folder: Asset folder path; each tile is written as
+                <asset_folder>/<tile_id> (<asset_folder>/full for a whole region)
+            description: Prefix for task descriptions (auto-generated if None)
+
+        Returns:
+            ExportTileSet with one task per tile
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+
+        if description is None:
+            description = f"satellite_embeddings_asset_{self.year}_{plan['scale']}m"
+
+        def submit(tile: Dict[str, Any]) -> Optional[ee.batch.Task]:
+            suffix = f"_{tile['tile_id']}" if tile['tile_id'] else ''
+            return self.download_to_asset(
+                tile,
+                asset_id=f"{asset_folder.rstrip('/')}/{tile['tile_id'] or 'full'}",
+                description=f"{description}{suffix}",
+                scale=plan['scale']
+            )
+
+        return self._submit_plan(plan, submit)
+
+    def _submit_plan(self, plan: Dict[str, Any],
+                     submit: Callable[[Dict[str, Any]], Any]) -> ExportTileSet:
+        tiles = plan['tiles']
+        region_bounds = {
+            'west': min(tile['west'] for tile in tiles),
+            'east': max(tile['east'] for tile in tiles),
+            'south': min(tile['south'] for tile in tiles),
+            'north': max(tile['north'] for tile in tiles)
+        }
+        self.backend.prepare_exports(self.DATASET_ID, tiles, self.year)
+        tile_set = ExportTileSet(region_bounds, tiles, submit, task_index=self.backend.task_index)
+        tile_set.submit_all()
+        return tile_set
+
+    def _year_tiles(self, region_bounds: Dict[str, float], years: Iterable[int],
+                    tile_size_km: float) -> Tuple[List[int], List[Dict[str, Any]]]:
+        years = sorted(set(years))
+        if not years:
+            raise ValueError("At least one year is required")
+        # One tiling, snapped to the pixel lattice, shared by every year
+        tiles = snap_tiles(split_bounds(region_bounds, tile_size_km),
+                           self.scale / METERS_PER_DEGREE)
+        tiles = prune_tiles(region_bounds, tiles)
+        for year in years:
+            self.backend.prepare_exports(self.DATASET_ID, tiles, year)
+        return years, tiles
+    
+    def download_years_to_drive(self, region_bounds: Dict[str, float],
+                                years: Iterable[int],
+                                tile_size_km: float = DEFAULT_TILE_SIZE_KM,
+                                description: str = 'satellite_embeddings',
+                                folder: str = 'EarthEngine_Exports') -> Dict[int, ExportTileSet]:
+        """
+        Export the same tiles of a region for several years to Google Drive.
+        
+        The region is tiled once and every year is exported on the same
+        EPSG:4326 pixel lattice, so tile ``r000_c001`` of 2018 and of 2024
+        cover exactly the same pixels. Files are named
+        ``<description>_<year>_<tile_id>``.
+        
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            years: Years to export, e.g. range(2017, 2025)
+            tile_size_km: Target tile edge length in kilometers
+            description: Prefix for task descriptions and file names
+            folder: Google Drive folder name
+            
+        Returns:
+            Dictionary mapping year to its ExportTileSet
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+        
+        years, tiles = self._year_tiles(region_bounds, years, tile_size_km)
+        tile_sets = {}
+        for year in years:
+            def submit(tile: Dict[str, Any], year: int = year) -> Optional[ee.batch.Task]:
+                return self.download_to_drive(
+                    tile,
+                    description=f"{description}_{year}_{tile['tile_id']}",
+                    folder=folder,
+                    year=year,
+                    aligned=True
+                )
+            
+            tile_sets[year] = ExportTileSet(region_bounds, tiles, submit,
+                                            task_index=self.backend.task_index)
+            tile_sets[year].submit_all()
+        return tile_sets
+    
+    def download_years_to_asset(self, region_bounds: Dict[str, float],
+                                years: Iterable[int],
+                                asset_folder: str,
+                                tile_size_km: float = DEFAULT_TILE_SIZE_KM,
+                                description: str = 'satellite_embeddings') -> Dict[int, ExportTileSet]:
+        """
+        Export the same tiles of a region for several years to Earth Engine Assets.
+        
+        Tiles and pixel grid are shared across years as in
+        download_years_to_drive(). Assets are written as
+        ``<asset_folder>/<tile_id>_<year>``.
+        
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            years: Years to export, e.g. range(2017, 2025)
+            asset_folder: Asset folder path
+            tile_size_km: Target tile edge length in kilometers
+            description: Prefix for task descriptions
+            
+        Returns:
+            Dictionary mapping year to its ExportTileSet
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+        
+        years, tiles = self._year_tiles(region_bounds, years, tile_size_km)
+        tile_sets = {}
+        for year in years:
+            def submit(tile: Dict[str, Any], year: int = year) -> Optional[ee.batch.Task]:
+                return self.download_to_asset(
+                    tile,
+                    asset_id=f"{asset_folder.rstrip('/')}/{tile['tile_id']}_{year}",
+                    description=f"{description}_{year}_{tile['tile_id']}",
+                    year=year,
+                    aligned=True
+                )
+            
+            tile_sets[year] = ExportTileSet(region_bounds, tiles, submit,
+                                            task_index=self.backend.task_index)
+            tile_sets[year].submit_all()
+        return tile_sets
+    
+    def download_to_local(self, region_bounds: Dict[str, float], output_path: str,
+                          bands: Optional[List[str]] = None,
+                          block_size: int = DEFAULT_BLOCK_SIZE,
+                          workers: int = DEFAULT_WORKERS,
+                          endpoint: Any = None,
+                          verbose: bool = True) -> Optional[np.memmap]:
+        """
+        Download satellite embeddings straight to a memory-mapped array on local disk.
+        
+        Pixel blocks are fetched concurrently through Earth Engine's pixel
+        endpoint, so no batch export or Google Drive round-trip is needed.
+        Suited to regions of up to a few hundred km² at full resolution.
+        
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            output_path: Path of the ``.npy`` file to create
+            bands: Band names to fetch (all 64 bands if None)
+            block_size: Block edge length in pixels
+            workers: Number of blocks fetched concurrently
+            endpoint: Pixel endpoint to use (the backend's endpoint if None)
+            verbose: Whether to print progress updates
+            
+        Returns:
+            Memory-mapped array of shape (height, width, bands) or None if error
+        """
+        if endpoint is None:
+            if not self._initialized:
+                raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+            endpoint = self.backend.pixel_endpoint(self.DATASET_ID)
             
         try:
-            geometry = ee.Geometry.Rectangle([
-                region_bounds['west'], region_bounds['south'],
-                region_bounds['east'], region_bounds['north']
-            ])
-            
-            embeddings = ee.ImageCollection(self.DATASET_ID)
-            start_date = ee.Date.fromYMD(self.year, 1, 1)
-            end_date = start_date.advance(1, 'year')
-            
-            filtered_embeddings = embeddings.filter(
-                ee.Filter.date(start_date, end_date)
-            ).filter(ee.Filter.bounds(geometry))
-            
-            embeddings_image = filtered_embeddings.mosaic().clip(geometry)
-            
-            task = ee.batch.Export.image.toAsset(
-                image=embeddings_image,
-                description=description,
-                assetId=asset_id,
-                scale=self.scale,
-                region=geometry,
-                maxPixels=1e13
+            streamer = PixelStreamer(endpoint, block_size=block_size, workers=workers)
+            return streamer.download(
+                region_bounds, output_path, self.year, self.scale,
+                bands=bands, verbose=verbose
             )
             
-            task.start()
-            return task
+        except Exception as e:
+            print(f"Error downloading pixels: {e}")
+            return None
+    
+    @staticmethod
+    def _region_items(regions: Union[Dict[str, Any], List[Dict[str, float]]]) -> List[Any]:
+        """Normalize one bounds dict, a mapping of id to bounds or a list of bounds to (id, bounds) pairs."""
+        if isinstance(regions, dict) and 'west' in regions:
+            return [(regions.get('name', '0'), regions)]
+        if isinstance(regions, dict):
+            return list(regions.items())
+        return [(bounds.get('name', str(i)), bounds) for i, bounds in enumerate(regions)]
+    
+    def get_zonal_statistics(self, regions: Union[Dict[str, Dict[str, float]], List[Dict[str, float]]],
+                             percentiles: Optional[Sequence[int]] = None,
+                             include_mean: bool = True,
+                             scale: Optional[float] = None,
+                             batch_size: int = ZONAL_BATCH_SIZE,
+                             tile_scale: int = 1) -> Optional[List[Dict[str, Any]]]:
+        """
+        Compute per-region embedding statistics on the Earth Engine servers.
+        
+        Instead of exporting rasters, the embeddings are reduced inside each
+        region and only one row per region is transferred.
+        
+        Args:
+            regions: Mapping of region id to bounds (e.g. RegionConfig.CITIES)
+                or a list of bounds dictionaries (ids taken from 'name' or position)
+            percentiles: Percentiles to compute per band, e.g. [10, 50, 90]
+            include_mean: Whether to compute the per-band mean
+            scale: Resolution in meters per pixel for the reduction (downloader scale if None)
+            batch_size: Regions reduced per request
+            tile_scale: Earth Engine tileScale; raise it if reductions run out of memory
+            
+        Returns:
+            List of row dictionaries with a 'region' key and one column per
+            band and statistic (band name alone when only the mean is computed,
+            otherwise '<band>_mean' and '<band>_p<N>'), or None if error
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+        
+        items = self._region_items(regions)
+        if not include_mean and not percentiles:
+            raise ValueError("At least one statistic is required")
+        
+        try:
+            rows = []
+            for offset in range(0, len(items), batch_size):
+                batch = items[offset:offset + batch_size]
+                reduced = self.backend.reduce_regions(
+                    self.DATASET_ID, [bounds for _, bounds in batch], self.year,
+                    scale or self.scale, include_mean=include_mean,
+                    percentiles=percentiles, tile_scale=tile_scale
+                )
+                rows.extend({'region': region_id, **statistics}
+                            for (region_id, _), statistics in zip(batch, reduced))
+            
+            return rows
             
         except Exception as e:
-            print(f"Error starting asset export: {e}")
+            print(f"Error computing zonal statistics: {e}")
+            return None
+    
+    def sample_points(self, regions: Union[Dict[str, Any], List[Dict[str, float]]],
+                      output_path: str,
+                      points_per_stratum: int = 1000,
+                      tile_size_km: Optional[float] = None,
+                      workers: int = DEFAULT_WORKERS,
+                      seed: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Draw stratified random points from the embeddings and write them to a table.
+        
+        Every region, or every tile of every region when ``tile_size_km`` is
+        given, is one stratum with its own random sample, so points are spread
+        evenly instead of clustering in large homogeneous areas. Strata are
+        sampled concurrently. Earth Engine only draws approximately the number
+        of pixels asked for and drops masked ones, so each stratum is
+        oversampled and cut to ``points_per_stratum``; strata that are mostly
+        masked or smaller than the requested sample can still come back short
+        and are listed in 'short_strata'.
+        
+        Args:
+            regions: One bounds dictionary, a mapping of region id to bounds,
+                or a list of bounds dictionaries
+            output_path: Destination file ending in .parquet, .feather or .csv
+            points_per_stratum: Points drawn per region or tile (at most 5000)
+            tile_size_km: Split regions into tiles of this size (no tiling if None)
+            workers: Number of strata sampled concurrently
+            seed: Random seed; each stratum uses seed + its position
+            
+        Returns:
+            Summary dictionary with 'path', 'num_rows', 'num_strata',
+            'failed_strata' and 'short_strata' (each with 'region', 'tile_id'
+            and, for short strata, 'num_points'), or None if error
+        """
+        if not self._initialized:
+            raise RuntimeError("Earth Engine not initialized. Call initialize() first.")
+        if points_per_stratum > MAX_POINTS_PER_REQUEST:
+            raise ValueError(f"points_per_stratum must be at most {MAX_POINTS_PER_REQUEST}")
+        
+        strata = []
+        for region_id, bounds in self._region_items(regions):
+            if tile_size_km:
+                tiles = prune_tiles(bounds, split_bounds(bounds, tile_size_km))
+            else:
+                tiles = [dict(bounds, tile_id='')]
+            strata.extend((region_id, tile) for tile in tiles)
+        
+        self.backend.prepare_exports(self.DATASET_ID, [tile for _, tile in strata], self.year)
+        
+        def sample(position: int) -> List[Dict[str, Any]]:
+            region_id, tile = strata[position]
+            features = self.backend.sample(
+                self.DATASET_ID, tile, self.year, self.scale,
+                num_pixels=points_per_stratum * self.SAMPLE_OVERSAMPLING,
+                limit=points_per_stratum,
+                seed=seed + position
+            )
+            return features_to_rows(features, region=region_id,
+                                    tile_id=tile['tile_id'], year=self.year)
+        
+        rows = []
+        failed = []
+        short = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(sample, position) for position in range(len(strata))]
+            for position, future in enumerate(futures):
+                try:
+                    stratum_rows = future.result()
+                except Exception as e:
+                    region_id, tile = strata[position]
+                    print(f"Error sampling {region_id} {tile['tile_id']}: {e}")
+                    failed.append(position)
+                    continue
+                rows.extend(stratum_rows)
+                if len(stratum_rows) < points_per_stratum:
+                    short.append((position, len(stratum_rows)))
+        
+        try:
+            write_table(rows, output_path)
+        except Exception as e:
+            print(f"Error writing sample table: {e}")
             return None
+        
+        return {
+            'path': output_path,
+            'num_rows': len(rows),
+            'num_strata': len(strata),
+            'failed_strata': [
+                {'region': strata[i][0], 'tile_id': strata[i][1]['tile_id']} for i in failed
+            ],
+            'short_strata': [
+                {'region': strata[i][0], 'tile_id': strata[i][1]['tile_id'], 'num_points': count}
+                for i, count in short
+            ]
+        }
     
     @staticmethod
     def monitor_task(task: ee.batch.Task, check_interval: int = 30) -> bool:
@@ -253,6 +871,22 @@ class SatelliteEmbeddingsDownloader:
             
         return False
     
+    @staticmethod
+    def monitor_tasks(tasks: Iterable[ee.batch.Task], timeout: Optional[float] = None,
+                      verbose: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Monitor many Earth Engine tasks concurrently until they finish.
+        
+        Args:
+            tasks: Earth Engine task objects (or task ids)
+            timeout: Maximum seconds to wait (None waits forever)
+            verbose: Whether to print state changes
+            
+        Returns:
+            Dictionary mapping task id to final status for the tasks that finished
+        """
+        return _monitor_tasks(tasks, timeout=timeout, verbose=verbose)
+    
     @staticmethod
     def list_tasks(limit: int = 10) -> None:
         """
@@ -262,17 +896,17 @@ class SatelliteEmbeddingsDownloader:
             limit: Maximum number of tasks to show
         """
         try:
-            tasks = ee.batch.Task.list()[:limit]
+            # One task list request instead of a status request per task
+            statuses = get_backend().get_task_list()[:limit]
             
-            if not tasks:
+            if not statuses:
                 print("No tasks found")
                 return
                 
-            print(f"Recent tasks ({len(tasks)}):")
-            for task in tasks:
-                status = task.status()
+            print(f"Recent tasks ({len(statuses)}):")
+            for status in statuses:
                 state = status['state']
-                description = task.config.get('description', 'No description')
+                description = status.get('description', 'No description')
                 print(f"- {description}: {state}")
                 
         except Exception as e:
@@ -0,0 +1,202 @@
+"""
+Offline area, pixel count and size estimates for export planning.
+
+All functions work on the WGS84 ellipsoid without contacting Earth Engine and
+accept NumPy arrays, so thousands of candidate tiles can be estimated at once.
+"""
+
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+
+WGS84_A = 6378137.0  # semi-major axis in meters
+WGS84_F = 1 / 298.257223563  # flattening
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)  # first eccentricity squared
+WGS84_E = np.sqrt(WGS84_E2)
+
+GAUSS_NODES = 5  # quadrature points per polygon edge in ring_area_km2()
+
+DEFAULT_NUM_BANDS = 64
+DEFAULT_BYTES_PER_VALUE = 4  # float32
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _authalic_integral(lat_deg: ArrayLike) -> np.ndarray:
+    """Ellipsoid area between the equator and a latitude, per radian of longitude (m²)."""
+    sin_lat = np.sin(np.radians(lat_deg))
+    e_sin = WGS84_E * sin_lat
+    return (WGS84_B ** 2 / 2) * (
+        sin_lat / (1 - WGS84_E2 * sin_lat ** 2)
+        + np.log((1 + e_sin) / (1 - e_sin)) / (2 * WGS84_E)
+    )
+
+
+def _width_rad(west: ArrayLike, east: ArrayLike) -> np.ndarray:
+    """Longitude span in radians; a west edge east of the east edge crosses the antimeridian."""
+    width = np.asarray(east, dtype=float) - np.asarray(west, dtype=float)
+    return np.radians(np.where(width < 0, width + 360, width))
+
+
+def geodesic_area_km2(west: ArrayLike, east: ArrayLike,
+                      south: ArrayLike, north: ArrayLike) -> np.ndarray:
+    """
+    Compute the exact ellipsoidal area of latitude/longitude rectangles.
+
+    Rectangles whose west boundary is greater than their east boundary cross
+    the antimeridian.
+
+    Args:
+        west: Western longitude boundaries in degrees
+        east: Eastern longitude boundaries in degrees
+        south: Southern latitude boundaries in degrees
+        north: Northern latitude boundaries in degrees
+
+    Returns:
+        Array of areas in square kilometers
+    """
+    width_rad = _width_rad(west, east)
+    band_area = _authalic_integral(north) - _authalic_integral(south)
+    return np.abs(width_rad * band_area) / 1e6
+
+
+def ring_area_km2(lon: ArrayLike, lat: ArrayLike) -> float:
+    """
+    Compute the ellipsoidal area enclosed by a ring whose edges are straight
+    lines in lon/lat (as in planar Earth Engine geometries).
+
+    By Green's theorem the area is the sum over edges of the integral of the
+    authalic integral over longitude. Along an edge latitude is linear in
+    longitude, so each edge is integrated with Gauss-Legendre quadrature;
+    edges along parallels and meridians, and so rectangles, are exact.
+
+    Args:
+        lon: Longitudes of the closed ring in degrees
+        lat: Latitudes of the closed ring in degrees
+
+    Returns:
+        Area in square kilometers
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    nodes, weights = np.polynomial.legendre.leggauss(GAUSS_NODES)
+    # Edge latitudes at the quadrature nodes, mapped from [-1, 1] to each edge
+    lat_nodes = (lat[:-1, None] + lat[1:, None]) / 2 + np.diff(lat)[:, None] / 2 * nodes
+    mean_integral = _authalic_integral(lat_nodes) @ weights / 2
+    return float(abs(np.sum(np.radians(np.diff(lon)) * mean_integral)) / 1e6)
+
+
+def geodesic_extent_km(west: ArrayLike, east: ArrayLike,
+                       south: ArrayLike, north: ArrayLike) -> Dict[str, np.ndarray]:
+    """
+    Compute the east-west and north-south extent of rectangles.
+
+    The width is measured along the parallel through the rectangle center and
+    the height along the meridian, both on the WGS84 ellipsoid. Rectangles
+    whose west boundary is greater than their east boundary cross the
+    antimeridian.
+
+    Args:
+        west: Western longitude boundaries in degrees
+        east: Eastern longitude boundaries in degrees
+        south: Southern latitude boundaries in degrees
+        north: Northern latitude boundaries in degrees
+
+    Returns:
+        Dictionary with 'width_km' and 'height_km' arrays
+    """
+    south = np.asarray(south, dtype=float)
+    north = np.asarray(north, dtype=float)
+    center_lat = np.radians((south + north) / 2)
+    sin2 = np.sin(center_lat) ** 2
+
+    # Radii of curvature in the prime vertical and in the meridian
+    prime_vertical = WGS84_A / np.sqrt(1 - WGS84_E2 * sin2)
+    meridional = WGS84_A * (1 - WGS84_E2) / (1 - WGS84_E2 * sin2) ** 1.5
+
+    width_rad = _width_rad(west, east)
+    height_rad = np.radians(north - south)
+    return {
+        'width_km': prime_vertical * np.cos(center_lat) * width_rad / 1e3,
+        'height_km': meridional * height_rad / 1e3
+    }
+
+
+def bounds_to_arrays(bounds_list: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of bounds dictionaries into coordinate arrays.
+
+    Args:
+        bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+
+    Returns:
+        Dictionary with one array per coordinate key
+    """
+    return {
+        key: np.fromiter((bounds[key] for bounds in bounds_list), dtype=float, count=len(bounds_list))
+        for key in ('west', 'east', 'south', 'north')
+    }
+
+
+def estimate_pixels(area_km2: ArrayLike, scale: ArrayLike) -> np.ndarray:
+    """
+    Estimate the number of pixels covering an area.
+
+    Args:
+        area_km2: Areas in square kilometers
+        scale: Resolution in meters per pixel
+
+    Returns:
+        Array of pixel counts (as floats)
+    """
+    scale = np.asarray(scale, dtype=float)
+    return np.asarray(area_km2, dtype=float) * 1e6 / (scale * scale)
+
+
+def estimate_size_mb(num_pixels: ArrayLike, num_bands: int = DEFAULT_NUM_BANDS,
+                     bytes_per_value: float = DEFAULT_BYTES_PER_VALUE) -> np.ndarray:
+    """
+    Estimate the uncompressed size of an export.
+
+    Args:
+        num_pixels: Pixel counts
+        num_bands: Number of bands per pixel
+        bytes_per_value: Bytes per band value
+
+    Returns:
+        Array of sizes in megabytes
+    """
+    return np.asarray(num_pixels, dtype=float) * num_bands * bytes_per_value / 1e6
+
+
+def estimate_export(bounds_list: List[Dict[str, float]], scale: float,
+                    num_bands: int = DEFAULT_NUM_BANDS,
+                    bytes_per_value: float = DEFAULT_BYTES_PER_VALUE) -> Dict[str, np.ndarray]:
+    """
+    Estimate area, pixel count and size for many regions at once.
+
+    Args:
+        bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys; those
+            carrying a 'polygon' use the polygon's area
+        scale: Resolution in meters per pixel
+        num_bands: Number of bands per pixel
+        bytes_per_value: Bytes per band value
+
+    Returns:
+        Dictionary with 'area_km2', 'estimated_pixels' and 'estimated_size_mb'
+        arrays, aligned with ``bounds_list``
+    """
+    coords = bounds_to_arrays(bounds_list)
+    area_km2 = geodesic_area_km2(coords['west'], coords['east'], coords['south'], coords['north'])
+    # Polygon regions only export the pixels inside the polygon
+    for i, bounds in enumerate(bounds_list):
+        if bounds.get('polygon') is not None:
+            area_km2[i] = min(area_km2[i], bounds['polygon'].area_km2())
+    num_pixels = estimate_pixels(area_km2, scale)
+    return {
+        'area_km2': area_km2,
+        'estimated_pixels': num_pixels,
+        'estimated_size_mb': estimate_size_mb(num_pixels, num_bands, bytes_per_value)
+    }
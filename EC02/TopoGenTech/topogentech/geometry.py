@@ -0,0 +1,430 @@
+"""
+Polygon regions loaded from GeoJSON.
+
+A PolygonRegion holds one or more polygons (exterior ring plus holes) as
+NumPy coordinate arrays. It can be simplified with Douglas-Peucker before it
+is sent to Earth Engine, clipped to tiles, and used to skip tiles that fall
+entirely outside the shape, such as the ocean inside Chile's bounding box.
+Everything here is plain NumPy; Earth Engine is only imported by to_ee().
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Any, Union
+
+import numpy as np
+
+from .estimator import ring_area_km2
+
+
+DEFAULT_TOLERANCE = 0.01  # degrees, about 1 km at the equator
+CONTAINS_BLOCK = 1 << 20  # point-edge pairs tested per step in contains()
+
+
+def _close_ring(ring: Any) -> np.ndarray:
+    ring = np.asarray(ring, dtype=float)[:, :2]
+    if len(ring) and not np.array_equal(ring[0], ring[-1]):
+        ring = np.vstack([ring, ring[:1]])
+    return ring
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distance from each point to the segment start-end."""
+    direction = end - start
+    length_sq = float(np.dot(direction, direction))
+    if length_sq == 0:
+        return np.hypot(*(points - start).T)
+    t = np.clip((points - start) @ direction / length_sq, 0.0, 1.0)
+    projection = start + t[:, None] * direction
+    return np.hypot(*(points - projection).T)
+
+
+def simplify_ring(ring: np.ndarray, tolerance: float) -> Optional[np.ndarray]:
+    """
+    Simplify a closed ring with the Douglas-Peucker algorithm.
+
+    Args:
+        ring: Closed ring of shape (n, 2) with lon/lat columns
+        tolerance: Maximum distance in degrees between the ring and its simplification
+
+    Returns:
+        Simplified closed ring, or None if it collapses to fewer than three points
+    """
+    if tolerance <= 0 or len(ring) <= 4:
+        return ring
+
+    # A closed ring starts and ends at the same point, so split it at the
+    # vertex farthest from the start and simplify the two halves
+    far = int(np.argmax(np.hypot(*(ring - ring[0]).T)))
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[[0, far, len(ring) - 1]] = True
+
+    stack = [(0, far), (far, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(ring[start + 1:end], ring[start], ring[end])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    simplified = ring[keep]
+    return simplified if len(simplified) >= 4 else None
+
+
+def _clip_ring_half(ring: np.ndarray, axis: int, value: float, keep_above: bool) -> np.ndarray:
+    """One Sutherland-Hodgman pass: keep the part of a closed ring on one side of a line."""
+    a, b = ring[:-1], ring[1:]
+    inside_a = a[:, axis] >= value if keep_above else a[:, axis] <= value
+    inside_b = b[:, axis] >= value if keep_above else b[:, axis] <= value
+
+    delta = b[:, axis] - a[:, axis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(delta != 0, (value - a[:, axis]) / delta, 0.0)
+    crossing = a + t[:, None] * (b - a)
+    crossing[:, axis] = value
+
+    # Per edge a->b emit the crossing point (if the edge crosses) and then b (if inside)
+    candidates = np.stack([crossing, b], axis=1)
+    emit = np.stack([inside_a != inside_b, inside_b], axis=1)
+    points = candidates[emit]
+    return _close_ring(points) if len(points) else points
+
+
+def clip_ring(ring: np.ndarray, bounds: Dict[str, float]) -> Optional[np.ndarray]:
+    """
+    Clip a closed ring to a bounding box.
+
+    Args:
+        ring: Closed ring of shape (n, 2)
+        bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+    Returns:
+        Clipped closed ring, or None if nothing is left (including rings that
+        only touch the box along an edge or at a corner)
+    """
+    for axis, value, keep_above in ((0, bounds['west'], True), (0, bounds['east'], False),
+                                    (1, bounds['south'], True), (1, bounds['north'], False)):
+        ring = _clip_ring_half(ring, axis, value, keep_above)
+        if len(ring) < 4:
+            return None
+    # Shoelace formula; a ring that only touches the box collapses to zero area
+    x, y = ring[:, 0], ring[:, 1]
+    if np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]) == 0:
+        return None
+    return ring
+
+
+def _parse_geometry(geometry: Dict[str, Any]) -> List[List[np.ndarray]]:
+    if geometry['type'] == 'Polygon':
+        return [[_close_ring(ring) for ring in geometry['coordinates']]]
+    if geometry['type'] == 'MultiPolygon':
+        return [[_close_ring(ring) for ring in polygon] for polygon in geometry['coordinates']]
+    if geometry['type'] == 'GeometryCollection':
+        return [p for child in geometry['geometries'] for p in _parse_geometry(child)]
+    raise ValueError(f"Unsupported geometry type: {geometry['type']}")
+
+
+class PolygonRegion:
+    """
+    Polygon or multipolygon region in EPSG:4326.
+    """
+
+    def __init__(self, polygons: List[List[np.ndarray]], name: str = 'Custom Region'):
+        """
+        Initialize the region.
+
+        Args:
+            polygons: List of polygons, each a list of closed rings (exterior
+                first, then holes) as arrays of shape (n, 2) with lon/lat columns
+            name: Region name
+        """
+        self.polygons = [[_close_ring(ring) for ring in polygon] for polygon in polygons if polygon]
+        if not self.polygons:
+            raise ValueError("A polygon region needs at least one polygon")
+        self.name = name
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_geojson(cls, source: Union[str, Dict[str, Any]], name: Optional[str] = None,
+                     tolerance: Optional[float] = None) -> 'PolygonRegion':
+        """
+        Load a region from GeoJSON.
+
+        Args:
+            source: Path to a GeoJSON file, or a parsed Feature, FeatureCollection
+                or Polygon/MultiPolygon geometry. All polygons are merged.
+            name: Region name (the first feature's 'name' property if None)
+            tolerance: Simplify with this tolerance in degrees (no simplification if None)
+
+        Returns:
+            The PolygonRegion
+        """
+        if isinstance(source, str):
+            with open(source, 'r', encoding='utf-8') as fh:
+                source = json.load(fh)
+
+        if source['type'] == 'FeatureCollection':
+            features = source['features']
+        elif source['type'] == 'Feature':
+            features = [source]
+        else:
+            features = [{'type': 'Feature', 'geometry': source, 'properties': {}}]
+
+        polygons = [p for feature in features for p in _parse_geometry(feature['geometry'])]
+        if name is None:
+            properties = (features[0].get('properties') or {}) if features else {}
+            name = properties.get('name', 'Custom Region')
+
+        region = cls(polygons, name=name)
+        return region.simplify(tolerance) if tolerance else region
+
+    @property
+    def num_vertices(self) -> int:
+        return sum(len(ring) for polygon in self.polygons for ring in polygon)
+
+    @property
+    def bounds(self) -> Dict[str, float]:
+        """Bounding box of the region."""
+        points = np.vstack([polygon[0] for polygon in self.polygons])
+        return {
+            'west': float(points[:, 0].min()),
+            'east': float(points[:, 0].max()),
+            'south': float(points[:, 1].min()),
+            'north': float(points[:, 1].max())
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash of the coordinates, used in cache keys."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for polygon in self.polygons:
+                for ring in polygon:
+                    digest.update(np.ascontiguousarray(ring).tobytes())
+                digest.update(b'|')
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def to_bounds(self) -> Dict[str, Any]:
+        """
+        Get a bounds dictionary that carries the polygon.
+
+        The result works anywhere a RegionConfig bounds dictionary does; the
+        export methods clip to the polygon and tiled exports skip tiles
+        outside it.
+
+        Returns:
+            Dictionary with 'west', 'east', 'south', 'north', 'name' and 'polygon' keys
+        """
+        return dict(self.bounds, name=self.name, polygon=self)
+
+    def simplify(self, tolerance: float = DEFAULT_TOLERANCE) -> 'PolygonRegion':
+        """
+        Simplify every ring with Douglas-Peucker.
+
+        Polygons whose exterior collapses (islands smaller than the tolerance)
+        and collapsed holes are dropped.
+
+        Args:
+            tolerance: Maximum deviation in degrees
+
+        Returns:
+            New, simplified PolygonRegion
+        """
+        polygons = []
+        for polygon in self.polygons:
+            exterior = simplify_ring(polygon[0], tolerance)
+            if exterior is None:
+                continue
+            holes = [simplify_ring(hole, tolerance) for hole in polygon[1:]]
+            polygons.append([exterior] + [hole for hole in holes if hole is not None])
+        if not polygons:
+            # Everything is smaller than the tolerance; keep the largest shape
+            polygons = [max(self.polygons, key=lambda polygon: len(polygon[0]))]
+        return PolygonRegion(polygons, name=self.name)
+
+    def area_km2(self) -> float:
+        """
+        Area on the WGS84 ellipsoid, for edges that are straight lines in
+        lon/lat (as in planar Earth Engine geometries).
+
+        Returns:
+            Area in square kilometers
+        """
+        total = 0.0
+        for polygon in self.polygons:
+            for i, ring in enumerate(polygon):
+                area = ring_area_km2(ring[:, 0], ring[:, 1])
+                total += area if i == 0 else -area
+        return float(total)
+
+    def contains(self, lon: Any, lat: Any) -> np.ndarray:
+        """
+        Test which points fall inside the region (even-odd rule).
+
+        Args:
+            lon: Longitudes (scalar or array)
+            lat: Latitudes (scalar or array)
+
+        Returns:
+            Boolean array with the broadcast shape of lon and lat
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+        inside = np.zeros(lon.shape, dtype=bool)
+        for polygon in self.polygons:
+            box = polygon[0]
+            candidates = ((lon >= box[:, 0].min()) & (lon <= box[:, 0].max())
+                          & (lat >= box[:, 1].min()) & (lat <= box[:, 1].max()))
+            if not candidates.any():
+                continue
+            px, py = lon[candidates], lat[candidates]
+            edges = np.vstack([np.hstack([ring[:-1], ring[1:]]) for ring in polygon])
+            edges = edges[edges[:, 1] != edges[:, 3]]
+            x1, y1, x2, y2 = (edges[:, i] for i in range(4))
+
+            # Count edge crossings of a ray to the east, a block of points at a time
+            crossings = np.zeros(px.shape, dtype=bool)
+            step = max(1, CONTAINS_BLOCK // max(len(edges), 1))
+            for start in range(0, len(px), step):
+                bx, by = px[start:start + step, None], py[start:start + step, None]
+                straddles = (y1 > by) != (y2 > by)
+                cross_x = (x2 - x1) * (by - y1) / (y2 - y1) + x1
+                crossings[start:start + step] = (
+                    np.count_nonzero(straddles & (bx < cross_x), axis=1) % 2 == 1
+                )
+            inside[candidates] |= crossings
+        return inside
+
+    def intersects_box(self, bounds: Dict[str, float]) -> bool:
+        """
+        Test whether the region overlaps a bounding box.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+        Returns:
+            True if any part of the region lies inside the box
+        """
+        west, east, south, north = bounds['west'], bounds['east'], bounds['south'], bounds['north']
+        corners_lon = np.array([west, east, east, west, (west + east) / 2])
+        corners_lat = np.array([south, south, north, north, (south + north) / 2])
+        if self.contains(corners_lon, corners_lat).any():
+            return True
+
+        for polygon in self.polygons:
+            exterior = polygon[0]
+            if (exterior[:, 0].max() < west or exterior[:, 0].min() > east
+                    or exterior[:, 1].max() < south or exterior[:, 1].min() > north):
+                continue
+            for ring in polygon:
+                # Liang-Barsky test of every edge against the box at once
+                x1, y1 = ring[:-1, 0], ring[:-1, 1]
+                dx, dy = np.diff(ring[:, 0]), np.diff(ring[:, 1])
+                t0 = np.zeros(len(dx))
+                t1 = np.ones(len(dx))
+                hit = np.ones(len(dx), dtype=bool)
+                for p, q in ((-dx, x1 - west), (dx, east - x1), (-dy, y1 - south), (dy, north - y1)):
+                    parallel = p == 0
+                    hit &= ~(parallel & (q < 0))
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        r = np.where(parallel, 0.0, q / np.where(parallel, 1.0, p))
+                    t0 = np.where(~parallel & (p < 0), np.maximum(t0, r), t0)
+                    t1 = np.where(~parallel & (p > 0), np.minimum(t1, r), t1)
+                if (hit & (t0 <= t1)).any():
+                    return True
+        return False
+
+    def clip(self, bounds: Dict[str, float]) -> Optional['PolygonRegion']:
+        """
+        Clip the region to a bounding box.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+        Returns:
+            Clipped PolygonRegion, or None if nothing is left
+        """
+        polygons = []
+        for polygon in self.polygons:
+            exterior = clip_ring(polygon[0], bounds)
+            if exterior is None:
+                continue
+            holes = [clip_ring(hole, bounds) for hole in polygon[1:]]
+            polygons.append([exterior] + [hole for hole in holes if hole is not None])
+        return PolygonRegion(polygons, name=self.name) if polygons else None
+
+    def to_geojson(self) -> Dict[str, Any]:
+        """
+        Convert the region to a GeoJSON MultiPolygon geometry.
+
+        Returns:
+            GeoJSON geometry dictionary
+        """
+        return {
+            'type': 'MultiPolygon',
+            'coordinates': [[ring.tolist() for ring in polygon] for polygon in self.polygons]
+        }
+
+    def to_ee(self) -> Any:
+        """
+        Convert the region to a planar Earth Engine MultiPolygon.
+
+        Returns:
+            ee.Geometry.MultiPolygon
+        """
+        import ee
+        return ee.Geometry.MultiPolygon(self.to_geojson()['coordinates'], geodesic=False)
+
+    def __repr__(self) -> str:
+        return (f"PolygonRegion({self.name!r}, polygons={len(self.polygons)}, "
+                f"vertices={self.num_vertices})")
+
+
+def prune_tiles(region_bounds: Dict[str, Any], tiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop tiles outside a polygon region and clip the polygon to the others.
+
+    Args:
+        region_bounds: Bounds dictionary; only used if it carries a 'polygon'
+        tiles: Tile dictionaries as returned by split_bounds()
+
+    Returns:
+        Tiles that overlap the polygon, each with a 'polygon' key holding the
+        clipped shape (the input tiles unchanged for rectangular regions)
+    """
+    polygon = region_bounds.get('polygon')
+    if polygon is None:
+        return tiles
+
+    # One vectorized test of the tile centres settles most interior tiles
+    centres_inside = polygon.contains(
+        [(tile['west'] + tile['east']) / 2 for tile in tiles],
+        [(tile['south'] + tile['north']) / 2 for tile in tiles]
+    )
+    kept = []
+    for tile, centre_inside in zip(tiles, centres_inside):
+        if not centre_inside and not polygon.intersects_box(tile):
+            continue
+        clipped = polygon.clip(tile)
+        if clipped is not None:
+            kept.append(dict(tile, polygon=clipped))
+    return kept
+
+
+def region_area_km2(region_bounds: Dict[str, Any]) -> Optional[float]:
+    """
+    Get the polygon area of a bounds dictionary.
+
+    Args:
+        region_bounds: Bounds dictionary, possibly carrying a 'polygon'
+
+    Returns:
+        Polygon area in km², or None for rectangular regions
+    """
+    polygon = region_bounds.get('polygon')
+    return polygon.area_km2() if polygon is not None else None
@@ -0,0 +1,109 @@
+"""
+Append-only journal of export jobs, used to resume a campaign after a crash.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Any
+
+
+class ExportManifest:
+    """
+    JSON Lines file recording every export job and its state transitions.
+
+    Each line is one event for one job, keyed by the job description. Lines
+    are only ever appended and flushed to disk immediately, so the file stays
+    readable after the process is killed; replaying it gives the last known
+    state and task ID of every job.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a manifest, creating it on first write.
+
+        Args:
+            path: Path of the ``.jsonl`` manifest file
+        """
+        self.path = path
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._partial_line = False
+        if os.path.exists(path):
+            self._replay()
+
+    def _replay(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                self._partial_line = not line.endswith('\n')
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; everything before it is valid
+                    continue
+                self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        job = self._jobs.setdefault(event['key'], {'key': event['key']})
+        job.update({key: value for key, value in event.items() if value is not None})
+
+    def record(self, key: str, state: str, task_id: Optional[str] = None,
+               **details: Any) -> None:
+        """
+        Append an event for a job.
+
+        Args:
+            key: Unique job key (the task description)
+            state: New job state
+            task_id: Earth Engine task ID, if the job has been submitted
+            **details: Extra fields to store, e.g. region, year, scale, tile_id
+        """
+        event = dict(details, key=key, state=state, task_id=task_id, time=time.time())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as fh:
+            if self._partial_line:
+                fh.write('\n')
+                self._partial_line = False
+            fh.write(json.dumps(event) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._apply(event)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last known state of a job.
+
+        Args:
+            key: Job key
+
+        Returns:
+            Dictionary with the merged fields of all the job's events, or None
+        """
+        return self._jobs.get(key)
+
+    def jobs(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List jobs recorded in the manifest.
+
+        Args:
+            state: Only return jobs whose last state is this one
+
+        Returns:
+            List of job dictionaries
+        """
+        return [job for job in self._jobs.values() if state is None or job['state'] == state]
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count jobs per last known state.
+
+        Returns:
+            Dictionary mapping state to number of jobs
+        """
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job['state']] = counts.get(job['state'], 0) + 1
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._jobs)
@@ -0,0 +1,393 @@
+"""
+Lifecycle metrics for export tasks.
+
+ExportMetrics follows every export from submission to its final state: time
+spent in READY (queued on Earth Engine), time in RUNNING, total time, pixel
+count, estimated bytes and failure reason. Durations come from the task
+timestamps reported by Earth Engine when available, otherwise from the time
+the state change was observed. Results are available as Prometheus text
+exposition format (for a node_exporter textfile collector or a push
+gateway) and as an append-only CSV or JSON Lines event log.
+
+Downloaders record submissions; ExportScheduler, AsyncTaskMonitor and
+TaskMonitor feed every status they poll into observe().
+"""
+
+import csv
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+
+FINAL_STATES = ('COMPLETED', 'FAILED', 'CANCELLED')
+DURATION_BUCKETS = (30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, 14400, 43200, 86400)  # seconds
+THROUGHPUT_BUCKETS = (1e3, 1e4, 1e5, 3e5, 1e6, 3e6, 1e7)  # pixels per second
+MAX_REASON_LENGTH = 80  # characters of an error message used as a label
+EVENT_FIELDS = (
+    'time', 'event', 'task_id', 'description', 'region', 'year', 'scale',
+    'ready_seconds', 'running_seconds', 'total_seconds', 'pixels',
+    'estimated_bytes', 'error_message'
+)
+
+
+def size_class(pixels: Optional[float]) -> str:
+    """
+    Bucket a pixel count by order of magnitude, for use as a metric label.
+
+    Args:
+        pixels: Number of pixels (None if unknown)
+
+    Returns:
+        Label such as '1e7' (10 to 100 million pixels) or 'unknown'
+    """
+    if not pixels or pixels <= 0:
+        return 'unknown'
+    return f"1e{int(math.floor(math.log10(pixels)))}"
+
+
+def failure_reason(message: Optional[str]) -> str:
+    """
+    Shorten an error message to a stable metric label.
+
+    Args:
+        message: Error message of a failed task
+
+    Returns:
+        First line of the message, at most MAX_REASON_LENGTH characters
+    """
+    if not message:
+        return 'unknown'
+    return message.strip().splitlines()[0][:MAX_REASON_LENGTH]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Histogram:
+    """Prometheus histogram with one series per label set."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.series: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+
+    def observe(self, value: float, labels: Tuple[Tuple[str, str], ...] = ()) -> None:
+        series = self.series.setdefault(
+            labels, {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        )
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series['counts'][i] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def lines(self, name: str) -> List[str]:
+        lines = []
+        for labels, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series['counts']):
+                bucket_labels = labels + (('le', _format_value(bound)),)
+                lines.append(f"{name}_bucket{_labels(bucket_labels)} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_format_value(series['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {series['count']}")
+        return lines
+
+
+class EventLog:
+    """
+    Append-only export event log in CSV or JSON Lines format.
+
+    The format follows the file extension: ``.csv`` writes a header and one
+    row per event, anything else writes one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open an event log, creating it on first write.
+
+        Args:
+            path: Path of the ``.csv`` or ``.jsonl`` file
+        """
+        self.path = path
+        self.format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        self._lock = threading.Lock()
+
+    def write(self, event: Dict[str, Any]) -> None:
+        """
+        Append one event.
+
+        Args:
+            event: Event dictionary; keys outside EVENT_FIELDS are dropped in CSV logs
+        """
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, 'a', encoding='utf-8', newline='') as fh:
+                if self.format == 'csv':
+                    writer = csv.DictWriter(fh, fieldnames=EVENT_FIELDS, extrasaction='ignore')
+                    if new_file:
+                        writer.writeheader()
+                    writer.writerow(event)
+                else:
+                    fh.write(json.dumps(event) + '\n')
+
+
+class ExportMetrics:
+    """
+    Thread-safe collector of export task lifecycle metrics.
+    """
+
+    def __init__(self, event_log: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize an empty collector.
+
+        Args:
+            event_log: Path of a ``.csv`` or ``.jsonl`` event log (no log if None)
+            clock: Function returning the current time in seconds, used when
+                a status carries no timestamps (e.g. FakeBackend.time)
+        """
+        self.event_log = EventLog(event_log) if event_log else None
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._totals: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        self._ready = _Histogram(DURATION_BUCKETS)
+        self._running = _Histogram(DURATION_BUCKETS)
+        self._total = _Histogram(DURATION_BUCKETS)
+        self._throughput = _Histogram(THROUGHPUT_BUCKETS)
+
+    def _count(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = ((('__name__', name),) + tuple(sorted(labels.items())))
+        self._totals[key] = self._totals.get(key, 0.0) + value
+
+    def _emit(self, event: str, record: Dict[str, Any], now: float) -> None:
+        if self.event_log is None:
+            return
+        entry = {field: record.get(field) for field in EVENT_FIELDS}
+        entry.update(time=now, event=event)
+        try:
+            self.event_log.write(entry)
+        except OSError as e:
+            print(f"Error writing metrics event log: {e}")
+
+    def track(self, task_id: str, description: Optional[str] = None,
+              pixels: Optional[float] = None, estimated_bytes: Optional[float] = None,
+              **details: Any) -> None:
+        """
+        Record a submitted task, or add details to one already tracked.
+
+        Args:
+            task_id: Task ID string
+            description: Task description
+            pixels: Estimated number of pixels exported
+            estimated_bytes: Estimated size of the export in bytes
+            **details: Extra fields, e.g. region, year, scale
+        """
+        now = self.clock()
+        fields = dict(details, description=description, pixels=pixels,
+                      estimated_bytes=estimated_bytes)
+        with self._lock:
+            record = self._tasks.get(task_id)
+            new = record is None
+            if new:
+                record = self._tasks[task_id] = {
+                    'task_id': task_id, 'state': None, 'submitted_at': now, 'seen': {}
+                }
+            record.update({key: value for key, value in fields.items() if value is not None})
+            if new:
+                self._count('topogentech_exports_submitted_total')
+                self._emit('SUBMITTED', record, now)
+
+    def submit_failed(self, description: str, error_message: str, **details: Any) -> None:
+        """
+        Record an export that could not be started.
+
+        Args:
+            description: Task description
+            error_message: Why the submission failed
+            **details: Extra fields, e.g. region, year, scale
+        """
+        with self._lock:
+            self._count('topogentech_export_submit_failures_total',
+                        reason=failure_reason(error_message))
+            self._emit('SUBMIT_FAILED', dict(details, description=description,
+                                             error_message=error_message), self.clock())
+
+    def observe(self, task_id: str, status: Dict[str, Any]) -> None:
+        """
+        Feed one polled task status; state changes are timed and logged.
+
+        Args:
+            task_id: Task ID string
+            status: Status dictionary as returned by Earth Engine
+        """
+        state = status.get('state')
+        if state is None:
+            return
+        now = self.clock()
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                record = self._tasks[task_id] = {
+                    'task_id': task_id, 'state': None, 'submitted_at': now, 'seen': {},
+                    'description': status.get('description')
+                }
+            if record['state'] == state or record['state'] in FINAL_STATES:
+                return
+            record['state'] = state
+            record['seen'].setdefault(state, now)
+
+            if state in FINAL_STATES:
+                self._finish(record, status, now)
+            self._emit(state, record, now)
+
+    def _finish(self, record: Dict[str, Any], status: Dict[str, Any], now: float) -> None:
+        # Prefer Earth Engine's own timestamps over the time we happened to poll
+        created = status.get('creation_timestamp_ms')
+        created = created / 1000 if created else record['submitted_at']
+        started = status.get('start_timestamp_ms')
+        started = started / 1000 if started else record['seen'].get('RUNNING')
+        ended = status.get('update_timestamp_ms')
+        ended = ended / 1000 if ended else now
+
+        state = record['state']
+        size = size_class(record.get('pixels'))
+        record['total_seconds'] = max(ended - created, 0.0)
+        if started is not None:
+            record['ready_seconds'] = max(started - created, 0.0)
+            record['running_seconds'] = max(ended - started, 0.0)
+        if state == 'FAILED':
+            record['error_message'] = status.get('error_message', 'Unknown error')
+
+        self._count('topogentech_exports_finished_total', state=state)
+        self._total.observe(record['total_seconds'], (('size', size), ('state', state)))
+        if 'ready_seconds' in record:
+            self._ready.observe(record['ready_seconds'], (('state', state),))
+            self._running.observe(record['running_seconds'], (('size', size), ('state', state)))
+
+        if state == 'COMPLETED':
+            if record.get('pixels'):
+                self._count('topogentech_exported_pixels_total', record['pixels'])
+                if record.get('running_seconds'):
+                    self._throughput.observe(record['pixels'] / record['running_seconds'],
+                                             (('size', size),))
+            if record.get('estimated_bytes'):
+                self._count('topogentech_exported_bytes_estimated_total',
+                            record['estimated_bytes'])
+        elif state == 'FAILED':
+            self._count('topogentech_export_failures_total',
+                        reason=failure_reason(record['error_message']))
+
+    def records(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the per-task records.
+
+        Args:
+            state: Only return tasks whose last observed state is this one
+
+        Returns:
+            List of task dictionaries with timings, sizes and error messages
+        """
+        with self._lock:
+            return [
+                {key: value for key, value in record.items() if key != 'seen'}
+                for record in self._tasks.values()
+                if state is None or record['state'] == state
+            ]
+
+    def in_flight(self) -> Dict[str, int]:
+        """
+        Count tracked tasks that have not finished, per last observed state.
+
+        Returns:
+            Dictionary mapping state ('SUBMITTED' before the first poll) to count
+        """
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for record in self._tasks.values():
+                if record['state'] not in FINAL_STATES:
+                    state = record['state'] or 'SUBMITTED'
+                    counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text ending with a newline
+        """
+        in_flight = self.in_flight()
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = {
+                'topogentech_exports_submitted_total': 'Export tasks submitted.',
+                'topogentech_exports_finished_total': 'Export tasks that reached a final state.',
+                'topogentech_export_failures_total': 'Failed export tasks by error message.',
+                'topogentech_export_submit_failures_total': 'Exports that could not be started.',
+                'topogentech_exported_pixels_total': 'Pixels in completed exports (estimated).',
+                'topogentech_exported_bytes_estimated_total': 'Estimated bytes of completed exports.'
+            }
+            for name, help_text in counters.items():
+                header(name, 'counter', help_text)
+                series = [(key[1:], value) for key, value in self._totals.items()
+                          if key[0][1] == name]
+                if not series:
+                    lines.append(f"{name} 0")
+                for labels, value in sorted(series):
+                    lines.append(f"{name}{_labels(labels)} {_format_value(value)}")
+
+            header('topogentech_exports_in_flight', 'gauge',
+                   'Tracked export tasks not yet finished, by state.')
+            for state in ('SUBMITTED', 'READY', 'RUNNING'):
+                labels = (('state', state),)
+                lines.append(f"topogentech_exports_in_flight{_labels(labels)} "
+                             f"{in_flight.get(state, 0)}")
+
+            histograms = (
+                ('topogentech_export_ready_seconds', self._ready,
+                 'Time export tasks waited in the Earth Engine queue (READY).'),
+                ('topogentech_export_running_seconds', self._running,
+                 'Time export tasks spent RUNNING.'),
+                ('topogentech_export_total_seconds', self._total,
+                 'Time from submission to a final state.'),
+                ('topogentech_export_pixels_per_second', self._throughput,
+                 'Pixel throughput of completed exports while running.')
+            )
+            for name, histogram, help_text in histograms:
+                header(name, 'histogram', help_text)
+                lines.extend(histogram.lines(name))
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the metrics to a file atomically, e.g. for a textfile collector.
+
+        Args:
+            path: Destination ``.prom`` file
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as fh:
+            fh.write(self.to_prometheus())
+        os.replace(temporary, path)
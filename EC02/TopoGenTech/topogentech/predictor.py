@@ -0,0 +1,293 @@
+"""
+Export duration prediction from historical task timings.
+
+DurationPredictor fits two small least-squares models: one for the time from
+submission to completion and one for the time spent RUNNING. Each models a
+duration as a fixed overhead plus a cost per pixel, where the cost per pixel
+varies with the scale, year and band count. Fits minimize the relative error
+(by iterative reweighting), so small and large exports weigh alike. Pixel
+throughput follows from the running-time model, and the spread of the
+residuals gives a 10th-90th percentile interval around every prediction.
+Until enough tasks have completed, a fixed throughput prior is used instead.
+
+History comes from ExportMetrics records or from a metrics event log
+(see the metrics module).
+"""
+
+import csv
+import heapq
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Union
+
+import numpy as np
+
+from .estimator import DEFAULT_NUM_BANDS
+
+
+MIN_SAMPLES = 5  # completed tasks needed before the regression replaces the prior
+PRIOR_PIXELS_PER_SECOND = 2e5
+PRIOR_STARTUP_SECONDS = 60  # time to start a RUNNING task before pixels flow
+PRIOR_READY_SECONDS = 60  # time in the Earth Engine queue
+PRIOR_SPREAD = 3.0  # multiplicative uncertainty of predictions from the prior
+MIN_SECONDS = 1.0  # lower bound of predicted durations
+REWEIGHT_PASSES = 3  # relative-error refinements after the ordinary fit
+INTERVAL_Z = 1.2816  # standard normal quantile of the 90th percentile
+BASE_YEAR = 2017  # first year of the embeddings dataset
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+def _number(value: Any) -> Optional[float]:
+    """Convert a record field (possibly a CSV string) to a positive float."""
+    if value is None or value == '':
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 and math.isfinite(number) else None
+
+
+def _features(pixels: ArrayLike, scale: ArrayLike, year: ArrayLike,
+              num_bands: ArrayLike) -> np.ndarray:
+    pixels, scale, year, num_bands = np.broadcast_arrays(
+        np.asarray(pixels, dtype=float), np.asarray(scale, dtype=float),
+        np.asarray(year, dtype=float), np.asarray(num_bands, dtype=float)
+    )
+    return np.column_stack([
+        np.maximum(pixels.ravel(), 0.0),
+        np.log(scale.ravel()),
+        year.ravel() - BASE_YEAR,
+        np.log(num_bands.ravel())
+    ])
+
+
+def makespan(durations: Sequence[float], slots: int, busy: Sequence[float] = ()) -> float:
+    """
+    Compute the time to run jobs in order on a fixed number of parallel slots.
+
+    Each job starts on the first slot to become free, so passing durations
+    longest first gives the longest-processing-time schedule.
+
+    Args:
+        durations: Job durations in seconds, in submission order
+        slots: Number of jobs that can run at the same time
+        busy: Remaining seconds of jobs already occupying slots
+
+    Returns:
+        Seconds until the last job finishes
+    """
+    free_at = [0.0] * slots
+    for seconds in list(busy) + list(durations):
+        heapq.heapreplace(free_at, free_at[0] + seconds)
+    return float(max(free_at))
+
+
+class _DurationModel:
+    """Relative-error least-squares fit of overhead + pixels * cost per pixel."""
+
+    def __init__(self, features: np.ndarray, target: np.ndarray):
+        self.mean = features[:, 1:].mean(axis=0)
+        # Features that never varied (e.g. a single scale) carry no information
+        self.varying = features[:, 1:].std(axis=0) > 1e-9
+        design = self._design(features)
+        # Start from an ordinary fit, then reweight rows by the inverse of the
+        # predicted duration so the errors minimized are relative ones.
+        # Weighting by the prediction rather than the observation keeps a
+        # single implausibly short task from dominating the fit.
+        weights = np.ones(len(target))
+        for _ in range(1 + REWEIGHT_PASSES):
+            self.coef, _, _, _ = np.linalg.lstsq(design * weights[:, None],
+                                                 target * weights, rcond=None)
+            weights = 1 / self.predict(features)
+        log_ratio = np.log(target / self.predict(features))
+        dof = len(target) - design.shape[1]
+        if dof > 0:
+            self.sigma = float(np.sqrt(np.sum(log_ratio ** 2) / dof))
+        else:
+            self.sigma = math.log(PRIOR_SPREAD)
+
+    def _design(self, features: np.ndarray) -> np.ndarray:
+        pixels = features[:, :1]
+        modifiers = (features[:, 1:] - self.mean)[:, self.varying]
+        return np.column_stack([np.ones(len(features)), pixels, pixels * modifiers])
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.maximum(self._design(features) @ self.coef, MIN_SECONDS)
+
+
+class DurationPredictor:
+    """
+    Predict export runtime and pixel throughput from completed tasks.
+    """
+
+    def __init__(self, min_samples: int = MIN_SAMPLES):
+        """
+        Initialize a predictor with an empty history.
+
+        Args:
+            min_samples: Completed tasks needed before the regression is used
+                (a fixed throughput prior is used until then)
+        """
+        self.min_samples = min_samples
+        self._history: Dict[str, List[float]] = {
+            key: [] for key in ('pixels', 'scale', 'year', 'num_bands',
+                                'total_seconds', 'running_seconds')
+        }
+        self._seen_ids = set()
+        self._total_model: Optional[_DurationModel] = None
+        self._running_model: Optional[_DurationModel] = None
+        self._fitted_samples = 0
+
+    @property
+    def samples(self) -> int:
+        """Number of completed tasks in the history."""
+        return len(self._history['pixels'])
+
+    def add(self, pixels: float, scale: float, year: int, total_seconds: float,
+            running_seconds: Optional[float] = None,
+            num_bands: int = DEFAULT_NUM_BANDS) -> None:
+        """
+        Add one completed task to the history.
+
+        Args:
+            pixels: Number of pixels exported
+            scale: Resolution in meters per pixel
+            year: Year of the embeddings
+            total_seconds: Time from submission to completion
+            running_seconds: Time spent RUNNING (unknown if None)
+            num_bands: Number of bands exported
+        """
+        history = self._history
+        history['pixels'].append(float(pixels))
+        history['scale'].append(float(scale))
+        history['year'].append(float(year))
+        history['num_bands'].append(float(num_bands))
+        history['total_seconds'].append(float(total_seconds))
+        history['running_seconds'].append(float(running_seconds) if running_seconds else np.nan)
+
+    def add_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add completed tasks from ExportMetrics records or event log rows.
+
+        Records that did not complete, lack a size, scale, year or duration,
+        or whose task ID was already added are skipped.
+
+        Args:
+            records: Dictionaries as returned by ExportMetrics.records() or
+                read from a metrics event log
+
+        Returns:
+            Number of tasks added
+        """
+        added = 0
+        for record in records:
+            if record.get('state', record.get('event')) != 'COMPLETED':
+                continue
+            task_id = record.get('task_id')
+            if task_id and task_id in self._seen_ids:
+                continue
+            values = [_number(record.get(key))
+                      for key in ('pixels', 'scale', 'year', 'total_seconds')]
+            if None in values:
+                continue
+            pixels, scale, year, total_seconds = values
+            self.add(pixels, scale, int(year), total_seconds,
+                     running_seconds=_number(record.get('running_seconds')),
+                     num_bands=_number(record.get('num_bands')) or DEFAULT_NUM_BANDS)
+            if task_id:
+                self._seen_ids.add(task_id)
+            added += 1
+        return added
+
+    def add_event_log(self, path: str) -> int:
+        """
+        Add the completed tasks of a ``.csv`` or ``.jsonl`` metrics event log.
+
+        Args:
+            path: Path of the event log
+
+        Returns:
+            Number of tasks added (0 if the log could not be read)
+        """
+        try:
+            with open(path, newline='', encoding='utf-8') as fh:
+                if path.lower().endswith('.csv'):
+                    rows = list(csv.DictReader(fh))
+                else:
+                    rows = [json.loads(line) for line in fh if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"Error reading event log {path}: {e}")
+            return 0
+        return self.add_records(rows)
+
+    def fit(self) -> bool:
+        """
+        Fit the runtime models on the current history.
+
+        Returns:
+            True if the regression is used, False if the prior is used
+        """
+        self._fitted_samples = self.samples
+        self._total_model = self._running_model = None
+        if self.samples < self.min_samples:
+            return False
+
+        history = {key: np.asarray(values) for key, values in self._history.items()}
+        features = _features(history['pixels'], history['scale'], history['year'],
+                             history['num_bands'])
+        self._total_model = _DurationModel(features, history['total_seconds'])
+        has_running = np.isfinite(history['running_seconds'])
+        if has_running.sum() >= self.min_samples:
+            self._running_model = _DurationModel(features[has_running],
+                                                  history['running_seconds'][has_running])
+        return True
+
+    def predict(self, pixels: ArrayLike, scale: ArrayLike, year: ArrayLike,
+                num_bands: ArrayLike = DEFAULT_NUM_BANDS) -> Dict[str, np.ndarray]:
+        """
+        Predict runtime and throughput for new exports.
+
+        The models are refitted first if tasks were added since the last fit.
+
+        Args:
+            pixels: Estimated pixel counts
+            scale: Resolutions in meters per pixel
+            year: Years of the embeddings
+            num_bands: Number of bands exported
+
+        Returns:
+            Dictionary with 'seconds' (submission to completion),
+            'seconds_low' and 'seconds_high' (10th and 90th percentiles),
+            'running_seconds' and 'pixels_per_second' arrays
+        """
+        if self._fitted_samples != self.samples:
+            self.fit()
+
+        features = _features(pixels, scale, year, num_bands)
+        pixel_counts = features[:, 0]
+        prior_running = PRIOR_STARTUP_SECONDS + pixel_counts / PRIOR_PIXELS_PER_SECOND
+
+        if self._total_model is None:
+            seconds = prior_running + PRIOR_READY_SECONDS
+            spread = PRIOR_SPREAD
+        else:
+            seconds = self._total_model.predict(features)
+            spread = math.exp(INTERVAL_Z * self._total_model.sigma)
+
+        if self._running_model is not None:
+            running_seconds = self._running_model.predict(features)
+        elif self._total_model is not None:
+            # Without RUNNING timestamps, treat the whole duration as running time
+            running_seconds = seconds
+        else:
+            running_seconds = prior_running
+
+        return {
+            'seconds': seconds,
+            'seconds_low': seconds / spread,
+            'seconds_high': seconds * spread,
+            'running_seconds': running_seconds,
+            'pixels_per_second': pixel_counts / running_seconds
+        }
@@ -0,0 +1,185 @@
+"""
+Reduced-precision storage of embedding values.
+
+Satellite embeddings are unit-length vectors, so every band value lies in
+[-1, 1]. That makes them safe to store as float16, or as int8 with a per-band
+scale factor, cutting storage by 2x or 4x compared to float32.
+"""
+
+import warnings
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
+
+
+PRECISIONS = ('float32', 'float16', 'int8')
+
+BYTES_PER_VALUE = {
+    'float32': 4,
+    'float16': 2,
+    'int8': 1
+}
+
+INT8_MAX = 127
+INT8_NODATA = -128  # marks NaN pixels in int8 data
+
+# Earth Engine exports cannot write float16, so 'float16' exports are written
+# as 16-bit fixed point instead; both take 2 bytes per value.
+EXPORT_FIXED_POINT = {
+    'float16': 32767,
+    'int8': INT8_MAX
+}
+
+
+def check_precision(precision: str) -> str:
+    """
+    Validate a precision name.
+
+    Args:
+        precision: One of 'float32', 'float16' or 'int8'
+
+    Returns:
+        The precision name
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}")
+    return precision
+
+
+def bytes_per_value(precision: str) -> int:
+    """
+    Get the storage size of one band value.
+
+    Args:
+        precision: One of 'float32', 'float16' or 'int8'
+
+    Returns:
+        Bytes per value
+    """
+    return BYTES_PER_VALUE[check_precision(precision)]
+
+
+def quantize(array: np.ndarray, precision: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Convert float embeddings to a smaller type.
+
+    For int8, each band (last axis) gets its own scale so the largest absolute
+    value in the band maps to 127. NaN values are kept as NaN in float types
+    and stored as -128 in int8.
+
+    Args:
+        array: Array whose last axis is the band axis
+        precision: One of 'float32', 'float16' or 'int8'
+
+    Returns:
+        Tuple of (quantized array, parameters needed by dequantize())
+    """
+    check_precision(precision)
+    params: Dict[str, Any] = {'precision': precision}
+
+    if precision == 'float32':
+        return array.astype(np.float32, copy=False), params
+    if precision == 'float16':
+        return array.astype(np.float16), params
+
+    flat = array.reshape(-1, array.shape[-1])
+    # All-NaN bands warn through the warnings module rather than errstate
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        max_abs = np.nanmax(np.abs(flat), axis=0) if flat.size else np.zeros(array.shape[-1])
+    max_abs = np.where(np.isfinite(max_abs) & (max_abs > 0), max_abs, 1.0)
+    scale = (max_abs / INT8_MAX).astype(np.float32)
+
+    nodata = np.isnan(array)
+    with np.errstate(invalid='ignore'):
+        data = np.clip(np.round(array / scale), -INT8_MAX, INT8_MAX)
+    data = np.where(nodata, INT8_NODATA, data).astype(np.int8)
+    params['scale'] = scale
+    return data, params
+
+
+def dequantize(data: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    """
+    Convert quantized embeddings back to float32.
+
+    Args:
+        data: Array returned by quantize()
+        params: Parameters returned by quantize()
+
+    Returns:
+        float32 array with NaN where values were missing
+    """
+    precision = check_precision(params['precision'])
+    if precision != 'int8':
+        return data.astype(np.float32)
+
+    values = data.astype(np.float32) * np.asarray(params['scale'], dtype=np.float32)
+    values[data == INT8_NODATA] = np.nan
+    return values
+
+
+def reconstruction_error(original: np.ndarray, precision: str) -> Dict[str, float]:
+    """
+    Measure how much precision a round trip through quantize() loses.
+
+    Args:
+        original: float32 array whose last axis is the band axis
+        precision: One of 'float32', 'float16' or 'int8'
+
+    Returns:
+        Dictionary with 'max_abs_error', 'rmse' and 'mean_cosine_distance'
+        (between original and reconstructed pixel vectors)
+    """
+    data, params = quantize(original, precision)
+    restored = dequantize(data, params)
+
+    valid = ~np.isnan(original).any(axis=-1)
+    a = original[valid].astype(np.float64)
+    b = restored[valid].astype(np.float64)
+    if a.size == 0:
+        return {'max_abs_error': 0.0, 'rmse': 0.0, 'mean_cosine_distance': 0.0}
+
+    diff = a - b
+    cosine = np.einsum('ij,ij->i', a, b) / np.maximum(
+        np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1), 1e-12
+    )
+    return {
+        'max_abs_error': float(np.abs(diff).max()),
+        'rmse': float(np.sqrt(np.mean(diff ** 2))),
+        'mean_cosine_distance': float(np.mean(1 - cosine))
+    }
+
+
+def export_scale(precision: str) -> Optional[int]:
+    """
+    Get the fixed-point multiplier applied to Earth Engine exports.
+
+    Args:
+        precision: One of 'float32', 'float16' or 'int8'
+
+    Returns:
+        Multiplier, or None for float32 exports
+    """
+    return EXPORT_FIXED_POINT.get(check_precision(precision))
+
+
+def dequantize_export(array: np.ndarray, precision: str,
+                      nodata: Optional[float] = None) -> np.ndarray:
+    """
+    Convert the pixels of a reduced-precision Earth Engine export back to float32.
+
+    Args:
+        array: Pixel values read from the exported GeoTIFF
+        precision: Precision the export was made with
+        nodata: Value marking missing pixels in the file, if any
+
+    Returns:
+        float32 array of embedding values
+    """
+    multiplier = export_scale(precision)
+    values = array.astype(np.float32)
+    if nodata is not None:
+        values[array == nodata] = np.nan
+    if multiplier is not None:
+        values /= multiplier
+    return values
@@ -0,0 +1,248 @@
+"""
+Memoized construction of Earth Engine query objects.
+
+Every export, info request or sample starts from the same objects: a
+rectangle geometry, the embeddings collection filtered to one year and to the
+region, and the mosaic of that collection. Building these client-side graphs
+is cheap once but adds up when planning thousands of tiles, so the planner
+keeps them in an LRU cache keyed by (dataset, year, bounds, polygon) and
+shares the per-year collection between all regions.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+import ee
+
+
+DEFAULT_MAX_PLANS = 4096
+BOUNDS_PRECISION = 9  # decimal places used to compare bounds
+
+
+def bounds_key(region_bounds: Dict[str, float]) -> Tuple[float, float, float, float]:
+    """
+    Build a hashable key for a bounding box.
+
+    Args:
+        region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+    Returns:
+        Tuple of (west, south, east, north) rounded to BOUNDS_PRECISION places
+    """
+    return tuple(
+        round(float(region_bounds[key]), BOUNDS_PRECISION)
+        for key in ('west', 'south', 'east', 'north')
+    )
+
+
+class QueryPlan:
+    """
+    Earth Engine objects needed to query the embeddings inside one region.
+
+    The geometry is a rectangle, or the region's polygon when the bounds
+    dictionary carries one (see geometry.PolygonRegion.to_bounds()).
+    """
+
+    def __init__(self, dataset_id: str, year: int, region_bounds: Dict[str, float],
+                 geometry: ee.Geometry, collection: ee.ImageCollection):
+        """
+        Initialize the plan.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            year: Year of the embeddings
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            geometry: Rectangle or polygon of the region
+            collection: Collection filtered to the year and the bounds
+        """
+        self.dataset_id = dataset_id
+        self.year = year
+        self.region_bounds = region_bounds
+        self.geometry = geometry
+        self.collection = collection
+        self._mosaic: Optional[ee.Image] = None
+        self._image: Optional[ee.Image] = None
+
+    @property
+    def mosaic(self) -> ee.Image:
+        """Mosaic of the filtered collection (not clipped)."""
+        if self._mosaic is None:
+            self._mosaic = self.collection.mosaic()
+        return self._mosaic
+
+    @property
+    def image(self) -> ee.Image:
+        """Mosaic clipped to the bounds, as used for exports."""
+        if self._image is None:
+            self._image = self.mosaic.clip(self.geometry)
+        return self._image
+
+
+class QueryPlanner:
+    """
+    Thread-safe LRU cache of QueryPlan objects and per-year collections.
+    """
+
+    def __init__(self, max_plans: int = DEFAULT_MAX_PLANS):
+        """
+        Initialize the planner.
+
+        Args:
+            max_plans: Number of plans kept before the least recently used is dropped
+        """
+        self.max_plans = max_plans
+        self._plans: 'OrderedDict[Any, QueryPlan]' = OrderedDict()
+        self._collections: Dict[Tuple[str, int], ee.ImageCollection] = {}
+        self._images: Dict[Tuple[str, int], ee.Image] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def collection(self, dataset_id: str, year: int) -> ee.ImageCollection:
+        """
+        Get the collection filtered to one calendar year.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            year: Year of the embeddings
+
+        Returns:
+            Filtered image collection
+        """
+        key = (dataset_id, year)
+        with self._lock:
+            if key not in self._collections:
+                # Literal date strings keep the graph free of server-side date math
+                self._collections[key] = ee.ImageCollection(dataset_id).filter(
+                    ee.Filter.date(f"{year}-01-01", f"{year + 1}-01-01")
+                )
+            return self._collections[key]
+
+    def annual_image(self, dataset_id: str, year: int) -> ee.Image:
+        """
+        Get the global mosaic for one year, for queries that span many regions.
+
+        Args:
+            dataset_id: Earth Engine image collection id
+            year: Year of the embeddings
+
+        Returns:
+            Mosaic of the year's collection
+        """
+        key = (dataset_id, year)
+        collection = self.collection(dataset_id, year)
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = collection.mosaic()
+            return self._images[key]
+
+    def plan(self, region_bounds: Dict[str, float], year: int, dataset_id: str) -> QueryPlan:
+        """
+        Get the query plan for one bounding box.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            dataset_id: Earth Engine image collection id
+
+        Returns:
+            Cached or newly built QueryPlan
+        """
+        key = self._key(region_bounds, year, dataset_id)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+        return self._build([region_bounds], [key], year, dataset_id)[0]
+
+    def plans(self, bounds_list: Sequence[Dict[str, float]], year: int,
+              dataset_id: str) -> List[QueryPlan]:
+        """
+        Get query plans for many bounding boxes in one pass.
+
+        The year's collection is built once and shared by every plan, and the
+        cache lock is taken once for the lookups and once for the inserts.
+
+        Args:
+            bounds_list: Dictionaries with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+            dataset_id: Earth Engine image collection id
+
+        Returns:
+            List of QueryPlan objects aligned with ``bounds_list``
+        """
+        keys = [self._key(bounds, year, dataset_id) for bounds in bounds_list]
+        result: List[Optional[QueryPlan]] = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                plan = self._plans.get(key)
+                if plan is None:
+                    missing.append(i)
+                else:
+                    self._plans.move_to_end(key)
+                    result[i] = plan
+            self.hits += len(keys) - len(missing)
+
+        if missing:
+            built = self._build([bounds_list[i] for i in missing],
+                                [keys[i] for i in missing], year, dataset_id)
+            for i, plan in zip(missing, built):
+                result[i] = plan
+        return result
+
+    @staticmethod
+    def _key(region_bounds: Dict[str, Any], year: int, dataset_id: str) -> Any:
+        polygon = region_bounds.get('polygon')
+        return (dataset_id, year, bounds_key(region_bounds),
+                polygon.fingerprint if polygon is not None else None)
+
+    def _build(self, bounds_list: Sequence[Dict[str, float]], keys: List[Any],
+               year: int, dataset_id: str) -> List[QueryPlan]:
+        collection = self.collection(dataset_id, year)
+        built = []
+        for bounds, key in zip(bounds_list, keys):
+            polygon = bounds.get('polygon')
+            if polygon is not None:
+                geometry = polygon.to_ee()
+            else:
+                geometry = ee.Geometry.Rectangle(list(key[2]))
+            built.append(QueryPlan(dataset_id, year, bounds, geometry,
+                                   collection.filter(ee.Filter.bounds(geometry))))
+
+        with self._lock:
+            self.misses += len(built)
+            for key, plan in zip(keys, built):
+                self._plans[key] = plan
+                self._plans.move_to_end(key)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return built
+
+    def clear(self) -> None:
+        """Drop every cached plan and collection."""
+        with self._lock:
+            self._plans.clear()
+            self._collections.clear()
+            self._images.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+_query_planner = QueryPlanner()
+
+
+def get_query_planner() -> QueryPlanner:
+    """
+    Get the query planner shared by the downloaders in this package.
+
+    Returns:
+        Shared QueryPlanner instance
+    """
+    return _query_planner
@@ -2,7 +2,12 @@
 Region configuration module with predefined bounding boxes for countries and cities.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Any, Union, TYPE_CHECKING
+
+# estimator and geometry need NumPy, so they are imported where used and
+# region lookups stay cheap to import
+if TYPE_CHECKING:
+    from .geometry import PolygonRegion
 
 
 class RegionConfig:
@@ -205,6 +210,9 @@ class RegionConfig:
         }
     }
     
+    # Regions added at runtime with register_region() or load_geojson_region()
+    CUSTOM_REGIONS: Dict[str, Dict[str, Any]] = {}
+    
     @classmethod
     def get_country_bounds(cls, country_name: str) -> Optional[Dict[str, float]]:
         """
@@ -234,7 +242,7 @@ class RegionConfig:
     @classmethod
     def get_region_bounds(cls, region_name: str) -> Optional[Dict[str, float]]:
         """
-        Get bounding box for any region (country or city).
+        Get bounding box for any region (custom, city or country).
         
         Args:
             region_name: Name of the region (lowercase)
@@ -242,7 +250,11 @@ class RegionConfig:
         Returns:
             Dictionary with bounding box coordinates or None if not found
         """
-        # Try cities first (more specific)
+        # Custom regions first, then cities (more specific)
+        bounds = cls.CUSTOM_REGIONS.get(region_name.lower())
+        if bounds:
+            return bounds
+        
         bounds = cls.get_city_bounds(region_name)
         if bounds:
             return bounds
@@ -276,13 +288,55 @@ class RegionConfig:
         Get all available regions organized by type.
         
         Returns:
-            Dictionary with 'countries' and 'cities' keys
+            Dictionary with 'countries', 'cities' and 'custom' keys
         """
         return {
             'countries': cls.list_available_countries(),
-            'cities': cls.list_available_cities()
+            'cities': cls.list_available_cities(),
+            'custom': list(cls.CUSTOM_REGIONS.keys())
         }
     
+    @classmethod
+    def register_region(cls, region_name: str,
+                        region: Union[Dict[str, Any], 'PolygonRegion']) -> Dict[str, Any]:
+        """
+        Add a custom region that can be looked up by name.
+        
+        Args:
+            region_name: Name to register the region under (stored lowercase)
+            region: Bounds dictionary or PolygonRegion
+            
+        Returns:
+            The registered bounds dictionary
+        """
+        bounds = dict(region) if isinstance(region, dict) else region.to_bounds()
+        if not cls.validate_bounds(bounds):
+            raise ValueError("Invalid bounding box coordinates")
+        cls.CUSTOM_REGIONS[region_name.lower()] = bounds
+        return bounds
+    
+    @classmethod
+    def load_geojson_region(cls, region_name: str, source: Union[str, Dict[str, Any]],
+                            tolerance: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Register a polygon region from a GeoJSON file or object.
+        
+        Exports of the region clip to the polygon, and tiled exports skip
+        tiles that do not overlap it.
+        
+        Args:
+            region_name: Name to register the region under
+            source: GeoJSON file path or parsed GeoJSON object
+            tolerance: Douglas-Peucker tolerance in degrees (no simplification if None)
+            
+        Returns:
+            The registered bounds dictionary, with the polygon under 'polygon'
+        """
+        from .geometry import PolygonRegion
+
+        region = PolygonRegion.from_geojson(source, name=region_name, tolerance=tolerance)
+        return cls.register_region(region_name, region)
+    
     @classmethod
     def create_custom_bounds(cls, west: float, east: float, 
                            south: float, north: float, 
@@ -357,14 +411,17 @@ class RegionConfig:
         if not cls.validate_bounds(bounds):
             raise ValueError("Invalid bounding box coordinates")
         
-        # Approximate area calculation (not perfect due to Earth's curvature)
         width_deg = bounds['east'] - bounds['west']
         height_deg = bounds['north'] - bounds['south']
         
-        # Convert to approximate km (very rough calculation)
-        width_km = width_deg * 111.32  # degrees to km at equator
-        height_km = height_deg * 110.54  # degrees to km
-        area_km2 = width_km * height_km
+        from .estimator import geodesic_area_km2, geodesic_extent_km
+
+        # Ellipsoidal (WGS84) area and extent, computed locally
+        coords = (bounds['west'], bounds['east'], bounds['south'], bounds['north'])
+        extent = geodesic_extent_km(*coords)
+        width_km = float(extent['width_km'])
+        height_km = float(extent['height_km'])
+        area_km2 = float(geodesic_area_km2(*coords))
         
         return {
             'width_degrees': width_deg,
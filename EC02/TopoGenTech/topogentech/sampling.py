@@ -0,0 +1,81 @@
+"""
+Helpers for writing sampled embedding points to columnar files.
+"""
+
+import os
+from typing import Dict, List, Any
+
+
+TABLE_FORMATS = {
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.csv': 'csv'
+}
+
+MAX_POINTS_PER_REQUEST = 5000  # Earth Engine getInfo() feature limit
+
+
+def features_to_rows(features: List[Dict[str, Any]], **extra: Any) -> List[Dict[str, Any]]:
+    """
+    Flatten sampled point features into table rows.
+
+    Args:
+        features: GeoJSON point features as returned by getInfo() on a sample
+        **extra: Constant columns added to every row (e.g. region, tile_id)
+
+    Returns:
+        List of row dictionaries with 'lon', 'lat', the extra columns and
+        one column per band
+    """
+    rows = []
+    for feature in features:
+        lon, lat = feature['geometry']['coordinates']
+        row = {'lon': lon, 'lat': lat}
+        row.update(extra)
+        row.update(feature['properties'])
+        rows.append(row)
+    return rows
+
+
+def write_table(rows: List[Dict[str, Any]], output_path: str) -> str:
+    """
+    Write rows to a Parquet, Feather or CSV file chosen by extension.
+
+    Parquet and Feather need pandas and pyarrow
+    (``pip install topogentech[parquet]``).
+
+    Args:
+        rows: List of row dictionaries with the same keys
+        output_path: Destination path ending in .parquet, .feather or .csv
+
+    Returns:
+        The format that was written
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported table format '{extension}', use one of {list(TABLE_FORMATS)}")
+    table_format = TABLE_FORMATS[extension]
+
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("Writing sample tables requires pandas: pip install topogentech[parquet]") from e
+
+    frame = pd.DataFrame(rows)
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+
+    if table_format == 'csv':
+        frame.to_csv(output_path, index=False)
+        return table_format
+
+    try:
+        if table_format == 'parquet':
+            frame.to_parquet(output_path, index=False)
+        else:
+            frame.to_feather(output_path)
+    except ImportError as e:
+        raise ImportError(
+            f"Writing {table_format} files requires pyarrow: pip install topogentech[parquet]"
+        ) from e
+    return table_format
@@ -0,0 +1,445 @@
+"""
+Export scheduler that keeps a fixed number of Earth Engine tasks in flight.
+"""
+
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any
+
+from .backends import Backend, get_backend
+from .manifest import ExportManifest
+from .metrics import ExportMetrics
+from .predictor import makespan
+
+
+class ExportJob:
+    """
+    A single export waiting to be submitted by the ExportScheduler.
+    """
+
+    DESTINATIONS = ('drive', 'asset')
+
+    def __init__(self, region_bounds: Dict[str, float], description: str,
+                 destination: str = 'drive',
+                 folder: str = 'EarthEngine_Exports',
+                 asset_id: Optional[str] = None,
+                 priority: int = 0,
+                 downloader: Any = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialize an export job.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            description: Task description
+            destination: 'drive' or 'asset'
+            folder: Google Drive folder name (drive exports only)
+            asset_id: Full asset ID path (asset exports only)
+            priority: Jobs with higher priority are submitted first
+            downloader: Downloader for this job, e.g. one with another year or
+                scale (the scheduler's downloader if None)
+            metadata: Free-form details about the job (region, year, tile, ...)
+        """
+        if destination not in self.DESTINATIONS:
+            raise ValueError(f"destination must be one of {self.DESTINATIONS}")
+        if destination == 'asset' and not asset_id:
+            raise ValueError("asset_id is required for asset exports")
+
+        self.region_bounds = region_bounds
+        self.description = description
+        self.destination = destination
+        self.folder = folder
+        self.asset_id = asset_id
+        self.priority = priority
+        self.downloader = downloader
+        self.metadata = metadata or {}
+
+        self.task = None
+        self.state = 'PENDING'
+        self.expected_seconds: Optional[float] = None
+        self.submitted_at: Optional[float] = None
+        self.attempts = 0
+        self.error_message: Optional[str] = None
+        self.resumed = False
+
+    @property
+    def task_id(self) -> Optional[str]:
+        return getattr(self.task, 'id', None)
+
+    def __repr__(self) -> str:
+        return f"ExportJob({self.description!r}, state={self.state!r}, priority={self.priority})"
+
+
+class ExportScheduler:
+    """
+    Queue of export jobs that keeps at most ``max_concurrent`` tasks running.
+
+    Jobs are submitted in priority order (highest first, then in the order
+    they were added, or longest predicted runtime first with
+    ``longest_first``). Whenever a running task finishes, the next queued job
+    is submitted in its place.
+
+    With a manifest, every state change is journaled and jobs already in the
+    manifest are resumed instead of submitted again: completed jobs are
+    skipped, running tasks are reattached and failed jobs are queued.
+    """
+
+    DEFAULT_MAX_CONCURRENT = 4
+    ACTIVE_STATES = ('READY', 'RUNNING', 'CANCEL_REQUESTED')
+
+    def __init__(self, downloader, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 check_interval: int = 30, max_retries: int = 0,
+                 submit_workers: int = 1,
+                 manifest: Optional[ExportManifest] = None,
+                 backend: Optional[Backend] = None,
+                 metrics: Optional[ExportMetrics] = None,
+                 longest_first: bool = False):
+        """
+        Initialize the scheduler.
+
+        Args:
+            downloader: Initialized SatelliteEmbeddingsDownloader used to start exports
+                (may be None if every job brings its own downloader)
+            max_concurrent: Maximum number of tasks running at the same time
+            check_interval: Seconds between status checks in run()
+            max_retries: How many times a failed job is put back in the queue
+            submit_workers: Number of threads used to start tasks in parallel
+            manifest: Journal used to record jobs and resume an earlier run
+            backend: Backend polled for task states and used as the clock
+                (the downloader's backend, or the default backend, if None)
+            metrics: Collector fed with every polled status (the downloader's
+                collector if None)
+            longest_first: Submit jobs of equal priority in order of decreasing
+                predicted runtime, so short jobs fill the gaps at the end of
+                the run instead of one long job finishing last
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+        self.downloader = downloader
+        self.max_concurrent = max_concurrent
+        self.check_interval = check_interval
+        self.max_retries = max_retries
+        self.submit_workers = submit_workers
+        self.manifest = manifest
+        self.backend = backend or getattr(downloader, 'backend', None) or get_backend()
+        self.metrics = metrics or getattr(downloader, 'metrics', None)
+        self.longest_first = longest_first
+
+        self._queue: List[Any] = []
+        self._counter = itertools.count()
+        self._resume_refreshed = False
+        self.running: List[ExportJob] = []
+        self.finished: List[ExportJob] = []
+
+    def add_job(self, region_bounds: Dict[str, float], description: str,
+                destination: str = 'drive',
+                folder: str = 'EarthEngine_Exports',
+                asset_id: Optional[str] = None,
+                priority: int = 0,
+                downloader: Any = None,
+                metadata: Optional[Dict[str, Any]] = None) -> ExportJob:
+        """
+        Queue an export job.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            description: Task description
+            destination: 'drive' or 'asset'
+            folder: Google Drive folder name (drive exports only)
+            asset_id: Full asset ID path (asset exports only)
+            priority: Jobs with higher priority are submitted first
+            downloader: Downloader for this job (the scheduler's downloader if None)
+            metadata: Free-form details about the job (region, year, tile, ...)
+
+        Returns:
+            The queued ExportJob
+        """
+        job = ExportJob(region_bounds, description, destination=destination,
+                        folder=folder, asset_id=asset_id, priority=priority,
+                        downloader=downloader, metadata=metadata)
+        job.expected_seconds = self._predict(job)
+        if self._resume(job):
+            return job
+        self._push(job)
+        if self.manifest is not None:
+            coordinates = {key: region_bounds[key] for key in ('west', 'east', 'south', 'north')}
+            self.manifest.record(job.description, job.state, region_bounds=coordinates,
+                                 destination=destination, **job.metadata)
+        return job
+
+    def add_tiles(self, tiles: List[Dict[str, Any]], description: str,
+                  folder: str = 'EarthEngine_Exports',
+                  priority: int = 0) -> List[ExportJob]:
+        """
+        Queue one Google Drive export per tile.
+
+        Args:
+            tiles: Tile dictionaries as returned by split_bounds()
+            description: Prefix for task descriptions
+            folder: Google Drive folder name
+            priority: Priority applied to every tile job
+
+        Returns:
+            List of queued ExportJob objects
+        """
+        return [
+            self.add_job(tile, f"{description}_{tile['tile_id']}",
+                         folder=folder, priority=priority)
+            for tile in tiles
+        ]
+
+    def _resume(self, job: ExportJob) -> bool:
+        """Restore a job from the manifest; returns False if it must be queued."""
+        entry = self.manifest.get(job.description) if self.manifest is not None else None
+        if entry is None:
+            return False
+
+        if entry['state'] == 'COMPLETED':
+            job.state = 'COMPLETED'
+            job.resumed = True
+            self.finished.append(job)
+            return True
+
+        if entry['state'] in self.ACTIVE_STATES and entry.get('task_id'):
+            try:
+                task = self.backend.task_index.get_task(entry['task_id'])
+                if task is None and not self._resume_refreshed:
+                    # Tasks started after the cached list was fetched are missing
+                    # from it; list once more before treating the task as unknown
+                    self._resume_refreshed = True
+                    task = self.backend.task_index.get_task(entry['task_id'], refresh=True)
+            except Exception as e:
+                print(f"Error reattaching {job.description}: {e}")
+                task = None
+            if task is not None:
+                job.task = task
+                job.state = entry['state']
+                job.attempts = entry.get('attempts', 1)
+                job.resumed = True
+                self.running.append(job)
+                return True
+
+        return False
+
+    def _predict(self, job: ExportJob) -> Optional[float]:
+        downloader = job.downloader or self.downloader
+        if not hasattr(downloader, 'predict_duration'):
+            return None
+        prediction = downloader.predict_duration([job.region_bounds])
+        return float(prediction['seconds'][0])
+
+    def _record(self, job: ExportJob) -> None:
+        if self.manifest is not None:
+            self.manifest.record(job.description, job.state, job.task_id,
+                                 attempts=job.attempts, error_message=job.error_message)
+
+    def _push(self, job: ExportJob) -> None:
+        job.state = 'PENDING'
+        length = -(job.expected_seconds or 0.0) if self.longest_first else 0.0
+        heapq.heappush(self._queue, (-job.priority, length, next(self._counter), job))
+
+    @staticmethod
+    def _metric_details(job: ExportJob) -> Dict[str, Any]:
+        return {key: job.metadata[key] for key in ('region', 'year', 'scale')
+                if key in job.metadata}
+
+    def _start_task(self, job: ExportJob) -> Any:
+        downloader = job.downloader or self.downloader
+        region_bounds = job.region_bounds
+        if 'region' in job.metadata and 'name' not in region_bounds:
+            # The downloader logs SUBMITTED under the bounds' name
+            region_bounds = dict(region_bounds, name=job.metadata['region'])
+        if job.destination == 'drive':
+            return downloader.download_to_drive(
+                region_bounds, description=job.description, folder=job.folder
+            )
+        return downloader.download_to_asset(
+            region_bounds, asset_id=job.asset_id, description=job.description
+        )
+
+    def _submit_many(self, jobs: List[ExportJob]) -> None:
+        # Starting a task is a network round-trip, so start several at once
+        now = self.backend.time()
+        for job in jobs:
+            job.submitted_at = now
+        if self.submit_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.submit_workers, len(jobs))) as executor:
+                tasks = list(executor.map(self._start_task, jobs))
+        else:
+            tasks = [self._start_task(job) for job in jobs]
+
+        for job, task in zip(jobs, tasks):
+            job.attempts += 1
+            job.task = task
+            if task is None:
+                job.error_message = 'Task could not be started'
+                if self.metrics is not None:
+                    self.metrics.submit_failed(job.description, job.error_message,
+                                               **self._metric_details(job))
+                self._finish(job, 'FAILED')
+            else:
+                if self.metrics is not None:
+                    self.metrics.track(task.id, job.description, **self._metric_details(job))
+                job.state = 'READY'
+                self.running.append(job)
+                self._record(job)
+
+    def _finish(self, job: ExportJob, state: str) -> None:
+        if state == 'FAILED' and job.attempts <= self.max_retries:
+            self._push(job)
+        else:
+            job.state = state
+            self.finished.append(job)
+        self._record(job)
+
+    def _poll_running(self) -> None:
+        # One task list call covers every running job; only tasks that are
+        # too new to appear in the list fall back to a per-task status call.
+        if not self.running:
+            return
+        try:
+            statuses = self.backend.task_index.get_statuses(
+                [job.task_id for job in self.running], refresh=True
+            )
+        except Exception as e:
+            print(f"Error listing tasks: {e}")
+            statuses = {}
+
+        still_running = []
+        for job in self.running:
+            status = statuses.get(job.task_id)
+            if status is None:
+                try:
+                    status = job.task.status()
+                except Exception as e:
+                    print(f"Error getting status for {job.description}: {e}")
+                    still_running.append(job)
+                    continue
+
+            if self.metrics is not None:
+                self.metrics.observe(job.task_id, status)
+            state = status['state']
+            if state in self.ACTIVE_STATES:
+                if state != job.state:
+                    job.state = state
+                    self._record(job)
+                still_running.append(job)
+            else:
+                if state == 'FAILED':
+                    job.error_message = status.get('error_message', 'Unknown error')
+                self._finish(job, state)
+        self.running = still_running
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._queue)
+
+    def step(self) -> int:
+        """
+        Poll running tasks once and fill free slots from the queue.
+
+        Returns:
+            Number of jobs submitted in this step
+        """
+        self._poll_running()
+
+        free_slots = self.max_concurrent - len(self.running)
+        jobs = [heapq.heappop(self._queue)[-1] for _ in range(min(free_slots, len(self._queue)))]
+        self._submit_many(jobs)
+        return len(jobs)
+
+    def is_done(self) -> bool:
+        """
+        Check whether every job has been submitted and has finished.
+
+        Returns:
+            True if nothing is queued or running
+        """
+        return not self._queue and not self.running
+
+    def run(self, verbose: bool = True, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        Submit and monitor jobs until the queue is drained.
+
+        Args:
+            verbose: Whether to print progress updates
+            timeout: Maximum seconds to run (None waits until all jobs finish)
+
+        Returns:
+            Summary dictionary as returned by summary()
+        """
+        start_time = self.backend.time()
+
+        try:
+            while True:
+                submitted = self.step()
+                if verbose:
+                    elapsed = self.backend.time() - start_time
+                    remaining = self.eta()
+                    eta = f", eta: {remaining:.0f}s" if remaining is not None else ""
+                    print(f"Queued: {self.pending_count}, running: {len(self.running)}, "
+                          f"finished: {len(self.finished)} "
+                          f"(+{submitted} submitted, elapsed: {elapsed:.0f}s{eta})")
+
+                if self.is_done():
+                    break
+                if timeout is not None and self.backend.time() - start_time > timeout:
+                    if verbose:
+                        print("Scheduler timeout reached (running tasks continue)")
+                    break
+
+                self.backend.sleep(self.check_interval)
+
+        except KeyboardInterrupt:
+            if verbose:
+                print("Scheduler stopped (running tasks continue)")
+
+        return self.summary()
+
+    def eta(self) -> Optional[float]:
+        """
+        Estimate the seconds until every queued and running job has finished.
+
+        Replays the queue on ``max_concurrent`` slots using each job's
+        predicted runtime; running jobs are charged the part of their
+        prediction not yet elapsed. A finished task frees its slot at the
+        next poll, so each job also costs half a check interval.
+
+        Returns:
+            Estimated seconds remaining, or None if a job has no prediction
+        """
+        queued = [entry[-1] for entry in sorted(self._queue)]
+        if any(job.expected_seconds is None for job in self.running + queued):
+            return None
+
+        now = self.backend.time()
+        poll_delay = self.check_interval / 2
+        busy = []
+        for job in self.running:
+            elapsed = now - job.submitted_at if job.submitted_at is not None else 0.0
+            busy.append(max(job.expected_seconds - elapsed, 0.0) + poll_delay)
+        return makespan([job.expected_seconds + poll_delay for job in queued],
+                        self.max_concurrent, busy=busy)
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count jobs per state.
+
+        Returns:
+            Dictionary mapping state to number of jobs
+        """
+        counts: Dict[str, int] = {'PENDING': self.pending_count}
+        for job in self.running + self.finished:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    def failed_jobs(self) -> List[ExportJob]:
+        """
+        Get finished jobs that did not complete successfully.
+
+        Returns:
+            List of ExportJob objects
+        """
+        return [job for job in self.finished if job.state != 'COMPLETED']
@@ -0,0 +1,347 @@
+"""
+Nearest-neighbour search over locally stored embedding vectors.
+
+ExactIndex scans every vector in batched matrix products and suits city-sized
+areas. IVFIndex clusters the vectors with k-means and only scans the clusters
+closest to each query, which keeps query latency interactive for
+country-sized areas at a small cost in recall.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+
+METRICS = ('cosine', 'l2')
+DEFAULT_BATCH_SIZE = 65536  # database vectors scored per matrix product
+EXACT_SEARCH_LIMIT = 500000  # above this many vectors build_index() uses IVF
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k smallest values per row, sorted ascending."""
+    k = min(k, distances.shape[1])
+    if k == 1:
+        return np.argmin(distances, axis=1)[:, None]
+    part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(distances, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class ExactIndex:
+    """
+    Brute-force cosine or L2 search in NumPy.
+    """
+
+    def __init__(self, vectors: np.ndarray, metric: str = 'cosine',
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the index.
+
+        Args:
+            vectors: Array of shape (n, dims)
+            metric: 'cosine' or 'l2'
+            batch_size: Database vectors scored per matrix product
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        self.metric = metric
+        self.batch_size = batch_size
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if metric == 'cosine':
+            self.vectors = _normalize(self.vectors)
+        self._sq_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _prepare_queries(self, queries: np.ndarray) -> np.ndarray:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        return _normalize(queries) if self.metric == 'cosine' else queries
+
+    def _distances(self, queries: np.ndarray, rows: Any) -> np.ndarray:
+        scores = queries @ self.vectors[rows].T
+        if self.metric == 'cosine':
+            return 1 - scores
+        q_norms = np.einsum('ij,ij->i', queries, queries)[:, None]
+        return np.maximum(q_norms - 2 * scores + self._sq_norms[rows][None, :], 0)
+
+    def search(self, queries: np.ndarray, k: int = 10) -> Dict[str, Any]:
+        """
+        Find the k nearest vectors for each query.
+
+        Args:
+            queries: Array of shape (n_queries, dims) or (dims,)
+            k: Number of neighbours per query
+
+        Returns:
+            Dictionary with 'indices' and 'distances' arrays of shape
+            (n_queries, k) and the query 'latency_ms'. Missing neighbours
+            (fewer than k vectors) have index -1 and distance inf.
+        """
+        start = time.perf_counter()
+        queries = self._prepare_queries(queries)
+
+        best_idx = np.empty((len(queries), 0), dtype=np.int64)
+        best_dist = np.empty((len(queries), 0), dtype=np.float32)
+
+        # Keep a running top-k so memory stays bounded by batch_size
+        for offset in range(0, len(self.vectors), self.batch_size):
+            rows = slice(offset, offset + self.batch_size)
+            dist = self._distances(queries, rows)
+            cand_dist = np.concatenate([best_dist, dist], axis=1)
+            cand_idx = np.concatenate([
+                best_idx,
+                np.broadcast_to(np.arange(offset, offset + dist.shape[1]), dist.shape)
+            ], axis=1)
+            top = _top_k(cand_dist, k)
+            best_dist = np.take_along_axis(cand_dist, top, axis=1)
+            best_idx = np.take_along_axis(cand_idx, top, axis=1)
+
+        missing = k - best_idx.shape[1]
+        if missing > 0:
+            best_idx = np.pad(best_idx, ((0, 0), (0, missing)), constant_values=-1)
+            best_dist = np.pad(best_dist, ((0, 0), (0, missing)), constant_values=np.inf)
+
+        return {
+            'indices': best_idx,
+            'distances': best_dist,
+            'latency_ms': (time.perf_counter() - start) * 1000
+        }
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 10,
+           sample_size: int = 100000, seed: int = 0) -> np.ndarray:
+    """
+    Fit k-means centroids with Lloyd iterations on a random sample.
+
+    Args:
+        vectors: Array of shape (n, dims)
+        n_clusters: Number of centroids
+        n_iter: Number of Lloyd iterations
+        sample_size: Maximum number of vectors used for training
+        seed: Random seed
+
+    Returns:
+        Centroid array of shape (n_clusters, dims)
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = ExactIndex(centroids, metric='l2').search(vectors, k=1)['indices'][:, 0]
+        counts = np.bincount(labels, minlength=n_clusters)
+        filled = counts > 0
+        # Sum members per cluster with one sort + reduceat instead of np.add.at
+        order = np.argsort(labels, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+        centroids[filled] = sums / counts[filled, None]
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index: approximate search over the closest k-means clusters.
+    """
+
+    def __init__(self, vectors: np.ndarray, metric: str = 'cosine',
+                 n_lists: Optional[int] = None, n_probe: int = 8, seed: int = 0):
+        """
+        Build the index.
+
+        Args:
+            vectors: Array of shape (n, dims)
+            metric: 'cosine' or 'l2'
+            n_lists: Number of clusters (about sqrt(n) if None)
+            n_probe: Clusters scanned per query; higher is slower but more accurate
+            seed: Random seed for k-means
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        self.metric = metric
+        self.n_probe = n_probe
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if metric == 'cosine':
+            vectors = _normalize(vectors)
+        if n_lists is None:
+            n_lists = int(np.sqrt(len(vectors)))
+        n_lists = max(1, min(n_lists, len(vectors)))
+
+        self.centroids = kmeans(vectors, n_lists, seed=seed)
+        self._coarse = ExactIndex(self.centroids, metric='l2')
+        labels = self._coarse.search(vectors, k=1)['indices'][:, 0]
+
+        # Store vectors grouped by cluster so each list is a contiguous slice
+        self._order = np.argsort(labels, kind='stable')
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        self._exact = ExactIndex(vectors[self._order], metric=metric)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def search(self, queries: np.ndarray, k: int = 10,
+               n_probe: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Find approximately the k nearest vectors for each query.
+
+        Args:
+            queries: Array of shape (n_queries, dims) or (dims,)
+            k: Number of neighbours per query
+            n_probe: Clusters scanned per query (index default if None)
+
+        Returns:
+            Dictionary with 'indices' and 'distances' arrays of shape
+            (n_queries, k) and the query 'latency_ms'. Missing neighbours
+            (fewer than k candidates) have index -1 and distance inf.
+        """
+        start = time.perf_counter()
+        queries = self._exact._prepare_queries(queries)
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probes = self._coarse.search(queries, k=n_probe)['indices']
+
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+
+        for i, query in enumerate(queries):
+            rows = np.concatenate([
+                np.arange(self._offsets[c], self._offsets[c + 1]) for c in probes[i]
+            ])
+            if len(rows) == 0:
+                continue
+            dist = self._exact._distances(query[None, :], rows)
+            top = _top_k(dist, k)[0]
+            indices[i, :len(top)] = self._order[rows[top]]
+            distances[i, :len(top)] = dist[0, top]
+
+        return {
+            'indices': indices,
+            'distances': distances,
+            'latency_ms': (time.perf_counter() - start) * 1000
+        }
+
+
+class PixelSimilarityIndex:
+    """
+    Similarity index over the pixels of an embedding window.
+
+    Keeps the pixel coordinates alongside the vectors so results can be
+    reported as longitude/latitude.
+    """
+
+    def __init__(self, window: np.ndarray, metadata: Dict[str, Any],
+                 metric: str = 'cosine', approximate: Optional[bool] = None,
+                 **ivf_kwargs: Any):
+        """
+        Build the index from a window as returned by EmbeddingStore.read_window().
+
+        Args:
+            window: Array of shape (height, width, bands)
+            metadata: Window metadata with 'west', 'north' and 'pixel_deg' keys
+            metric: 'cosine' or 'l2'
+            approximate: Use IVFIndex (True), ExactIndex (False) or pick by size (None)
+            **ivf_kwargs: Extra arguments passed to IVFIndex
+        """
+        height, width, bands = window.shape
+        flat = window.reshape(-1, bands)
+        valid = ~np.isnan(flat).any(axis=1)
+        self._pixels = np.flatnonzero(valid)
+        self._width = width
+        self.metadata = metadata
+
+        vectors = flat[valid]
+        if approximate is None:
+            approximate = len(vectors) > EXACT_SEARCH_LIMIT
+        self.index = IVFIndex(vectors, metric=metric, **ivf_kwargs) if approximate \
+            else ExactIndex(vectors, metric=metric)
+        self._vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self._pixels)
+
+    def coordinates(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Convert result indices to pixel-center coordinates.
+
+        Args:
+            indices: Indices returned by search()
+
+        Returns:
+            Dictionary with 'lon' and 'lat' arrays (NaN for missing results)
+        """
+        indices = np.asarray(indices)
+        pixels = self._pixels[np.clip(indices, 0, None)]
+        rows, cols = np.divmod(pixels, self._width)
+        pixel_deg = self.metadata['pixel_deg']
+        lon = self.metadata['west'] + (cols + 0.5) * pixel_deg
+        lat = self.metadata['north'] - (rows + 0.5) * pixel_deg
+        missing = indices < 0
+        return {'lon': np.where(missing, np.nan, lon), 'lat': np.where(missing, np.nan, lat)}
+
+    def search(self, queries: np.ndarray, k: int = 10) -> Dict[str, Any]:
+        """
+        Find the pixels most similar to each query vector.
+
+        Args:
+            queries: Array of shape (n_queries, bands) or (bands,)
+            k: Number of neighbours per query
+
+        Returns:
+            Search result dictionary with added 'lon' and 'lat' arrays
+        """
+        result = self.index.search(queries, k=k)
+        result.update(self.coordinates(result['indices']))
+        return result
+
+    def search_like_pixel(self, lon: float, lat: float, k: int = 10) -> Dict[str, Any]:
+        """
+        Find the pixels that look most like the pixel at a location.
+
+        Args:
+            lon: Longitude of the reference pixel
+            lat: Latitude of the reference pixel
+            k: Number of neighbours
+
+        Returns:
+            Search result dictionary with added 'lon' and 'lat' arrays
+        """
+        pixel_deg = self.metadata['pixel_deg']
+        row = math.floor((self.metadata['north'] - lat) / pixel_deg)
+        col = math.floor((lon - self.metadata['west']) / pixel_deg)
+        position = np.searchsorted(self._pixels, row * self._width + col)
+        if (row < 0 or col < 0 or col >= self._width or position >= len(self._pixels)
+                or self._pixels[position] != row * self._width + col):
+            raise ValueError(f"No embedding stored at ({lon}, {lat})")
+        return self.search(self._vectors[position], k=k)
+
+
+def build_index(store: Any, bounds: Dict[str, float], year: Optional[int] = None,
+                bands: Optional[List[str]] = None, metric: str = 'cosine',
+                approximate: Optional[bool] = None, **ivf_kwargs: Any) -> PixelSimilarityIndex:
+    """
+    Build a similarity index over the pixels of an EmbeddingStore window.
+
+    Args:
+        store: EmbeddingStore to read from
+        bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+        year: Year of the embeddings (the only stored year if None)
+        bands: Band names to use (all bands if None)
+        metric: 'cosine' or 'l2'
+        approximate: Use IVFIndex (True), ExactIndex (False) or pick by size (None)
+        **ivf_kwargs: Extra arguments passed to IVFIndex
+
+    Returns:
+        PixelSimilarityIndex over the window
+    """
+    window, metadata = store.read_window(bounds, bands=bands, year=year)
+    return PixelSimilarityIndex(window, metadata, metric=metric,
+                                approximate=approximate, **ivf_kwargs)
@@ -0,0 +1,249 @@
+"""
+Spatial index over configured regions for batch point and box queries.
+
+RegionIndex buckets the bounding box of every region into a uniform grid of
+cells. A point query looks up the point's cell, tests the few regions stored
+there against their boxes (and polygons, for polygon regions) and returns
+region ids. All steps are NumPy array operations over blocks of points, so
+millions of GPS fixes can be located in a few seconds.
+"""
+
+from typing import Dict, List, Any, Sequence
+
+import numpy as np
+
+from .estimator import geodesic_area_km2
+
+
+DEFAULT_CELL_SIZE = 1.0  # degrees
+DEFAULT_BLOCK_SIZE = 1000000  # points located per step
+NO_REGION = -1  # region id of points outside every region
+
+
+class RegionIndex:
+    """
+    Uniform grid over region bounding boxes.
+
+    Region ids are positions in ``names``. When regions are nested (a city in
+    a country), locate() returns the smallest region containing each point.
+    """
+
+    def __init__(self, regions: Dict[str, Dict[str, Any]],
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Build the index.
+
+        Args:
+            regions: Mapping of region name to bounds dictionary (with
+                'west', 'east', 'south', 'north' and optionally 'polygon')
+            cell_size: Grid cell size in degrees
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.names: List[str] = list(regions.keys())
+        self.regions: List[Dict[str, Any]] = [regions[name] for name in self.names]
+
+        boxes = np.array([[bounds[key] for key in ('west', 'east', 'south', 'north')]
+                          for bounds in self.regions], dtype=float).reshape(-1, 4)
+        self.west, self.east, self.south, self.north = boxes.T
+        self.area_km2 = np.array([geodesic_area_km2(*box) for box in boxes])
+        self._polygon_ids = np.array([i for i, bounds in enumerate(self.regions)
+                                      if bounds.get('polygon') is not None], dtype=np.int64)
+        self._build_grid()
+
+    @classmethod
+    def from_config(cls, cell_size: float = DEFAULT_CELL_SIZE,
+                    include: Sequence[str] = ('countries', 'cities', 'custom')) -> 'RegionIndex':
+        """
+        Build an index over the regions of RegionConfig.
+
+        Custom regions shadow predefined regions of the same name, as in
+        RegionConfig.get_region_bounds().
+
+        Args:
+            cell_size: Grid cell size in degrees
+            include: Region types to index ('countries', 'cities', 'custom')
+
+        Returns:
+            RegionIndex over the selected regions
+        """
+        from .regions import RegionConfig
+
+        sources = {
+            'countries': RegionConfig.COUNTRIES,
+            'cities': RegionConfig.CITIES,
+            'custom': RegionConfig.CUSTOM_REGIONS
+        }
+        regions: Dict[str, Dict[str, Any]] = {}
+        for kind in include:
+            if kind not in sources:
+                raise ValueError(f"Unknown region type: {kind}")
+            regions.update(sources[kind])
+        return cls(regions, cell_size=cell_size)
+
+    def _build_grid(self) -> None:
+        if not self.names:
+            self.origin = (0.0, 0.0)
+            self.shape = (0, 0)
+            self._cell_start = np.zeros(1, dtype=np.int64)
+            self._cell_regions = np.zeros(0, dtype=np.int64)
+            return
+
+        self.origin = (float(self.west.min()), float(self.south.min()))
+        cols = max(1, int(np.ceil((self.east.max() - self.origin[0]) / self.cell_size)))
+        rows = max(1, int(np.ceil((self.north.max() - self.origin[1]) / self.cell_size)))
+        self.shape = (rows, cols)
+
+        # Cell ranges covered by each box, then one (cell, region) pair per covered cell
+        col0, col1 = self._cell_range(self.west, self.east, self.origin[0], cols)
+        row0, row1 = self._cell_range(self.south, self.north, self.origin[1], rows)
+        cells, region_ids = [], []
+        for i in range(len(self.names)):
+            r, c = np.mgrid[row0[i]:row1[i] + 1, col0[i]:col1[i] + 1]
+            cells.append((r * cols + c).ravel())
+            region_ids.append(np.full(r.size, i, dtype=np.int64))
+        cells = np.concatenate(cells)
+        region_ids = np.concatenate(region_ids)
+
+        order = np.argsort(cells, kind='stable')
+        self._cell_regions = region_ids[order]
+        counts = np.bincount(cells, minlength=rows * cols)
+        self._cell_start = np.concatenate([[0], np.cumsum(counts)])
+
+    def _cell_range(self, low: np.ndarray, high: np.ndarray, origin: float,
+                    size: int) -> Any:
+        first = np.clip(np.floor((low - origin) / self.cell_size), 0, size - 1).astype(np.int64)
+        last = np.clip(np.floor((high - origin) / self.cell_size), 0, size - 1).astype(np.int64)
+        return first, last
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _candidates(self, lon: np.ndarray, lat: np.ndarray) -> Any:
+        """(point, region) pairs whose grid cell and bounding box match."""
+        rows, cols = self.shape
+        col = np.floor((lon - self.origin[0]) / self.cell_size)
+        row = np.floor((lat - self.origin[1]) / self.cell_size)
+        # Points on the far edge of the grid belong to the last cell
+        col = np.where(lon == self.origin[0] + cols * self.cell_size, cols - 1, col)
+        row = np.where(lat == self.origin[1] + rows * self.cell_size, rows - 1, row)
+        on_grid = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+
+        points = np.flatnonzero(on_grid)
+        cells = (row[on_grid] * cols + col[on_grid]).astype(np.int64)
+        starts = self._cell_start[cells]
+        counts = self._cell_start[cells + 1] - starts
+
+        # Expand each point into one pair per region stored in its cell
+        point_ids = np.repeat(points, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        region_ids = self._cell_regions[np.repeat(starts, counts) + offsets]
+
+        plon, plat = lon[point_ids], lat[point_ids]
+        inside = ((plon >= self.west[region_ids]) & (plon <= self.east[region_ids])
+                  & (plat >= self.south[region_ids]) & (plat <= self.north[region_ids]))
+        return point_ids[inside], region_ids[inside]
+
+    def _refine_polygons(self, point_ids: np.ndarray, region_ids: np.ndarray,
+                         lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Mask of pairs that survive the polygon test of polygon regions."""
+        keep = np.ones(len(point_ids), dtype=bool)
+        for region_id in self._polygon_ids:
+            pairs = np.flatnonzero(region_ids == region_id)
+            if len(pairs):
+                polygon = self.regions[region_id]['polygon']
+                keep[pairs] = polygon.contains(lon[point_ids[pairs]], lat[point_ids[pairs]])
+        return keep
+
+    def query_points(self, lon: Any, lat: Any,
+                     block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[str, np.ndarray]:
+        """
+        Find every region containing each point.
+
+        Args:
+            lon: Array of longitudes
+            lat: Array of latitudes
+            block_size: Points processed per step (bounds memory use)
+
+        Returns:
+            Dictionary with 'point_indices' and 'region_ids', one entry per
+            (point, containing region) pair, sorted by point
+        """
+        lon = np.ravel(np.asarray(lon, dtype=float))
+        lat = np.ravel(np.asarray(lat, dtype=float))
+        if lon.shape != lat.shape:
+            raise ValueError("lon and lat must have the same length")
+
+        all_points, all_regions = [], []
+        for offset in range(0, len(lon), block_size):
+            block_lon = lon[offset:offset + block_size]
+            block_lat = lat[offset:offset + block_size]
+            point_ids, region_ids = self._candidates(block_lon, block_lat)
+            keep = self._refine_polygons(point_ids, region_ids, block_lon, block_lat)
+            all_points.append(point_ids[keep] + offset)
+            all_regions.append(region_ids[keep])
+
+        return {
+            'point_indices': np.concatenate(all_points) if all_points else np.zeros(0, np.int64),
+            'region_ids': np.concatenate(all_regions) if all_regions else np.zeros(0, np.int64)
+        }
+
+    def locate(self, lon: Any, lat: Any, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """
+        Find the most specific (smallest) region containing each point.
+
+        Args:
+            lon: Array of longitudes
+            lat: Array of latitudes
+            block_size: Points processed per step (bounds memory use)
+
+        Returns:
+            int64 array of region ids, NO_REGION (-1) for points outside every region
+        """
+        lon = np.ravel(np.asarray(lon, dtype=float))
+        result = self.query_points(lon, lat, block_size=block_size)
+        region_ids = np.full(len(lon), NO_REGION, dtype=np.int64)
+        if len(result['region_ids']) == 0:
+            return region_ids
+
+        # Sort pairs by point, then by area, and keep the first (smallest) per point
+        point_indices = result['point_indices']
+        order = np.lexsort((self.area_km2[result['region_ids']], point_indices))
+        points, first = np.unique(point_indices[order], return_index=True)
+        region_ids[points] = result['region_ids'][order[first]]
+        return region_ids
+
+    def region_names(self, region_ids: np.ndarray) -> np.ndarray:
+        """
+        Map region ids to names.
+
+        Args:
+            region_ids: Array of region ids as returned by locate()
+
+        Returns:
+            Object array of names, None where the id is NO_REGION
+        """
+        region_ids = np.asarray(region_ids)
+        names = np.array(self.names + [None], dtype=object)
+        return names[np.where(region_ids == NO_REGION, len(self.names), region_ids)]
+
+    def query_box(self, bounds: Dict[str, float]) -> List[str]:
+        """
+        Find the regions overlapping a bounding box.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+        Returns:
+            Names of the overlapping regions, smallest first
+        """
+        overlaps = ((self.west <= bounds['east']) & (self.east >= bounds['west'])
+                    & (self.south <= bounds['north']) & (self.north >= bounds['south']))
+        matches = []
+        for region_id in np.flatnonzero(overlaps):
+            polygon = self.regions[region_id].get('polygon')
+            if polygon is None or polygon.intersects_box(bounds):
+                matches.append(region_id)
+        matches.sort(key=lambda region_id: self.area_km2[region_id])
+        return [self.names[region_id] for region_id in matches]
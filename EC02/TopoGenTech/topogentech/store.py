@@ -0,0 +1,420 @@
+"""
+Chunked local store for downloaded satellite embedding rasters.
+
+Rasters are cut into fixed-size chunks on a global EPSG:4326 pixel lattice
+(the same one used by PixelGrid), one compressed file per chunk and year. The
+chunk grid doubles as the spatial index: the chunks covering a bounding box
+are found with integer arithmetic, so reading a city window out of a
+country-scale store only touches the few chunks it overlaps.
+"""
+
+import json
+import math
+import os
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+import numpy as np
+
+from .quantization import check_precision, dequantize, quantize
+from .streaming import METERS_PER_DEGREE, open_download
+
+
+DEFAULT_CHUNK_SIZE = 512  # pixels per chunk edge
+
+
+class EmbeddingStore:
+    """
+    Directory of compressed embedding chunks with a JSON index.
+
+    Each chunk file is an ``.npz`` archive holding one array per band, so
+    reading a subset of bands only decompresses those bands. Values can be
+    stored as float16 or per-band scaled int8 to save space; readers always
+    return float32.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, path: str):
+        """
+        Open an existing store.
+
+        Args:
+            path: Store directory created with EmbeddingStore.create()
+        """
+        self.path = path
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No embedding store found at {path}")
+
+        with open(index_path, 'r', encoding='utf-8') as fh:
+            self._index = json.load(fh)
+
+        self.scale = self._index['scale']
+        self.pixel_deg = self._index['pixel_deg']
+        self.chunk_size = self._index['chunk_size']
+        self.bands: List[str] = self._index['bands']
+        self.precision = self._index.get('precision', 'float32')
+
+    @classmethod
+    def create(cls, path: str, scale: float, bands: List[str],
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               precision: str = 'float32') -> 'EmbeddingStore':
+        """
+        Create an empty store.
+
+        Args:
+            path: Directory to create the store in
+            scale: Resolution in meters per pixel
+            bands: Band names stored in every chunk
+            chunk_size: Chunk edge length in pixels
+            precision: Storage precision: 'float32', 'float16' or 'int8'
+
+        Returns:
+            The new EmbeddingStore
+        """
+        os.makedirs(path, exist_ok=True)
+        index = {
+            'scale': scale,
+            'pixel_deg': scale / METERS_PER_DEGREE,
+            'chunk_size': chunk_size,
+            'bands': list(bands),
+            'precision': check_precision(precision),
+            'crs': 'EPSG:4326',
+            'chunks': {}
+        }
+        with open(os.path.join(path, cls.INDEX_FILE), 'w', encoding='utf-8') as fh:
+            json.dump(index, fh, indent=2)
+        return cls(path)
+
+    def _save_index(self) -> None:
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(self._index, fh, indent=2)
+        os.replace(tmp_path, index_path)
+
+    def list_years(self) -> List[int]:
+        """
+        Get the years that have data in the store.
+
+        Returns:
+            Sorted list of years
+        """
+        return sorted(int(year) for year in self._index['chunks'])
+
+    def _chunk_bounds(self, chunk_row: int, chunk_col: int) -> Dict[str, float]:
+        span = self.chunk_size * self.pixel_deg
+        return {
+            'west': -180 + chunk_col * span,
+            'east': -180 + (chunk_col + 1) * span,
+            'north': 90 - chunk_row * span,
+            'south': 90 - (chunk_row + 1) * span
+        }
+
+    def _chunk_path(self, year: int, chunk_row: int, chunk_col: int) -> str:
+        return os.path.join(self.path, str(year), f"{chunk_row}_{chunk_col}.npz")
+
+    def pixel_window(self, bounds: Dict[str, float]) -> Tuple[int, int, int, int]:
+        """
+        Get the global pixel window covering a bounding box.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+
+        Returns:
+            Tuple of (first_row, last_row, first_col, last_col), end-exclusive
+        """
+        eps = 1e-6
+        return (
+            math.floor((90 - bounds['north']) / self.pixel_deg + eps),
+            math.ceil((90 - bounds['south']) / self.pixel_deg - eps),
+            math.floor((bounds['west'] + 180) / self.pixel_deg + eps),
+            math.ceil((bounds['east'] + 180) / self.pixel_deg - eps)
+        )
+
+    def chunks_window(self, keys: List[Tuple[int, int]],
+                      bounds: Optional[Dict[str, float]] = None) -> Tuple[int, int, int, int]:
+        """
+        Get the global pixel window for a set of chunks.
+
+        Args:
+            keys: (chunk_row, chunk_col) keys
+            bounds: Use the window of these bounds instead of the chunk extent
+
+        Returns:
+            Tuple of (first_row, last_row, first_col, last_col), end-exclusive
+        """
+        if bounds is not None:
+            return self.pixel_window(bounds)
+        size = self.chunk_size
+        return (
+            min(row for row, _ in keys) * size,
+            (max(row for row, _ in keys) + 1) * size,
+            min(col for _, col in keys) * size,
+            (max(col for _, col in keys) + 1) * size
+        )
+
+    def window_metadata(self, window: Tuple[int, int, int, int]) -> Dict[str, Any]:
+        """
+        Describe a global pixel window in the format of PixelGrid.to_dict().
+
+        Args:
+            window: Tuple of (first_row, last_row, first_col, last_col)
+
+        Returns:
+            Dictionary with bounds, scale, size and offsets of the window
+        """
+        first_row, last_row, first_col, last_col = window
+        return {
+            'west': -180 + first_col * self.pixel_deg,
+            'east': -180 + last_col * self.pixel_deg,
+            'north': 90 - first_row * self.pixel_deg,
+            'south': 90 - last_row * self.pixel_deg,
+            'scale': self.scale,
+            'pixel_deg': self.pixel_deg,
+            'width': last_col - first_col,
+            'height': last_row - first_row,
+            'row_offset': first_row,
+            'col_offset': first_col,
+            'crs': 'EPSG:4326'
+        }
+
+    def chunk_overlap(self, chunk_row: int, chunk_col: int,
+                      window: Tuple[int, int, int, int]) -> Tuple[Tuple[slice, slice], Tuple[slice, slice]]:
+        """
+        Find where a chunk and a pixel window overlap.
+
+        Args:
+            chunk_row: Chunk row
+            chunk_col: Chunk column
+            window: Tuple of (first_row, last_row, first_col, last_col)
+
+        Returns:
+            Tuple of (chunk slices, window slices), each a (rows, cols) pair
+        """
+        first_row, last_row, first_col, last_col = window
+        size = self.chunk_size
+        top = max(first_row, chunk_row * size)
+        bottom = min(last_row, (chunk_row + 1) * size)
+        left = max(first_col, chunk_col * size)
+        right = min(last_col, (chunk_col + 1) * size)
+        return (
+            (slice(top - chunk_row * size, bottom - chunk_row * size),
+             slice(left - chunk_col * size, right - chunk_col * size)),
+            (slice(top - first_row, bottom - first_row),
+             slice(left - first_col, right - first_col))
+        )
+
+    def chunks_in_bounds(self, bounds: Dict[str, float], year: int) -> List[Tuple[int, int]]:
+        """
+        Find the stored chunks that overlap a bounding box.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            year: Year of the embeddings
+
+        Returns:
+            List of (chunk_row, chunk_col) keys present in the store
+        """
+        stored = self._index['chunks'].get(str(year), {})
+        first_row, last_row, first_col, last_col = self.pixel_window(bounds)
+        size = self.chunk_size
+        return [
+            (chunk_row, chunk_col)
+            for chunk_row in range(first_row // size, (last_row - 1) // size + 1)
+            for chunk_col in range(first_col // size, (last_col - 1) // size + 1)
+            if f"{chunk_row}_{chunk_col}" in stored
+        ]
+
+    def chunk_keys(self, year: int, bounds: Optional[Dict[str, float]] = None
+                   ) -> List[Tuple[int, int]]:
+        """
+        List the stored chunks of a year.
+
+        Args:
+            year: Year of the embeddings
+            bounds: Only list chunks overlapping these bounds (all chunks if None)
+
+        Returns:
+            Sorted list of (chunk_row, chunk_col) keys
+        """
+        if bounds is not None:
+            return sorted(self.chunks_in_bounds(bounds, year))
+        return sorted(
+            tuple(int(part) for part in key.split('_'))
+            for key in self._index['chunks'].get(str(year), {})
+        )
+
+    def read_chunk(self, year: int, chunk_row: int, chunk_col: int,
+                   bands: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Read one stored chunk.
+
+        Args:
+            year: Year of the embeddings
+            chunk_row: Chunk row
+            chunk_col: Chunk column
+            bands: Band names to read (all bands if None)
+
+        Returns:
+            float32 array of shape (chunk_size, chunk_size, bands), NaN where
+            the chunk has no data
+        """
+        return self._read_chunk(year, chunk_row, chunk_col, bands or self.bands)
+
+    def _read_chunk(self, year: int, chunk_row: int, chunk_col: int,
+                    bands: List[str]) -> np.ndarray:
+        with np.load(self._chunk_path(year, chunk_row, chunk_col)) as chunk:
+            data = np.stack([chunk[band] for band in bands], axis=-1)
+            params: Dict[str, Any] = {'precision': self.precision}
+            if self.precision == 'int8':
+                scale = chunk['__scale__']
+                params['scale'] = scale[[self.bands.index(band) for band in bands]]
+        return dequantize(data, params)
+
+    def _write_chunk(self, year: int, chunk_row: int, chunk_col: int, data: np.ndarray) -> None:
+        chunk_path = self._chunk_path(year, chunk_row, chunk_col)
+        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+
+        stored, params = quantize(data, self.precision)
+        members = {band: stored[:, :, i] for i, band in enumerate(self.bands)}
+        if self.precision == 'int8':
+            members['__scale__'] = params['scale']
+        np.savez_compressed(chunk_path, **members)
+
+        if self.precision != 'float32':
+            with np.errstate(invalid='ignore'):
+                error = np.nanmax(np.abs(dequantize(stored, params) - data), initial=0.0)
+            previous = self._index.get('max_quantization_error', 0.0)
+            self._index['max_quantization_error'] = max(previous, float(error))
+
+        self._index['chunks'].setdefault(str(year), {})[f"{chunk_row}_{chunk_col}"] = \
+            self._chunk_bounds(chunk_row, chunk_col)
+
+    @property
+    def max_quantization_error(self) -> float:
+        """Largest absolute error introduced by quantizing any stored value."""
+        return self._index.get('max_quantization_error', 0.0)
+
+    def write_array(self, array: np.ndarray, row_offset: int, col_offset: int, year: int) -> int:
+        """
+        Write a raster into the store.
+
+        The raster must be on the store's global pixel lattice; its position is
+        given by the global row and column of its upper-left pixel. Pixels
+        already stored for chunks the raster only partly covers are kept.
+
+        Args:
+            array: Array of shape (height, width, bands)
+            row_offset: Global row of the raster's first row
+            col_offset: Global column of the raster's first column
+            year: Year of the embeddings
+
+        Returns:
+            Number of chunks written
+        """
+        if array.ndim != 3 or array.shape[2] != len(self.bands):
+            raise ValueError(f"Expected an array of shape (height, width, {len(self.bands)})")
+
+        height, width = array.shape[:2]
+        size = self.chunk_size
+        stored = self._index['chunks'].get(str(year), {})
+        written = 0
+
+        for chunk_row in range(row_offset // size, (row_offset + height - 1) // size + 1):
+            for chunk_col in range(col_offset // size, (col_offset + width - 1) // size + 1):
+                # Overlap between the raster and this chunk, in global pixels
+                top = max(row_offset, chunk_row * size)
+                bottom = min(row_offset + height, (chunk_row + 1) * size)
+                left = max(col_offset, chunk_col * size)
+                right = min(col_offset + width, (chunk_col + 1) * size)
+
+                if f"{chunk_row}_{chunk_col}" in stored:
+                    data = self._read_chunk(year, chunk_row, chunk_col, self.bands)
+                else:
+                    data = np.full((size, size, len(self.bands)), np.nan, dtype=np.float32)
+
+                data[top - chunk_row * size:bottom - chunk_row * size,
+                     left - chunk_col * size:right - chunk_col * size] = \
+                    array[top - row_offset:bottom - row_offset, left - col_offset:right - col_offset]
+                self._write_chunk(year, chunk_row, chunk_col, data)
+                written += 1
+
+        self._save_index()
+        return written
+
+    def write_download(self, path: str) -> int:
+        """
+        Import an array written by PixelStreamer.download().
+
+        Args:
+            path: Path of the downloaded ``.npy`` file
+
+        Returns:
+            Number of chunks written
+        """
+        array, metadata = open_download(path)
+        if not math.isclose(metadata['pixel_deg'], self.pixel_deg, rel_tol=1e-9):
+            raise ValueError(
+                f"Download scale {metadata['scale']} m does not match store scale {self.scale} m"
+            )
+        if metadata['bands'] != self.bands:
+            raise ValueError("Download bands do not match store bands")
+        return self.write_array(array, metadata['row_offset'], metadata['col_offset'],
+                                metadata['year'])
+
+    def read_window(self, bounds: Dict[str, float], bands: Optional[List[str]] = None,
+                    year: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Read the pixels inside a bounding box.
+
+        Only the chunks overlapping the window are opened, and only the
+        requested bands are decompressed. Pixels without data are NaN.
+
+        Args:
+            bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            bands: Band names to read (all bands if None)
+            year: Year of the embeddings (the only stored year if None)
+
+        Returns:
+            Tuple of (array of shape (height, width, bands), window metadata)
+        """
+        if year is None:
+            years = self.list_years()
+            if len(years) != 1:
+                raise ValueError(f"year is required when the store holds several years: {years}")
+            year = years[0]
+        if bands is None:
+            bands = self.bands
+
+        pixel_window = self.pixel_window(bounds)
+        first_row, last_row, first_col, last_col = pixel_window
+        window = np.full((last_row - first_row, last_col - first_col, len(bands)), np.nan,
+                         dtype=np.float32)
+
+        for chunk_row, chunk_col in self.chunks_in_bounds(bounds, year):
+            data = self._read_chunk(year, chunk_row, chunk_col, bands)
+            chunk_slices, window_slices = self.chunk_overlap(chunk_row, chunk_col, pixel_window)
+            window[window_slices] = data[chunk_slices]
+
+        metadata = dict(self.window_metadata(pixel_window), year=year, bands=list(bands))
+        return window, metadata
+
+    def iter_chunks(self, year: int, bounds: Optional[Dict[str, float]] = None,
+                    bands: Optional[List[str]] = None
+                    ) -> Iterator[Tuple[Tuple[int, int], np.ndarray]]:
+        """
+        Iterate over stored chunks one at a time.
+
+        Args:
+            year: Year of the embeddings
+            bounds: Only yield chunks overlapping these bounds (all chunks if None)
+            bands: Band names to read (all bands if None)
+
+        Yields:
+            Tuples of ((chunk_row, chunk_col), array of shape (chunk, chunk, bands))
+        """
+        if bands is None:
+            bands = self.bands
+        for chunk_row, chunk_col in self.chunk_keys(year, bounds):
+            yield (chunk_row, chunk_col), self._read_chunk(year, chunk_row, chunk_col, bands)
@@ -0,0 +1,323 @@
+"""
+Direct download of embedding pixels into memory-mapped arrays on local disk.
+
+Instead of running a batch export and fetching the result from Google Drive,
+the region is split into pixel blocks that are requested concurrently from
+Earth Engine's pixel endpoint and written straight into a ``.npy`` file that
+is opened as a memory map.
+"""
+
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+
+METERS_PER_DEGREE = 111320.0  # at the equator
+DEFAULT_BLOCK_SIZE = 256  # pixels per block edge (64 float32 bands -> 16 MB)
+DEFAULT_WORKERS = 8
+
+
+class PixelGrid:
+    """
+    Regular EPSG:4326 pixel grid covering a bounding box.
+
+    The grid is snapped outwards to a global pixel lattice anchored at
+    (-180, 90), so grids built for different regions or years with the same
+    scale share pixel boundaries and can be combined without resampling.
+    """
+
+    def __init__(self, region_bounds: Dict[str, float], scale: float):
+        """
+        Initialize the grid.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            scale: Resolution in meters per pixel (converted at the equator)
+        """
+        self.scale = scale
+        self.pixel_deg = scale / METERS_PER_DEGREE
+
+        # Global pixel indices of the region's edges; the small epsilon keeps
+        # bounds that already sit on the lattice from gaining an extra pixel
+        eps = 1e-6
+        first_col = math.floor((region_bounds['west'] + 180) / self.pixel_deg + eps)
+        last_col = math.ceil((region_bounds['east'] + 180) / self.pixel_deg - eps)
+        first_row = math.floor((90 - region_bounds['north']) / self.pixel_deg + eps)
+        last_row = math.ceil((90 - region_bounds['south']) / self.pixel_deg - eps)
+
+        self.col_offset = first_col
+        self.row_offset = first_row
+        self.west = -180 + first_col * self.pixel_deg
+        self.north = 90 - first_row * self.pixel_deg
+        self.width = max(1, last_col - first_col)
+        self.height = max(1, last_row - first_row)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    def blocks(self, block_size: int = DEFAULT_BLOCK_SIZE) -> List[Tuple[int, int, int, int]]:
+        """
+        Split the grid into blocks.
+
+        Args:
+            block_size: Block edge length in pixels
+
+        Returns:
+            List of (row, col, height, width) pixel windows
+        """
+        return [
+            (row, col, min(block_size, self.height - row), min(block_size, self.width - col))
+            for row in range(0, self.height, block_size)
+            for col in range(0, self.width, block_size)
+        ]
+
+    def window_origin(self, row: int, col: int) -> Tuple[float, float]:
+        """
+        Get the (west, north) corner of a pixel window.
+
+        Args:
+            row: Top pixel row
+            col: Left pixel column
+
+        Returns:
+            Longitude and latitude of the window's upper-left corner
+        """
+        return self.west + col * self.pixel_deg, self.north - row * self.pixel_deg
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'west': self.west,
+            'north': self.north,
+            'east': self.west + self.width * self.pixel_deg,
+            'south': self.north - self.height * self.pixel_deg,
+            'scale': self.scale,
+            'pixel_deg': self.pixel_deg,
+            'width': self.width,
+            'height': self.height,
+            'row_offset': self.row_offset,
+            'col_offset': self.col_offset,
+            'crs': 'EPSG:4326'
+        }
+
+
+class EarthEnginePixelEndpoint:
+    """
+    Fetches embedding pixel blocks with Earth Engine's computePixels endpoint.
+
+    ``ee`` is imported on first use, so the rest of this module (and the
+    local store built on it) works without the Earth Engine client.
+    """
+
+    def __init__(self, dataset_id: str):
+        """
+        Initialize the endpoint.
+
+        Args:
+            dataset_id: Earth Engine image collection id of the embeddings
+        """
+        self.dataset_id = dataset_id
+
+    def _image(self, year: int) -> Any:
+        from .query import get_query_planner
+        return get_query_planner().annual_image(self.dataset_id, year)
+
+    def band_names(self, year: int) -> List[str]:
+        """
+        Get the band names of the embedding image.
+
+        Args:
+            year: Year of the embeddings
+
+        Returns:
+            List of band names
+        """
+        return self._image(year).bandNames().getInfo()
+
+    def fetch_block(self, year: int, west: float, north: float, pixel_deg: float,
+                    width: int, height: int, bands: List[str]) -> np.ndarray:
+        """
+        Fetch one block of pixels.
+
+        Args:
+            year: Year of the embeddings
+            west: Longitude of the block's upper-left corner
+            north: Latitude of the block's upper-left corner
+            pixel_deg: Pixel size in degrees
+            width: Block width in pixels
+            height: Block height in pixels
+            bands: Band names to fetch
+
+        Returns:
+            float32 array of shape (height, width, len(bands))
+        """
+        import ee
+        pixels = ee.data.computePixels({
+            'expression': self._image(year).select(bands),
+            'fileFormat': 'NUMPY_NDARRAY',
+            'grid': {
+                'dimensions': {'width': width, 'height': height},
+                'affineTransform': {
+                    'scaleX': pixel_deg, 'shearX': 0, 'translateX': west,
+                    'shearY': 0, 'scaleY': -pixel_deg, 'translateY': north
+                },
+                'crsCode': 'EPSG:4326'
+            }
+        })
+        # computePixels returns a structured array with one field per band
+        return np.stack([pixels[band] for band in bands], axis=-1).astype(np.float32)
+
+
+class SyntheticPixelEndpoint:
+    """
+    Deterministic stand-in for the pixel endpoint, for tests and benchmarks.
+
+    Pixels are smooth functions of longitude and latitude normalized to unit
+    length, like the real embeddings, and shift slightly from year to year.
+    """
+
+    def __init__(self, num_bands: int = 64, latency: float = 0.0, seed: int = 0):
+        """
+        Initialize the endpoint.
+
+        Args:
+            num_bands: Number of embedding bands
+            latency: Seconds to sleep per request to mimic network time
+            seed: Seed for the synthetic frequencies
+        """
+        rng = np.random.default_rng(seed)
+        self.num_bands = num_bands
+        self.latency = latency
+        self._freq_lon = rng.uniform(5, 50, num_bands)
+        self._freq_lat = rng.uniform(5, 50, num_bands)
+        self._phase = rng.uniform(0, 2 * np.pi, num_bands)
+        self.request_count = 0
+
+    def band_names(self, year: int) -> List[str]:
+        return [f"A{i:02d}" for i in range(self.num_bands)]
+
+    def fetch_block(self, year: int, west: float, north: float, pixel_deg: float,
+                    width: int, height: int, bands: List[str]) -> np.ndarray:
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        band_idx = np.array([int(band[1:]) for band in bands])
+        lon = west + (np.arange(width) + 0.5) * pixel_deg
+        lat = north - (np.arange(height) + 0.5) * pixel_deg
+        phase = self._phase[band_idx] + 0.05 * (year - 2017)
+        values = np.sin(
+            lat[:, None, None] * self._freq_lat[band_idx]
+            + lon[None, :, None] * self._freq_lon[band_idx]
+            + phase
+        )
+        values /= np.linalg.norm(values, axis=-1, keepdims=True) + 1e-12
+        return values.astype(np.float32)
+
+
+class PixelStreamer:
+    """
+    Downloads a region block by block into a memory-mapped ``.npy`` file.
+    """
+
+    def __init__(self, endpoint: Any, block_size: int = DEFAULT_BLOCK_SIZE,
+                 workers: int = DEFAULT_WORKERS, max_retries: int = 3):
+        """
+        Initialize the streamer.
+
+        Args:
+            endpoint: Object with band_names(year) and fetch_block(...) methods,
+                such as EarthEnginePixelEndpoint or SyntheticPixelEndpoint
+            block_size: Block edge length in pixels
+            workers: Number of blocks fetched concurrently
+            max_retries: Attempts per block before the download fails
+        """
+        self.endpoint = endpoint
+        self.block_size = block_size
+        self.workers = workers
+        self.max_retries = max_retries
+
+    def _fetch_with_retry(self, year: int, grid: PixelGrid, window: Tuple[int, int, int, int],
+                          bands: List[str]) -> np.ndarray:
+        row, col, height, width = window
+        west, north = grid.window_origin(row, col)
+        for attempt in range(self.max_retries):
+            try:
+                return self.endpoint.fetch_block(
+                    year, west, north, grid.pixel_deg, width, height, bands
+                )
+            except Exception:
+                if attempt == self.max_retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def download(self, region_bounds: Dict[str, float], output_path: str,
+                 year: int, scale: float, bands: Optional[List[str]] = None,
+                 verbose: bool = True) -> np.memmap:
+        """
+        Download a region into a memory-mapped array.
+
+        The array has shape (height, width, bands) and dtype float32. Grid and
+        band metadata are written next to it as ``<output_path>.json``.
+
+        Args:
+            region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+            output_path: Path of the ``.npy`` file to create
+            year: Year of the embeddings
+            scale: Resolution in meters per pixel
+            bands: Band names to fetch (all bands if None)
+            verbose: Whether to print progress updates
+
+        Returns:
+            The memory-mapped array
+        """
+        grid = PixelGrid(region_bounds, scale)
+        if bands is None:
+            bands = self.endpoint.band_names(year)
+
+        array = np.lib.format.open_memmap(
+            output_path, mode='w+', dtype=np.float32,
+            shape=(grid.height, grid.width, len(bands))
+        )
+        metadata = dict(grid.to_dict(), year=year, bands=bands)
+        with open(f"{output_path}.json", 'w', encoding='utf-8') as fh:
+            json.dump(metadata, fh, indent=2)
+
+        windows = grid.blocks(self.block_size)
+        start_time = time.time()
+
+        # Workers only fetch; the blocks are written into the memmap here, as
+        # they complete, so no locking is needed
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self._fetch_with_retry, year, grid, window, bands): window
+                for window in windows
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                row, col, height, width = futures[future]
+                array[row:row + height, col:col + width, :] = future.result()
+                if verbose and (done % 50 == 0 or done == len(windows)):
+                    elapsed = time.time() - start_time
+                    print(f"Downloaded {done}/{len(windows)} blocks (elapsed: {elapsed:.0f}s)")
+
+        array.flush()
+        return array
+
+
+def open_download(path: str) -> Tuple[np.memmap, Dict[str, Any]]:
+    """
+    Open an array written by PixelStreamer.download() without loading it.
+
+    Args:
+        path: Path of the ``.npy`` file
+
+    Returns:
+        Tuple of (read-only memory-mapped array, metadata dictionary)
+    """
+    with open(f"{path}.json", 'r', encoding='utf-8') as fh:
+        metadata = json.load(fh)
+    return np.load(path, mmap_mode='r'), metadata
@@ -0,0 +1,264 @@
+"""
+Tiling helpers for splitting large regions into independent export tasks.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Any
+
+
+KM_PER_DEGREE_LAT = 110.54
+KM_PER_DEGREE_LON = 111.32  # at the equator
+
+
+def split_bounds(region_bounds: Dict[str, float], tile_size_km: float) -> List[Dict[str, Any]]:
+    """
+    Split a bounding box into a regular grid of tiles.
+
+    The number of rows and columns is chosen so that no tile is larger than
+    ``tile_size_km`` on a side (widths are measured at the latitude closest to
+    the equator, where a degree of longitude is longest). The bounds are then
+    divided evenly so every tile has the same size in degrees and the grid
+    covers the region exactly.
+
+    Args:
+        region_bounds: Dictionary with 'west', 'east', 'south', 'north' keys
+        tile_size_km: Target tile edge length in kilometers
+
+    Returns:
+        List of tile dictionaries ordered row by row from the north-west corner.
+        Each tile has the usual bounds keys plus 'row', 'col', 'tile_id' and 'name'.
+    """
+    if tile_size_km <= 0:
+        raise ValueError("tile_size_km must be positive")
+
+    west, east = region_bounds['west'], region_bounds['east']
+    south, north = region_bounds['south'], region_bounds['north']
+
+    widest_lat = 0.0 if south <= 0 <= north else min(abs(south), abs(north))
+    width_km = (east - west) * KM_PER_DEGREE_LON * math.cos(math.radians(widest_lat))
+    height_km = (north - south) * KM_PER_DEGREE_LAT
+
+    n_cols = max(1, math.ceil(width_km / tile_size_km))
+    n_rows = max(1, math.ceil(height_km / tile_size_km))
+
+    step_lon = (east - west) / n_cols
+    step_lat = (north - south) / n_rows
+    region_name = region_bounds.get('name', 'Region')
+
+    tiles = []
+    for row in range(n_rows):
+        tile_north = north - row * step_lat
+        # Snap the last row/column to the original bounds to avoid float drift
+        tile_south = south if row == n_rows - 1 else north - (row + 1) * step_lat
+        for col in range(n_cols):
+            tile_west = west + col * step_lon
+            tile_east = east if col == n_cols - 1 else west + (col + 1) * step_lon
+            tile_id = f"r{row:03d}_c{col:03d}"
+            tiles.append({
+                'west': tile_west,
+                'east': tile_east,
+                'south': tile_south,
+                'north': tile_north,
+                'row': row,
+                'col': col,
+                'tile_id': tile_id,
+                'name': f"{region_name} {tile_id}"
+            })
+
+    return tiles
+
+
+def snap_tiles(tiles: List[Dict[str, Any]], pixel_deg: float) -> List[Dict[str, Any]]:
+    """
+    Move tile edges onto a global EPSG:4326 pixel lattice anchored at (-180, 90).
+
+    Each edge is rounded to the nearest lattice line, so neighbouring tiles
+    still share their edges and no pixel is exported twice. Tiles keep at
+    least one pixel in each direction.
+
+    Args:
+        tiles: Tile dictionaries as returned by split_bounds()
+        pixel_deg: Pixel size in degrees
+
+    Returns:
+        New list of tile dictionaries with snapped bounds
+    """
+    def snap_lon(lon: float) -> float:
+        return -180 + round((lon + 180) / pixel_deg) * pixel_deg
+
+    def snap_lat(lat: float) -> float:
+        return 90 - round((90 - lat) / pixel_deg) * pixel_deg
+
+    snapped = []
+    for tile in tiles:
+        west, north = snap_lon(tile['west']), snap_lat(tile['north'])
+        east = max(snap_lon(tile['east']), west + pixel_deg)
+        south = min(snap_lat(tile['south']), north - pixel_deg)
+        snapped.append(dict(tile, west=west, east=east, south=south, north=north))
+    return snapped
+
+
+class ExportTileSet:
+    """
+    Handle for a group of export tasks created from one tiled region.
+
+    Each tile keeps its own task, so a failed tile can be resubmitted
+    without touching the rest of the grid.
+    """
+
+    def __init__(self, region_bounds: Dict[str, float], tiles: List[Dict[str, Any]],
+                 submit: Callable[[Dict[str, Any]], Optional[Any]],
+                 task_index: Any = None):
+        """
+        Initialize the tile set.
+
+        Args:
+            region_bounds: Bounds of the full region that was tiled
+            tiles: Tile dictionaries as returned by split_bounds()
+            submit: Callable that starts the export for one tile and returns
+                the task (or None if the task could not be started)
+            task_index: TaskIndex used for status lookups (the shared index if None)
+        """
+        self.region_bounds = region_bounds
+        self.tiles = tiles
+        self._submit = submit
+        self.task_index = task_index
+        self.tasks: Dict[str, Optional[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def submit_all(self) -> int:
+        """
+        Start an export task for every tile that has not been submitted yet.
+
+        Returns:
+            Number of tasks started successfully
+        """
+        started = 0
+        for tile in self.tiles:
+            if self.tasks.get(tile['tile_id']) is not None:
+                continue
+            task = self._submit(tile)
+            self.tasks[tile['tile_id']] = task
+            if task is not None:
+                started += 1
+        return started
+
+    def get_tile(self, tile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a tile by its id.
+
+        Args:
+            tile_id: Tile id such as 'r000_c001'
+
+        Returns:
+            Tile dictionary or None if not found
+        """
+        for tile in self.tiles:
+            if tile['tile_id'] == tile_id:
+                return tile
+        return None
+
+    def task_ids(self) -> Dict[str, Optional[str]]:
+        """
+        Get the Earth Engine task id for every tile.
+
+        Returns:
+            Dictionary mapping tile id to task id (None if not started)
+        """
+        return {
+            tile['tile_id']: getattr(self.tasks.get(tile['tile_id']), 'id', None)
+            for tile in self.tiles
+        }
+
+    def get_states(self) -> Dict[str, str]:
+        """
+        Get the current state of every tile's task.
+
+        Tiles whose task could not be started are reported as 'FAILED',
+        tiles that were never submitted as 'UNSUBMITTED'.
+
+        Returns:
+            Dictionary mapping tile id to task state
+        """
+        # Imported here so that planning tiles does not require Earth Engine
+        from .utils import get_task_index
+
+        task_index = self.task_index or get_task_index()
+        task_ids = [task.id for task in self.tasks.values() if task is not None]
+        try:
+            statuses = task_index.get_statuses(task_ids) if task_ids else {}
+        except Exception as e:
+            print(f"Error listing tasks: {e}")
+            statuses = {}
+
+        states = {}
+        for tile in self.tiles:
+            tile_id = tile['tile_id']
+            if tile_id not in self.tasks:
+                states[tile_id] = 'UNSUBMITTED'
+                continue
+            task = self.tasks[tile_id]
+            if task is None:
+                states[tile_id] = 'FAILED'
+                continue
+            if task.id in statuses:
+                states[tile_id] = statuses[task.id]['state']
+                continue
+            try:
+                states[tile_id] = task.status()['state']
+            except Exception as e:
+                print(f"Error getting status for tile {tile_id}: {e}")
+                states[tile_id] = 'UNKNOWN'
+        return states
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count tiles per task state.
+
+        Returns:
+            Dictionary mapping state to number of tiles
+        """
+        counts: Dict[str, int] = {}
+        for state in self.get_states().values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def failed_tiles(self) -> List[Dict[str, Any]]:
+        """
+        Get tiles whose export failed, was cancelled or never started.
+
+        Returns:
+            List of tile dictionaries
+        """
+        states = self.get_states()
+        return [
+            tile for tile in self.tiles
+            if states[tile['tile_id']] in ('FAILED', 'CANCELLED')
+        ]
+
+    def rerun_failed(self) -> int:
+        """
+        Resubmit every failed or cancelled tile.
+
+        Returns:
+            Number of tasks restarted successfully
+        """
+        restarted = 0
+        for tile in self.failed_tiles():
+            task = self._submit(tile)
+            self.tasks[tile['tile_id']] = task
+            if task is not None:
+                restarted += 1
+        return restarted
+
+    def is_done(self) -> bool:
+        """
+        Check whether every tile has reached a final state.
+
+        Returns:
+            True if no tile is still waiting or running
+        """
+        active = ('UNSUBMITTED', 'READY', 'RUNNING', 'CANCEL_REQUESTED', 'UNKNOWN')
+        return not any(state in active for state in self.get_states().values())
@@ -2,14 +2,17 @@
 Utility functions for Earth Engine operations and general helpers.
 """
 
-import ee
-import time
 from typing import Dict, List, Optional, Any
 
+from .backends import Backend, get_backend
+from .metrics import ExportMetrics
+
 
 class EarthEngineUtils:
     """
     Utility class for common Earth Engine operations.
+    
+    Requests go through the default backend (see backends.set_backend()).
     """
     
     @staticmethod
@@ -25,10 +28,7 @@ class EarthEngineUtils:
             True if successful, False otherwise
         """
         try:
-            if authenticate:
-                ee.Authenticate()
-            
-            ee.Initialize(project=project_id)
+            get_backend().initialize(project_id, authenticate=authenticate)
             return True
             
         except Exception as e:
@@ -47,30 +47,22 @@ class EarthEngineUtils:
         Returns:
             True if initialized, False otherwise
         """
-        try:
-            # Try a simple operation to test initialization
-            ee.Number(1).getInfo()
-            return True
-        except Exception:
-            return False
+        return get_backend().check_initialization()
     
     @staticmethod
-    def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
+    def get_task_status(task_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get status of a specific Earth Engine task.
         
         Args:
             task_id: Task ID string
+            refresh: Whether to bypass the cached task index
             
         Returns:
             Task status dictionary or None if not found
         """
         try:
-            tasks = ee.batch.Task.list()
-            for task in tasks:
-                if task.id == task_id:
-                    return task.status()
-            return None
+            return get_task_index().get_status(task_id, refresh=refresh)
         except Exception as e:
             print(f"Error getting task status: {e}")
             return None
@@ -87,35 +79,37 @@ class EarthEngineUtils:
             True if cancelled successfully, False otherwise
         """
         try:
-            tasks = ee.batch.Task.list()
-            for task in tasks:
-                if task.id == task_id:
-                    task.cancel()
-                    return True
-            print(f"Task {task_id} not found")
-            return False
+            index = get_task_index()
+            task = index.get_task(task_id)
+            if task is None:
+                print(f"Task {task_id} not found")
+                return False
+            task.cancel()
+            index.invalidate()
+            return True
         except Exception as e:
             print(f"Error cancelling task: {e}")
             return False
     
     @staticmethod
-    def list_running_tasks() -> List[Dict[str, Any]]:
+    def list_running_tasks(refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get list of currently running tasks.
         
+        Args:
+            refresh: Whether to bypass the cached task index
+            
         Returns:
             List of running task information
         """
         try:
-            tasks = ee.batch.Task.list()
             running_tasks = []
             
-            for task in tasks:
-                status = task.status()
+            for status in get_task_index().list_statuses(refresh=refresh):
                 if status['state'] in ['RUNNING', 'READY']:
                     task_info = {
-                        'id': task.id,
-                        'description': task.config.get('description', 'No description'),
+                        'id': status['id'],
+                        'description': status.get('description', 'No description'),
                         'state': status['state'],
                         'creation_timestamp': status.get('creation_timestamp_ms', 0),
                         'update_timestamp': status.get('update_timestamp_ms', 0)
@@ -143,15 +137,13 @@ class EarthEngineUtils:
             Number of tasks cleaned up
         """
         try:
-            tasks = ee.batch.Task.list()
-            current_time = time.time() * 1000  # Convert to milliseconds
+            index = get_task_index()
+            current_time = index.backend.time() * 1000  # Convert to milliseconds
             max_age_ms = max_age_hours * 60 * 60 * 1000
             
             cleaned_count = 0
             
-            for task in tasks:
-                status = task.status()
-                
+            for status in index.list_statuses(refresh=True):
                 # Skip running or completed tasks
                 if status['state'] in ['RUNNING', 'READY', 'COMPLETED']:
                     continue
@@ -160,11 +152,13 @@ class EarthEngineUtils:
                 update_time = status.get('update_timestamp_ms', 0)
                 if current_time - update_time > max_age_ms:
                     try:
-                        task.cancel()
+                        index.get_task(status['id']).cancel()
                         cleaned_count += 1
                     except Exception:
                         pass  # Task might already be cancelled
             
+            if cleaned_count:
+                index.invalidate()
             return cleaned_count
             
         except Exception as e:
@@ -172,22 +166,160 @@ class EarthEngineUtils:
             return 0
 
 
+class TaskIndex:
+    """
+    Short-lived cache of all task statuses built from a single list call.
+    
+    Looking up one task with ee.batch.Task.list() or task.status() costs one
+    round-trip per call. The index fetches the statuses of every task at once
+    and answers lookups from memory until the entries are older than ``ttl``.
+    """
+    
+    DEFAULT_TTL = 10  # seconds
+    
+    def __init__(self, ttl: float = DEFAULT_TTL, backend: Optional[Backend] = None):
+        """
+        Initialize the task index.
+        
+        Args:
+            ttl: Seconds a fetched task list stays valid
+            backend: Backend whose tasks are listed (default backend if None)
+        """
+        self.ttl = ttl
+        self._backend = backend
+        self._statuses: Dict[str, Dict[str, Any]] = {}
+        self._refreshed_at: Optional[float] = None
+    
+    @property
+    def backend(self) -> Backend:
+        return self._backend or get_backend()
+    
+    def refresh(self) -> None:
+        """
+        Rebuild the index with a single task list call.
+        """
+        statuses = self.backend.get_task_list()
+        self._statuses = {status['id']: status for status in statuses}
+        self._refreshed_at = self.backend.time()
+    
+    def invalidate(self) -> None:
+        """
+        Force the next lookup to fetch a fresh task list.
+        """
+        self._refreshed_at = None
+    
+    def is_stale(self) -> bool:
+        """
+        Check whether the cached task list has expired.
+        
+        Returns:
+            True if the index must be refreshed before use
+        """
+        return self._refreshed_at is None or self.backend.time() - self._refreshed_at > self.ttl
+    
+    def _ensure_fresh(self, refresh: bool = False) -> None:
+        if refresh or self.is_stale():
+            self.refresh()
+    
+    def get_status(self, task_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of one task.
+        
+        Args:
+            task_id: Task ID string
+            refresh: Whether to bypass the cached task list
+            
+        Returns:
+            Task status dictionary or None if not found
+        """
+        self._ensure_fresh(refresh)
+        return self._statuses.get(task_id)
+    
+    def get_statuses(self, task_ids: List[str], refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the statuses of several tasks at once.
+        
+        Args:
+            task_ids: Task ID strings
+            refresh: Whether to bypass the cached task list
+            
+        Returns:
+            Dictionary mapping task id to status for the tasks that were found
+        """
+        self._ensure_fresh(refresh)
+        return {
+            task_id: self._statuses[task_id]
+            for task_id in task_ids if task_id in self._statuses
+        }
+    
+    def list_statuses(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the statuses of all tasks.
+        
+        Args:
+            refresh: Whether to bypass the cached task list
+            
+        Returns:
+            List of task status dictionaries
+        """
+        self._ensure_fresh(refresh)
+        return list(self._statuses.values())
+    
+    def get_task(self, task_id: str, refresh: bool = False) -> Optional[Any]:
+        """
+        Build a task object from the index without another round-trip.
+        
+        Args:
+            task_id: Task ID string
+            refresh: Whether to bypass the cached task list
+            
+        Returns:
+            Task object (ee.batch.Task for Earth Engine) or None if not found
+        """
+        status = self.get_status(task_id, refresh=refresh)
+        if status is None:
+            return None
+        return self.backend.get_task(task_id, status)
+
+
+def get_task_index() -> TaskIndex:
+    """
+    Get the task index shared by the utilities in this package.
+    
+    Returns:
+        TaskIndex of the default backend
+    """
+    return get_backend().task_index
+
+
 class TaskMonitor:
     """
     Helper class to monitor Earth Engine task progress.
     """
     
-    def __init__(self, task: ee.batch.Task, check_interval: int = 30):
+    def __init__(self, task: Any, check_interval: int = 30,
+                 backend: Optional[Backend] = None,
+                 metrics: Optional[ExportMetrics] = None):
         """
         Initialize task monitor.
         
         Args:
             task: Earth Engine task to monitor
             check_interval: Seconds between status checks
+            backend: Backend whose clock is used for waiting (default backend if None)
+            metrics: Collector fed with every polled status (none if None)
         """
         self.task = task
         self.check_interval = check_interval
-        self.start_time = time.time()
+        self.backend = backend or get_backend()
+        self.metrics = metrics
+        self.start_time = self.backend.time()
+    
+    def _status(self) -> Dict[str, Any]:
+        status = self.task.status()
+        if self.metrics is not None:
+            self.metrics.observe(self.task.id, status)
+        return status
     
     def monitor(self, verbose: bool = True) -> bool:
         """
@@ -204,24 +336,24 @@ class TaskMonitor:
         
         try:
             while self.task.active():
-                status = self.task.status()
+                status = self._status()
                 state = status['state']
                 
                 if verbose:
-                    elapsed = time.time() - self.start_time
+                    elapsed = self.backend.time() - self.start_time
                     print(f"Status: {state} (elapsed: {elapsed:.0f}s)")
                     
                     if 'progress' in status:
                         progress = status['progress']
                         print(f"Progress: {progress}%")
                 
-                time.sleep(self.check_interval)
+                self.backend.sleep(self.check_interval)
             
-            final_status = self.task.status()
+            final_status = self._status()
             final_state = final_status['state']
             
             if verbose:
-                total_time = time.time() - self.start_time
+                total_time = self.backend.time() - self.start_time
                 print(f"Task completed: {final_state} (total time: {total_time:.0f}s)")
             
             if final_state == 'COMPLETED':